@@ -1,75 +1,545 @@
-from flask import Flask, render_template, request, jsonify
-from scraper import GoogleMapsScraper
+from flask import Flask, Response, render_template, request, jsonify
+from scraper import GoogleMapsScraper, chromedriver_info, resolve_chromedriver
+from driver_pool import DriverPool
+from jobs import JobManager
+from cache import DetailCache, ResultCache
+from checkpoint import CheckpointStore
+from coalesce import SingleFlight, flight_key
+from tiling import TileCrawler
+from engines import HttpEngine
+from enrich import PlaceEnricher
+from store import PlaceStore, snapshot_key
+from metrics import NAVIGATION_LIMIT, NAVIGATION_RATE, REGISTRY, Gauge
+from throttle import BlockedError, NavigationScheduler
+import atexit
+import json
 import os
 
 app = Flask(__name__)
 
+# Resolve chromedriver sekali saat proses start, bukan di tengah request
+resolve_chromedriver()
+
+# Direktori data lokal (cache, database) - bisa diarahkan ke disk persisten di server
+DATA_DIR = os.environ.get('SCRAPER_DATA_DIR', os.path.join(os.path.dirname(os.path.abspath(__file__)), 'data'))
+
+# Cache hasil pencarian yang sama (TTL dalam detik, ukuran dalam MB)
+result_cache = ResultCache(
+    os.path.join(DATA_DIR, 'result_cache.sqlite3'),
+    ttl=int(os.environ.get('CACHE_TTL', 6 * 3600)),
+    max_entries=int(os.environ.get('CACHE_MAX_ENTRIES', 500)),
+    max_bytes=int(os.environ.get('CACHE_MAX_MB', 50)) * 1024 * 1024
+)
+
+# Pool Chrome driver bersama untuk semua request, supaya tidak cold start Chrome setiap kali
+MAX_BROWSERS = int(os.environ.get('MAX_BROWSERS', 2))
+# Mode ringan: Chrome di pool tidak memuat gambar, font dan tile peta
+LIGHTWEIGHT = os.environ.get('SCRAPER_LIGHTWEIGHT', '').lower() in ('1', 'true', 'yes')
+# 'bulk' (DOM), 'element' atau 'network' (parse response XHR pencarian, DOM sebagai fallback)
+EXTRACTION_MODE = os.environ.get('SCRAPER_EXTRACTION_MODE', 'bulk')
+driver_pool = DriverPool(
+    GoogleMapsScraper(lightweight=LIGHTWEIGHT, extraction_mode=EXTRACTION_MODE)._get_driver,
+    max_size=MAX_BROWSERS
+)
+atexit.register(driver_pool.close_all)
+
+# Gauge pool diisi ulang dari DriverPool.stats() setiap kali /metrics di-scrape
+POOL_DRIVERS = REGISTRY.register(Gauge('scraper_pool_drivers', 'Driver Chrome di pool', labels=('state',)))
+
+def collect_pool_metrics():
+    stats = driver_pool.stats()
+    POOL_DRIVERS.set(stats['in_use'], 'in_use')
+    POOL_DRIVERS.set(stats['idle'], 'idle')
+
+REGISTRY.add_collector(collect_pool_metrics)
+
+# Engine default: 'selenium' (Chrome) atau 'http' (requests tanpa browser); bisa di-override per request
+SCRAPER_ENGINE = os.environ.get('SCRAPER_ENGINE', 'selenium')
+ENGINES = ('selenium', 'http')
+# Satu engine HTTP (dan pool koneksi keep-alive) dipakai bersama oleh semua request
+HTTP_POOL_SIZE = int(os.environ.get('HTTP_POOL_SIZE', 20))
+
+# Semua navigasi ke Maps (Chrome, engine http, enrichment) lewat satu scheduler: laju token bucket,
+# deteksi halaman blokir/consent, backoff dan penurunan jumlah pencarian bersamaan saat diblokir
+navigation_scheduler = NavigationScheduler(
+    rate=float(os.environ.get('NAV_RATE', 2.0)) or None,
+    burst=int(os.environ.get('NAV_BURST', 5)),
+    max_concurrency=int(os.environ.get('NAV_MAX_CONCURRENCY', HTTP_POOL_SIZE if SCRAPER_ENGINE == 'http' else MAX_BROWSERS)),
+    max_backoff=float(os.environ.get('NAV_MAX_BACKOFF', 300))
+)
+
+# Gauge laju/batas navigasi diisi ulang setiap kali /metrics di-scrape, hanya dari scheduler bersama ini (scheduler default milik instance
+# GoogleMapsScraper lain, mis. factory pool, tidak ikut menimpa nilainya)
+def collect_navigation_metrics():
+    stats = navigation_scheduler.stats()
+    NAVIGATION_RATE.set(stats['rate'] if stats['rate'] is not None else 0)
+    NAVIGATION_LIMIT.set(stats['concurrency_limit'])
+
+REGISTRY.add_collector(collect_navigation_metrics)
+
+http_engine = HttpEngine(pool_size=HTTP_POOL_SIZE, scheduler=navigation_scheduler)
+
+# Enrichment detail (telepon, website, jam buka): halaman detail dibuka paralel di tab driver pool,
+# detail di-cache per place_id (TTL dalam detik, default 7 hari)
+detail_cache = DetailCache(
+    os.path.join(DATA_DIR, 'result_cache.sqlite3'),
+    ttl=int(os.environ.get('DETAIL_CACHE_TTL', 7 * 24 * 3600))
+)
+enricher = PlaceEnricher(
+    driver_pool,
+    cache=detail_cache,
+    tabs_per_driver=int(os.environ.get('ENRICH_TABS', 4)),
+    scheduler=navigation_scheduler
+)
+
+# Semua tempat yang pernah di-scrape, key place_id: first_seen/last_seen dan histori rating/ulasan
+place_store = PlaceStore(os.path.join(DATA_DIR, 'places.sqlite3'))
+# Mode incremental: tempat yang terlihat dalam sekian detik terakhir dianggap masih segar
+INCREMENTAL_MAX_AGE = int(os.environ.get('INCREMENTAL_MAX_AGE', 24 * 3600))
+# Mode from_index: area yang di-scrape dalam sekian detik terakhir dijawab dari place store
+INDEX_MAX_AGE = int(os.environ.get('INDEX_MAX_AGE', 7 * 24 * 3600))
+
+# Checkpoint crawl panjang (hasil, feed/radius/tile yang selesai) untuk dilanjutkan dengan `resume`
+checkpoint_store = CheckpointStore(
+    os.path.join(DATA_DIR, 'checkpoints.sqlite3'),
+    ttl=int(os.environ.get('CHECKPOINT_TTL', 7 * 24 * 3600))
+)
+CHECKPOINT_INTERVAL = float(os.environ.get('CHECKPOINT_INTERVAL', 5))
+
+def create_scraper():
+    return GoogleMapsScraper(
+        driver_pool=driver_pool,
+        result_cache=result_cache,
+        place_store=place_store,
+        extraction_mode=EXTRACTION_MODE,
+        engine=SCRAPER_ENGINE,
+        engines={'http': http_engine},
+        scheduler=navigation_scheduler
+    )
+
+def run_scrape(params, progress_callback=None):
+    """
+    Jalankan scraping sesuai mode: 'single' (search_places) atau 'tiles' (TileCrawler),
+    lalu enrichment detail jika params['enrich']
+
+    Dengan params['delta'], hasil dibandingkan dengan snapshot terakhir pencarian yang sama dan
+    diff-nya dikirim sebagai progress event 'delta' (lihat PlaceStore.diff_snapshot)
+
+    Progress crawl di-checkpoint per pencarian; params['resume'] melanjutkan checkpoint
+    pencarian yang sama yang terputus
+    """
+    params = dict(params)
+    resume = params.pop('resume', False)
+    # Key checkpoint sama dengan key single-flight (semua parameter kecuali resume): pencarian yang
+    # berbeda engine, enrich, cache, refresh atau umur incremental/index tidak berbagi checkpoint
+    checkpoint = checkpoint_store.checkpoint(flight_key(params), resume=resume, interval=CHECKPOINT_INTERVAL)
+    delta_key = snapshot_key(params) if params.pop('delta', False) else None
+    mode = params.pop('mode', 'single')
+    enrich = params.pop('enrich', False)
+    if mode == 'tiles':
+        crawler = TileCrawler(create_scraper, workers=MAX_BROWSERS)
+        results = crawler.crawl(progress_callback=progress_callback, checkpoint=checkpoint, **params)
+    else:
+        results = create_scraper().search_places(progress_callback=progress_callback, checkpoint=checkpoint, **params)
+    if enrich and results:
+        # Salinan: dict yang sudah dikirim lewat event 'place' tidak ikut berubah
+        results = enricher.enrich([dict(place) for place in results], progress_callback)
+        # Detail hasil enrichment ikut disimpan (upsert menggabungkan dengan record yang ada)
+        try:
+            place_store.upsert_many(results)
+        except Exception as e:
+            print(f"[DEBUG] Gagal menyimpan detail ke place store: {e}")
+    if delta_key is not None:
+        diff = place_store.diff_snapshot(delta_key, results)
+        print(f"[INFO] Delta: {len(diff['added'])} baru, {len(diff['changed'])} berubah, "
+              f"{len(diff['removed'])} hilang, {diff['unchanged']} tetap")
+        if progress_callback:
+            progress_callback('delta', diff)
+    return results
+
+# Request identik yang datang bersamaan (dashboard refresh, beberapa user) menumpang satu scraping
+scrape_flights = SingleFlight()
+FLIGHTS_IN_PROGRESS = REGISTRY.register(Gauge('scraper_flights_in_progress', 'Scraping unik yang sedang berjalan'))
+REGISTRY.add_collector(lambda: FLIGHTS_IN_PROGRESS.set(scrape_flights.in_flight()))
+
+def start_scrape(params):
+    """Mulai run_scrape di background, atau menumpang scraping identik yang sedang berjalan"""
+    return scrape_flights.start(flight_key(params), lambda progress_callback: run_scrape(params, progress_callback))
+
+def run_scrape_shared(params, progress_callback=None):
+    """run_scrape dengan single-flight: hasil dan progress event sama untuk semua request identik"""
+    return scrape_flights.run(
+        flight_key(params), lambda callback: run_scrape(params, callback), progress_callback
+    )
+
+# Worker background untuk /api/jobs; jumlahnya sama dengan browser supaya tidak antre di pool
+# (engine http tidak memakai browser, jadi bisa jalan sebanyak pool koneksinya)
+job_manager = JobManager(run_scrape_shared, max_workers=HTTP_POOL_SIZE if SCRAPER_ENGINE == 'http' else MAX_BROWSERS)
+
 @app.route('/')
 def index():
     """Halaman utama dengan form input"""
     return render_template('index.html')
 
+def parse_scrape_params(data):
+    """
+    Validasi dan konversi parameter scraping dari JSON request
+
+    Returns:
+        dict params untuk run_scrape (kwargs search_places, ditambah mode/bbox/grid untuk tiling)
+
+    Raises:
+        ValueError dengan pesan yang bisa langsung ditampilkan ke user
+    """
+    data = data or {}
+    query = data.get('query', '')
+    location = data.get('location', '')
+    lat = data.get('lat')
+    lng = data.get('lng')
+    radius_m = data.get('radius_m')
+    
+    if not query:
+        raise ValueError('Query harus diisi')
+    
+    mode = data.get('mode', 'single')
+    if mode not in ('single', 'tiles'):
+        raise ValueError("Mode harus 'single' atau 'tiles'")
+    
+    engine = data.get('engine')
+    if engine is not None and engine not in ENGINES:
+        raise ValueError(f"Engine harus salah satu dari: {', '.join(ENGINES)}")
+    
+    bbox = data.get('bbox')
+    if mode == 'tiles':
+        if bbox is not None and (not isinstance(bbox, (list, tuple)) or len(bbox) != 4):
+            raise ValueError('bbox harus berisi [south, west, north, east]')
+        if bbox is None and (not lat or not lng):
+            raise ValueError('Mode tiles membutuhkan bbox atau koordinat (lat, lng)')
+    elif not location and (not lat or not lng):
+        raise ValueError('Location atau koordinat (lat, lng) harus diisi')
+    
+    params = {
+        'query': query,
+        'location': location,
+        'min_rating': float(data.get('min_rating', 0)),
+        # Mode tiles defaultnya seluruh area (0 = tanpa batas); single tetap 100
+        'max_results': int(data.get('max_results', 0 if mode == 'tiles' else 100)),
+        # Parse koordinat jika ada
+        'lat': float(lat) if lat else None,
+        'lng': float(lng) if lng else None,
+        'radius_m': int(radius_m) if radius_m else None,
+        # refresh: scraping ulang dan perbarui cache; no_cache: lewati cache sepenuhnya
+        'refresh_cache': bool(data.get('refresh', False)),
+        'use_cache': not data.get('no_cache', False)
+    }
+    if engine:
+        params['engine'] = engine
+    incremental = data.get('incremental')
+    if incremental:
+        # true = INCREMENTAL_MAX_AGE, angka = umur maksimal (detik) tempat yang dianggap masih segar
+        params['incremental_max_age'] = INCREMENTAL_MAX_AGE if incremental is True else int(incremental)
+    if data.get('delta'):
+        if incremental:
+            raise ValueError('delta tidak bisa digabung dengan incremental (hasil incremental parsial)')
+        # Hanya tempat baru, berubah dan hilang dibanding snapshot terakhir pencarian yang sama
+        params['delta'] = True
+    if data.get('resume'):
+        # Lanjutkan checkpoint pencarian yang sama yang terputus (crash, restart, jaringan)
+        params['resume'] = True
+    from_index = data.get('from_index')
+    if from_index:
+        if mode != 'tiles' and (not lat or not lng):
+            raise ValueError('from_index membutuhkan koordinat (lat, lng)')
+        # true = INDEX_MAX_AGE, angka = umur coverage maksimal (detik); area lain tetap di-scrape
+        params['index_max_age'] = INDEX_MAX_AGE if from_index is True else int(from_index)
+    if data.get('enrich'):
+        # Buka halaman detail tiap tempat: telepon, website, jam buka, plus code
+        params['enrich'] = True
+    if mode == 'tiles':
+        params['mode'] = mode
+        params['bbox'] = [float(v) for v in bbox] if bbox else None
+        params['grid'] = int(data['grid']) if data.get('grid') else None
+    return params
+
+# Batas jumlah job (query x lokasi) dalam satu batch
+MAX_BATCH_JOBS = int(os.environ.get('MAX_BATCH_JOBS', 500))
+
+def parse_batch_params(data):
+    """
+    Pecah request batch menjadi list params run_scrape
+
+    Format:
+        {"items": [{"query": ..., "location": ...}, ...]}, atau
+        {"queries": [...], "locations": [...], ...} untuk semua kombinasi query x lokasi;
+        field lain (min_rating, max_results, engine, enrich, ...) berlaku untuk semua job
+        dan bisa di-override per item
+
+    Raises:
+        ValueError dengan nomor item yang tidak valid
+    """
+    data = data or {}
+    common = {key: value for key, value in data.items() if key not in ('items', 'queries', 'locations')}
+    if 'items' in data:
+        if not isinstance(data['items'], list):
+            raise ValueError('items harus berupa list')
+        items = [dict(common, **item) for item in data['items']]
+    elif 'queries' in data or 'locations' in data:
+        queries = data.get('queries') or [data.get('query', '')]
+        locations = data.get('locations') or [data.get('location', '')]
+        if not isinstance(queries, list) or not isinstance(locations, list):
+            raise ValueError('queries dan locations harus berupa list')
+        items = [dict(common, query=query, location=location) for query in queries for location in locations]
+    else:
+        items = [common]
+    
+    if not items:
+        raise ValueError('Batch kosong')
+    if len(items) > MAX_BATCH_JOBS:
+        raise ValueError(f"Batch maksimal {MAX_BATCH_JOBS} job, diterima {len(items)}")
+    params_list = []
+    for i, item in enumerate(items):
+        try:
+            params_list.append(parse_scrape_params(item))
+        except (ValueError, TypeError) as e:
+            raise ValueError(f"Item {i + 1}: {e}")
+    return params_list
+
 @app.route('/api/scrape', methods=['POST'])
 def scrape_maps():
     """API endpoint untuk scraping Google Maps"""
     try:
-        data = request.get_json()
-        
-        # Ambil parameter dari request
-        query = data.get('query', '')
-        location = data.get('location', '')
-        min_rating = float(data.get('min_rating', 0))
-        max_results = int(data.get('max_results', 100))
-        lat = data.get('lat')
-        lng = data.get('lng')
-        radius_m = data.get('radius_m')
-        
-        if not query:
-            return jsonify({
-                'success': False,
-                'error': 'Query harus diisi'
-            }), 400
-        
-        if not location and (not lat or not lng):
+        try:
+            params = parse_scrape_params(request.get_json())
+        except (TypeError, ValueError) as e:
             return jsonify({
                 'success': False,
-                'error': 'Location atau koordinat (lat, lng) harus diisi'
+                'error': str(e)
             }), 400
         
-        # Parse koordinat jika ada
-        lat_float = float(lat) if lat else None
-        lng_float = float(lng) if lng else None
-        radius_int = int(radius_m) if radius_m else None
+        # Lakukan scraping (driver dipinjam dari pool bersama; request identik menumpang satu scraping)
+        metrics = []
+        delta = {}
         
-        # Inisialisasi scraper
-        scraper = GoogleMapsScraper()
+        def on_progress(event, data):
+            if event == 'metrics':
+                metrics.append(data)
+            elif event == 'delta':
+                delta.update(data)
         
-        # Lakukan scraping
-        results = scraper.search_places(
-            query=query,
-            location=location,
-            min_rating=min_rating,
-            max_results=max_results,
-            lat=lat_float,
-            lng=lng_float,
-            radius_m=radius_int
-        )
+        results = run_scrape_shared(params, on_progress)
         
-        return jsonify({
+        response = {
             'success': True,
-            'query': query,
-            'location': location,
-            'min_rating': min_rating,
+            'query': params['query'],
+            'location': params['location'],
+            'min_rating': params['min_rating'],
             'total_results': len(results),
-            'results': results
-        })
+            'results': results,
+            'metrics': metrics
+        }
+        if params.get('delta'):
+            # Mode delta: hanya diff, bukan seluruh hasil
+            del response['results']
+            response['delta'] = delta
+        return jsonify(response)
         
+    except BlockedError as e:
+        # Scheduler sedang backoff; klien sebaiknya mencoba lagi nanti
+        retry_after = max(1, int(navigation_scheduler.stats()['backoff_remaining']))
+        return jsonify({
+            'success': False,
+            'error': str(e),
+            'blocked': e.reason
+        }), 503, {'Retry-After': str(retry_after)}
     except Exception as e:
         return jsonify({
             'success': False,
             'error': str(e)
         }), 500
 
+@app.route('/metrics', methods=['GET'])
+def metrics_endpoint():
+    """Metrics format teks Prometheus (durasi fase, perintah WebDriver, tunggu, pool)"""
+    return Response(REGISTRY.render(), mimetype='text/plain; version=0.0.4')
+
+@app.route('/health', methods=['GET'])
+def health_endpoint():
+    """Status proses: chromedriver yang dipakai (path, versi, sumber) dan isi pool driver"""
+    return jsonify({
+        'status': 'ok',
+        'chromedriver': chromedriver_info(),
+        'pool': driver_pool.stats()
+    })
+
+@app.route('/api/scrape/stream', methods=['POST'])
+def scrape_maps_stream():
+    """
+    Streaming scraping: kirim tiap tempat segera setelah diekstrak
+
+    Format NDJSON (default) atau Server-Sent Events jika `?format=sse` / Accept: text/event-stream.
+    Setiap baris/event adalah {"type": "place", "place": {...}}, diakhiri {"type": "done", "total": N}
+    atau {"type": "error", "error": "..."}.
+    """
+    try:
+        params = parse_scrape_params(request.get_json())
+    except (TypeError, ValueError) as e:
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 400
+    
+    if params.get('mode') == 'tiles':
+        return jsonify({
+            'success': False,
+            'error': "Mode tiles tidak mendukung streaming, gunakan /api/jobs"
+        }), 400
+    
+    if params.pop('enrich', False):
+        return jsonify({
+            'success': False,
+            'error': "Enrichment tidak didukung streaming, gunakan /api/scrape atau /api/jobs"
+        }), 400
+    
+    if params.get('delta'):
+        return jsonify({
+            'success': False,
+            'error': "Mode delta tidak didukung streaming, gunakan /api/scrape atau /api/jobs"
+        }), 400
+    
+    use_sse = request.args.get('format') == 'sse' or 'text/event-stream' in request.headers.get('Accept', '')
+    
+    def encode(message):
+        line = json.dumps(message, ensure_ascii=False)
+        return f"data: {line}\n\n" if use_sse else line + "\n"
+    
+    # Stream identik yang sedang berjalan ditumpangi: event di buffer replay dikirim ulang dulu,
+    # tempat yang sudah terbuang dari buffer dikirim di akhir (lihat Flight.iter_events)
+    flight = start_scrape(params)
+    max_results = params['max_results']
+    
+    def generate():
+        total = 0
+        try:
+            for event, place in flight.iter_events():
+                # search_places memotong ke max_results di akhir; stream memotong di sini
+                if event != 'place' or (max_results > 0 and total >= max_results):
+                    continue
+                total += 1
+                yield encode({'type': 'place', 'index': total - 1, 'place': place})
+            flight.wait()
+            yield encode({'type': 'done', 'total': total})
+        except Exception as e:
+            print(f"[GAGAL] Streaming error: {e}")
+            yield encode({'type': 'error', 'error': str(e), 'total': total})
+    
+    mimetype = 'text/event-stream' if use_sse else 'application/x-ndjson'
+    # X-Accel-Buffering: cegah proxy (nginx) menahan response sampai selesai
+    return Response(generate(), mimetype=mimetype, headers={
+        'Cache-Control': 'no-cache',
+        'X-Accel-Buffering': 'no'
+    })
+
+@app.route('/api/jobs', methods=['POST'])
+def create_job():
+    """Jadwalkan scraping di background dan langsung kembalikan job id"""
+    try:
+        params = parse_scrape_params(request.get_json())
+    except (TypeError, ValueError) as e:
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 400
+    
+    job = job_manager.submit(params)
+    print(f"[INFO] Job {job.id} dijadwalkan: {params['query']} di {params['location'] or (params['lat'], params['lng'])}")
+    return jsonify({
+        'success': True,
+        'job_id': job.id,
+        'state': job.state,
+        'status_url': f"/api/jobs/{job.id}"
+    }), 202
+
+@app.route('/api/jobs/<job_id>', methods=['GET'])
+def get_job(job_id):
+    """Status, progress dan hasil (parsial) dari job; ?since=N untuk hasil mulai index N"""
+    job = job_manager.get(job_id)
+    if not job:
+        return jsonify({
+            'success': False,
+            'error': 'Job tidak ditemukan'
+        }), 404
+    since = max(0, request.args.get('since', 0, type=int))
+    return jsonify(dict(job.to_dict(since=since), success=True))
+
+@app.route('/api/batch', methods=['POST'])
+def create_batch():
+    """Jadwalkan banyak scraping (query x lokasi) sekaligus di worker pool"""
+    try:
+        params_list = parse_batch_params(request.get_json())
+    except (TypeError, ValueError) as e:
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 400
+    
+    batch = job_manager.submit_batch(params_list)
+    print(f"[INFO] Batch {batch.id} dijadwalkan: {len(batch.jobs)} job")
+    return jsonify({
+        'success': True,
+        'batch_id': batch.id,
+        'total_jobs': len(batch.jobs),
+        'job_ids': [job.id for job in batch.jobs],
+        'status_url': f"/api/batch/{batch.id}",
+        'results_url': f"/api/batch/{batch.id}/results"
+    }), 202
+
+@app.route('/api/batch/<batch_id>', methods=['GET'])
+def get_batch(batch_id):
+    """Status batch: jumlah job per state dan ringkasan tiap job"""
+    batch = job_manager.get_batch(batch_id)
+    if not batch:
+        return jsonify({
+            'success': False,
+            'error': 'Batch tidak ditemukan'
+        }), 404
+    return jsonify(dict(batch.to_dict(), success=True))
+
+@app.route('/api/batch/<batch_id>/results', methods=['GET'])
+def get_batch_results(batch_id):
+    """
+    Hasil batch format NDJSON: satu baris per job, dikirim segera setelah job selesai
+    (urut selesai, bukan urut submit); response berakhir saat semua job selesai
+    """
+    batch = job_manager.get_batch(batch_id)
+    if not batch:
+        return jsonify({
+            'success': False,
+            'error': 'Batch tidak ditemukan'
+        }), 404
+    
+    def generate():
+        for job in batch.iter_finished():
+            yield json.dumps(job.to_record(), ensure_ascii=False) + "\n"
+    
+    return Response(generate(), mimetype='application/x-ndjson', headers={
+        'Cache-Control': 'no-cache',
+        'X-Accel-Buffering': 'no'
+    })
+
+@app.route('/api/places/<place_id>', methods=['GET'])
+def get_place(place_id):
+    """Record tempat dari place store: field terbaru, first_seen/last_seen dan histori rating/ulasan"""
+    place = place_store.get(place_id)
+    if not place:
+        return jsonify({
+            'success': False,
+            'error': 'Tempat tidak ditemukan'
+        }), 404
+    return jsonify({
+        'success': True,
+        'place': place
+    })
+
 @app.route('/api/scrape-form', methods=['POST'])
 def scrape_maps_form():
     """Endpoint untuk form submission (HTML form)"""
@@ -85,13 +555,13 @@ def scrape_maps_form():
                                  error='Query dan location harus diisi')
         
         print(f"[INFO] Memulai scraping: {query} di {location} dengan rating >= {min_rating}, max_results = {max_results}")
-        scraper = GoogleMapsScraper()
-        results = scraper.search_places(
-            query=query,
-            location=location,
-            min_rating=min_rating,
-            max_results=max_results
-        )
+        # Lewat single-flight juga, jadi submit form yang sama dengan request API ikut menumpang
+        results = run_scrape_shared(parse_scrape_params({
+            'query': query,
+            'location': location,
+            'min_rating': min_rating,
+            'max_results': max_results
+        }))
         
         print(f"[INFO] Scraping selesai. Ditemukan {len(results)} hasil")
         return render_template('index.html', 
@@ -0,0 +1,112 @@
+"""
+Runner batch dari command line: baca file JSONL (satu request per baris), jalankan semua job
+paralel di worker/driver pool, lalu tulis hasil sebagai JSONL segera setelah tiap job selesai
+
+Contoh:
+    python batch.py kota.jsonl -o hasil.jsonl --workers 4
+    python batch.py kota.jsonl -o hasil.jsonl --engine http --workers 16
+
+Setiap baris input memakai format yang sama dengan body POST /api/batch, mis.
+    {"query": "kedai kopi", "location": "Jogja", "min_rating": 4}
+    {"queries": ["hotel", "kafe"], "locations": ["Solo", "Semarang"], "max_results": 50}
+
+Setiap baris output berisi satu job: job_id, query, location, state, total_results, results,
+error dan seconds (urut selesai). Baris input yang tidak valid ditulis dengan state 'invalid'.
+
+Dengan --delta (atau "delta": true per baris), results diganti delta: hanya tempat baru, berubah
+dan hilang dibanding snapshot terakhir pencarian yang sama, mis. untuk crawl harian:
+    python batch.py kota.jsonl -o perubahan.jsonl --delta
+
+Dengan --resume, job yang terputus di run sebelumnya (crash, Ctrl+C) dilanjutkan dari checkpoint.
+"""
+import argparse
+import json
+import os
+import sys
+import time
+
+
+def read_batch_file(path, parse_batch_params, defaults=None):
+    """
+    Args:
+        defaults: Field yang dipakai jika tidak ada di baris input (mis. {'delta': True})
+
+    Returns:
+        (params_list, invalid): invalid berisi record error per baris yang tidak valid
+    """
+    params_list = []
+    invalid = []
+    with open(path, encoding='utf-8') as f:
+        for line_number, line in enumerate(f, 1):
+            line = line.strip()
+            if not line or line.startswith('#'):
+                continue
+            try:
+                params_list.extend(parse_batch_params(dict(defaults or {}, **json.loads(line))))
+            except (ValueError, TypeError, AttributeError) as e:
+                print(f"[GAGAL] Baris {line_number} tidak valid: {e}")
+                invalid.append({'line': line_number, 'state': 'invalid', 'error': str(e)})
+    return params_list, invalid
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Jalankan banyak scraping (query x lokasi) dari file JSONL')
+    parser.add_argument('input', help='File JSONL, satu request per baris')
+    parser.add_argument('-o', '--output', default='batch_results.jsonl', help='File JSONL hasil')
+    parser.add_argument('--workers', type=int, default=int(os.environ.get('MAX_BROWSERS', 2)),
+                        help='Job yang berjalan bersamaan (= jumlah Chrome di pool)')
+    parser.add_argument('--engine', choices=['selenium', 'http'], help='Engine default untuk semua job')
+    parser.add_argument('--delta', action='store_true',
+                        help='Tulis hanya tempat baru/berubah/hilang dibanding snapshot sebelumnya')
+    parser.add_argument('--resume', action='store_true',
+                        help='Lanjutkan checkpoint job yang terputus di run sebelumnya')
+    args = parser.parse_args()
+
+    # Ukuran pool dibaca app.py saat import, jadi harus di-set sebelum import
+    os.environ['MAX_BROWSERS'] = str(args.workers)
+    if args.engine:
+        os.environ['SCRAPER_ENGINE'] = args.engine
+        if args.engine == 'http':
+            os.environ['HTTP_POOL_SIZE'] = str(args.workers)
+    from app import driver_pool, job_manager, parse_batch_params
+
+    defaults = {}
+    if args.delta:
+        defaults['delta'] = True
+    if args.resume:
+        defaults['resume'] = True
+    params_list, invalid = read_batch_file(args.input, parse_batch_params, defaults)
+    print(f"[INFO] {len(params_list)} job dari {args.input}, {args.workers} worker")
+
+    started = time.perf_counter()
+    failed = len(invalid)
+    total_results = 0
+    try:
+        with open(args.output, 'w', encoding='utf-8') as out:
+            for record in invalid:
+                out.write(json.dumps(record, ensure_ascii=False) + '\n')
+            if params_list:
+                batch = job_manager.submit_batch(params_list)
+                for done, job in enumerate(batch.iter_finished(), 1):
+                    record = job.to_record()
+                    out.write(json.dumps(record, ensure_ascii=False) + '\n')
+                    out.flush()
+                    failed += record['state'] != 'done'
+                    total_results += record['total_results']
+                    print(f"[INFO] ({done}/{len(params_list)}) {record['query']} di {record['location']}: "
+                          f"{record['state']}, {record['total_results']} hasil ({record['seconds']}s)")
+                    if record.get('delta'):
+                        delta = record['delta']
+                        print(f"[INFO]     delta: {len(delta['added'])} baru, {len(delta['changed'])} berubah, "
+                              f"{len(delta['removed'])} hilang")
+    finally:
+        job_manager.executor.shutdown(wait=False, cancel_futures=True)
+        driver_pool.close_all()
+
+    print(f"[INFO] Batch selesai dalam {time.perf_counter() - started:.1f} detik: {total_results} hasil, "
+          f"{failed} gagal. Hasil disimpan ke {args.output}")
+    return 1 if failed else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,233 @@
+"""
+Server HTTP lokal yang meniru halaman hasil pencarian Google Maps untuk benchmark offline
+
+Kartu dibuat deterministik dari seed, jadi hasil scraping bisa dibandingkan dengan
+ground truth (make_cards) untuk menghitung akurasi ekstraksi.
+"""
+import json
+import os
+import random
+import re
+import threading
+from html import escape
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, unquote, urlsplit
+
+FIXTURE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'fixtures')
+
+CATEGORIES = ['Kedai Kopi', 'Kafe', 'Restoran', 'Hotel', 'Toko Roti', 'Warung Makan']
+# Isi "foto" dummy ~20 KB supaya biaya bandwidth per kartu mirip thumbnail asli
+PHOTO_BYTES = b'\xff\xd8\xff\xe0' + bytes(20 * 1024)
+STREETS = ['Jl. Malioboro', 'Jl. Kaliurang', 'Jl. Prawirotaman', 'Jl. Gejayan', 'Jl. Magelang']
+DAYS = ['Senin', 'Selasa', 'Rabu', 'Kamis', 'Jumat', 'Sabtu', 'Minggu']
+PLACE_ID_PATTERN = re.compile(r'!1s(0x[0-9a-f]+:0x[0-9a-f]+)')
+
+
+def make_cards(count, seed=42, lat=-7.7956, lng=110.3695):
+    """Ground truth: daftar tempat dengan field yang sama seperti hasil search_places"""
+    rng = random.Random(seed)
+    cards = []
+    for i in range(count):
+        # Beberapa nama sengaja sama (cabang jaringan) dengan place_id berbeda
+        name = f"Kopi Kenangan {STREETS[i % len(STREETS)].split()[-1]}" if i % 17 == 0 else f"Tempat Uji {i + 1}"
+        rating = round(rng.uniform(3.0, 5.0), 1)
+        review_count = rng.randint(1, 5000)
+        place_lat = round(lat + rng.uniform(-0.05, 0.05), 7)
+        place_lng = round(lng + rng.uniform(-0.05, 0.05), 7)
+        place_id = f"0x2e7a{i:012x}:0x{rng.getrandbits(60):x}"
+        address = f"{STREETS[i % len(STREETS)]} No.{i + 1}"
+        rating_text = f"{rating:.1f}".replace('.', ',')
+        review_text = f"{review_count:,}".replace(',', '.')
+        cards.append({
+            'name': name,
+            'rating': rating,
+            'review_count': review_count,
+            'category': CATEGORIES[i % len(CATEGORIES)],
+            'address': address,
+            'place_id': place_id,
+            'lat': place_lat,
+            'lng': place_lng,
+            'link': (
+                f"/maps/place/{name.replace(' ', '+')}/data=!4m7!3m6!1s{place_id}"
+                f"!8m2!3d{place_lat}!4d{place_lng}!16s%2Fg%2F11fixture{i}"
+            ),
+            'rating_label': f"{rating_text} bintang {review_text} Ulasan",
+            'rating_text': f"{rating_text}({review_text})",
+            'photo': f"/photos/{i}.jpg",
+            # Field halaman detail (untuk enrichment)
+            'phone': f"0274 {500000 + i}",
+            'website': f"https://tempat-uji-{i + 1}.example/",
+            'plus_code': f"{'6PQ' if i % 2 else '6PR'}{i % 10}+{i % 7}{i % 9} Yogyakarta",
+            'hours': [f"{day}: 08.00–{20 + i % 3}.00" for day in DAYS]
+        })
+    return cards
+
+
+def build_search_payload(cards, query='', wrapped=True):
+    """
+    Body response XHR pencarian (/search?tbm=map) dengan layout array seperti Maps asli:
+    info[10] feature id, [11] nama, [4][7]/[4][8] rating/ulasan, [9][2]/[9][3] koordinat,
+    [13] kategori, [39] alamat. Dibungkus {"c":0,"d":")]}'\n..."}/*""*/ seperti response XHR
+    asli; wrapped=False untuk string )]}'... yang tertanam di APP_INITIALIZATION_STATE.
+    """
+    entries = [[None, None, [query]]]
+    for card in cards:
+        info = [None] * 80
+        info[2] = [card['address']]
+        info[4] = [None] * 7 + [card['rating'], card['review_count']]
+        info[9] = [None, None, card['lat'], card['lng']]
+        info[10] = card['place_id']
+        info[11] = card['name']
+        info[13] = [card['category']]
+        info[18] = f"{card['name']}, {card['address']}"
+        info[39] = card['address']
+        entry = [None] * 15
+        entry[14] = info
+        entries.append(entry)
+    body = ")]}'\n" + json.dumps([[query, entries]], ensure_ascii=False)
+    if not wrapped:
+        return body
+    return json.dumps({'c': 0, 'd': body}) + '/*""*/'
+
+
+class FixtureHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        path = unquote(self.path)
+        scenario = self.server.scenario
+        if path.startswith('/search?'):
+            self._send_search_payload(scenario)
+        elif path.startswith('/maps/search/'):
+            query = path[len('/maps/search/'):].split('/')[0].replace('+', ' ')
+            cards = make_cards(scenario['cards'], seed=scenario['seed'])
+            if scenario['source'] == 'xhr':
+                # Seperti Maps asli: halaman pertama di-render di HTML, sisanya lewat XHR
+                cards = [] if scenario['replay_dir'] else cards[:scenario['batch']]
+            # Halaman pertama juga tertanam sebagai state awal seperti Maps asli (dibaca HttpEngine)
+            first_page = cards[:scenario['batch']]
+            app_state = [[query], None, None, [None, None, build_search_payload(first_page, query, wrapped=False)]]
+            html = self.server.template
+            for key, value in (
+                ('__APP_STATE__', json.dumps(app_state).replace('</', '<\\/')),
+                ('__CARDS__', json.dumps(cards)),
+                ('__SOURCE__', scenario['source']),
+                ('__BATCH__', str(scenario['batch'])),
+                ('__DELAY_MS__', str(scenario['delay_ms'])),
+                ('__MODE__', scenario['mode']),
+                ('__QUERY__', query)
+            ):
+                html = html.replace(key, value)
+            self._send(200, 'text/html; charset=utf-8', html.encode('utf-8'))
+        elif path.startswith('/photos/'):
+            # Foto kartu: dihitung supaya efek mode lightweight terlihat di laporan
+            with self.server.counter_lock:
+                self.server.photo_requests += 1
+            self._send(200, 'image/jpeg', PHOTO_BYTES)
+        elif path.startswith('/maps/place/'):
+            self._send_place_detail(path, scenario)
+        else:
+            self._send(404, 'text/plain', b'not found')
+
+    def _send_search_payload(self, scenario):
+        params = parse_qs(urlsplit(self.path).query)
+        start = int(params.get('start', ['0'])[0])
+        num = int(params.get('num', [str(scenario['batch'])])[0])
+        query = params.get('q', [''])[0]
+        if scenario['replay_dir']:
+            # Replay response asli yang direkam: satu file per halaman, urut nama file
+            files = sorted(os.listdir(scenario['replay_dir']))
+            page = start // num if num else 0
+            if page >= len(files):
+                self._send(200, 'application/json; charset=UTF-8', build_search_payload([], query).encode('utf-8'))
+                return
+            with open(os.path.join(scenario['replay_dir'], files[page]), 'rb') as f:
+                self._send(200, 'application/json; charset=UTF-8', f.read())
+            return
+        cards = make_cards(scenario['cards'], seed=scenario['seed'])[start:start + num]
+        self._send(200, 'application/json; charset=UTF-8', build_search_payload(cards, query).encode('utf-8'))
+
+    def _send_place_detail(self, path, scenario):
+        """Halaman detail tempat dengan markup data-item-id seperti panel info Maps"""
+        match = PLACE_ID_PATTERN.search(path)
+        cards = {card['place_id']: card for card in make_cards(scenario['cards'], seed=scenario['seed'])}
+        card = cards.get(match.group(1)) if match else None
+        if not card:
+            self._send(404, 'text/html; charset=utf-8', b'<html><body>Tempat tidak ditemukan</body></html>')
+            return
+        rows = ''.join(
+            f"<tr><td>{escape(day)}</td><td aria-label=\"{escape(hours)}\">{escape(hours)}</td></tr>"
+            for day, hours in (line.split(': ', 1) for line in card['hours'])
+        )
+        html = (
+            f"<html><body><h1>{escape(card['name'])}</h1>"
+            f"<button data-item-id=\"address\" aria-label=\"Alamat: {escape(card['address'])}\">{escape(card['address'])}</button>"
+            f"<a data-item-id=\"authority\" href=\"{escape(card['website'])}\">{escape(card['website'])}</a>"
+            f"<button data-item-id=\"phone:tel:{card['phone'].replace(' ', '')}\" "
+            f"aria-label=\"Telepon: {escape(card['phone'])}\">{escape(card['phone'])}</button>"
+            f"<button data-item-id=\"oloc\" aria-label=\"Plus code: {escape(card['plus_code'])}\">{escape(card['plus_code'])}</button>"
+            f"<table>{rows}</table></body></html>"
+        )
+        self._send(200, 'text/html; charset=utf-8', html.encode('utf-8'))
+
+    def _send(self, status, content_type, body):
+        self.send_response(status)
+        self.send_header('Content-Type', content_type)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class FixtureServer:
+    def __init__(self, host='127.0.0.1', port=0):
+        """Server fixture di thread background; port 0 = pilih port kosong"""
+        self.httpd = ThreadingHTTPServer((host, port), FixtureHandler)
+        with open(os.path.join(FIXTURE_DIR, 'feed.html'), encoding='utf-8') as f:
+            self.httpd.template = f.read()
+        self.httpd.counter_lock = threading.Lock()
+        self.httpd.photo_requests = 0
+        self.configure()
+        self.thread = None
+
+    @property
+    def base_url(self):
+        host, port = self.httpd.server_address[:2]
+        return f"http://{host}:{port}/maps"
+
+    def configure(self, cards=20, batch=20, delay_ms=300, mode='scroll', seed=42, source='inline', replay_dir=None):
+        """
+        Atur skenario halaman berikutnya
+
+        Args:
+            cards: Total kartu hasil
+            batch: Kartu per lazy-load (feed Maps asli memuat ~20 per batch)
+            delay_ms: Jeda sebelum batch berikutnya muncul
+            mode: 'scroll' (lazy-load saat scroll) atau 'button' (tombol "Show more")
+            source: 'inline' (semua kartu ada di HTML) atau 'xhr' (batch berikutnya diambil dari
+                    /search?tbm=map seperti Maps asli, untuk extraction_mode='network')
+            replay_dir: Direktori body response /search?tbm=map yang direkam dari Maps asli;
+                        jika diisi, semua halaman (source 'xhr') di-replay dari file tersebut
+        """
+        self.httpd.scenario = {
+            'cards': cards, 'batch': batch, 'delay_ms': delay_ms, 'mode': mode, 'seed': seed,
+            'source': 'xhr' if replay_dir else source, 'replay_dir': replay_dir
+        }
+
+    def photo_requests(self):
+        """Jumlah request foto sejak reset_counters() (0 jika resource diblokir)"""
+        with self.httpd.counter_lock:
+            return self.httpd.photo_requests
+
+    def reset_counters(self):
+        with self.httpd.counter_lock:
+            self.httpd.photo_requests = 0
+
+    def start(self):
+        self.thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+        self.thread.start()
+        return self
+
+    def stop(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
@@ -0,0 +1,186 @@
+"""
+Benchmark offline GoogleMapsScraper terhadap fixture hasil Maps yang disajikan secara lokal
+
+Contoh:
+    python benchmark/run_benchmark.py
+    python benchmark/run_benchmark.py --sizes 20 100 500 --mode button --delay-ms 500 --json bench.json
+    python benchmark/run_benchmark.py --source xhr --extraction-mode network
+    python benchmark/run_benchmark.py --replay recorded/ --extraction-mode network
+    python benchmark/run_benchmark.py --engine http   # tanpa Chrome
+    python benchmark/run_benchmark.py --sizes 200 --enrich --enrich-tabs 8
+
+Setiap ukuran melaporkan wall time, jumlah perintah WebDriver, tempat per detik dan
+akurasi ekstraksi (dibandingkan dengan ground truth fixture). Driver dibuat sekali di awal
+(seperti driver pool di app.py), jadi cold start Chrome tidak ikut terhitung.
+"""
+import argparse
+import json
+import os
+import sys
+import time
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if ROOT_DIR not in sys.path:
+    sys.path.insert(0, ROOT_DIR)
+
+from driver_pool import DriverPool
+from enrich import DETAIL_FIELDS, PlaceEnricher
+from fixture_server import FixtureServer, make_cards
+from scraper import GoogleMapsScraper
+
+ACCURACY_FIELDS = ['name', 'rating', 'review_count', 'category', 'address', 'lat', 'lng']
+
+
+def extraction_accuracy(results, expected):
+    """
+    Rasio field yang benar terhadap ground truth
+
+    Returns:
+        (recall, accuracy): recall = tempat yang ditemukan, accuracy = field benar dari semua field
+        yang diharapkan (tempat yang tidak ditemukan dihitung salah semua)
+    """
+    by_id = {place.get('place_id'): place for place in results if place.get('place_id')}
+    found = 0
+    correct = 0
+    for card in expected:
+        place = by_id.get(card['place_id'])
+        if not place:
+            continue
+        found += 1
+        for field in ACCURACY_FIELDS:
+            if isinstance(card[field], float):
+                correct += place.get(field) is not None and abs(place[field] - card[field]) < 1e-6
+            else:
+                correct += place.get(field) == card[field]
+    total = len(expected) or 1
+    return found / total, correct / (total * len(ACCURACY_FIELDS))
+
+
+def detail_accuracy(results, expected):
+    """Rasio field detail (telepon, website, jam buka, plus code) yang benar setelah enrichment"""
+    by_id = {card['place_id']: card for card in expected}
+    checked = 0
+    correct = 0
+    for place in results:
+        card = by_id.get(place.get('place_id'))
+        if not card:
+            continue
+        for field in DETAIL_FIELDS:
+            checked += 1
+            correct += place.get(field) == card[field]
+    return correct / checked if checked else 0.0
+
+
+def run(sizes, mode='scroll', delay_ms=300, batch=20, headless=True, feed_idle_timeout=5.0, extraction_mode='bulk',
+        lightweight=False, source='inline', replay_dir=None, engine='selenium', enrich=False, enrich_tabs=4):
+    server = FixtureServer().start()
+    # Opsi driver (performance log untuk mode network) diambil dari scraper pembuat pool
+    scraper = GoogleMapsScraper(headless=headless, lightweight=lightweight, extraction_mode=extraction_mode)
+    pool = DriverPool(scraper._get_driver, max_size=1)
+    reports = []
+    try:
+        # Pemanasan: buat driver sebelum pengukuran (engine http tidak memakai browser)
+        if engine == 'selenium' or enrich:
+            pool.release(pool.acquire())
+        for size in sizes:
+            server.configure(cards=size, batch=batch, delay_ms=delay_ms, mode=mode, source=source, replay_dir=replay_dir)
+            server.reset_counters()
+            bench_scraper = GoogleMapsScraper(
+                headless=headless,
+                driver_pool=pool,
+                base_url=server.base_url,
+                feed_idle_timeout=feed_idle_timeout,
+                extraction_mode=extraction_mode,
+                engine=engine
+            )
+            started = time.perf_counter()
+            results = bench_scraper.search_places(query='kedai kopi', location='Jogja', max_results=size)
+            elapsed = time.perf_counter() - started
+            # Response rekaman tidak punya ground truth
+            recall, accuracy = (None, None) if replay_dir else extraction_accuracy(results, make_cards(size))
+            # Perintah WebDriver dihitung oleh metrics.instrument_driver di search_places
+            metrics = bench_scraper.metrics.to_dict()
+            top_commands = sorted(metrics['commands'].items(), key=lambda item: -item[1])[:5]
+            report = {
+                'cards': size,
+                'mode': mode,
+                'lightweight': lightweight,
+                'photo_requests': server.photo_requests(),
+                'wall_time_s': round(elapsed, 2),
+                'webdriver_commands': metrics['webdriver_commands'],
+                'places': len(results),
+                'places_per_s': round(len(results) / elapsed, 2) if elapsed else 0,
+                'source': 'replay' if replay_dir else source,
+                'engine': engine,
+                'extraction_mode': extraction_mode,
+                'recall': round(recall, 4) if recall is not None else None,
+                'accuracy': round(accuracy, 4) if accuracy is not None else None,
+                'top_commands': top_commands,
+                'phases': metrics['phases'],
+                'waits': metrics['waits']
+            }
+            if enrich:
+                started = time.perf_counter()
+                PlaceEnricher(pool, tabs_per_driver=enrich_tabs).enrich(results)
+                report['enrich_wall_time_s'] = round(time.perf_counter() - started, 2)
+                report['enrich_accuracy'] = None if replay_dir else round(detail_accuracy(results, make_cards(size)), 4)
+                print(f"[BENCH] Enrichment {len(results)} tempat ({enrich_tabs} tab): "
+                      f"{report['enrich_wall_time_s']}s, akurasi {report['enrich_accuracy']}")
+            reports.append(report)
+            print(f"[BENCH] {size} kartu: {report['wall_time_s']}s, {report['webdriver_commands']} perintah, "
+                  f"{report['places_per_s']} tempat/s, recall {report['recall']}, akurasi {report['accuracy']}")
+    finally:
+        pool.close_all()
+        server.stop()
+    return reports
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark offline scraper terhadap fixture Maps lokal')
+    parser.add_argument('--sizes', type=int, nargs='+', default=[20, 100, 500], help='Jumlah kartu per run')
+    parser.add_argument('--mode', choices=['scroll', 'button'], default='scroll', help='Cara fixture memuat batch berikutnya')
+    parser.add_argument('--delay-ms', type=int, default=300, help='Jeda lazy-load fixture per batch')
+    parser.add_argument('--batch', type=int, default=20, help='Kartu per batch lazy-load')
+    parser.add_argument('--source', choices=['inline', 'xhr'], default='inline',
+                        help="'xhr': batch berikutnya dimuat dari /search?tbm=map seperti Maps asli")
+    parser.add_argument('--replay', help='Direktori body response /search?tbm=map rekaman untuk di-replay')
+    parser.add_argument('--engine', choices=['selenium', 'http'], default='selenium')
+    parser.add_argument('--extraction-mode', choices=['bulk', 'element', 'network'], default='bulk')
+    parser.add_argument('--feed-idle-timeout', type=float, default=5.0)
+    parser.add_argument('--lightweight', action='store_true', help='Blokir gambar, font dan tile peta')
+    parser.add_argument('--enrich', action='store_true', help='Ukur juga enrichment halaman detail')
+    parser.add_argument('--enrich-tabs', type=int, default=4, help='Halaman detail yang dimuat bersamaan')
+    parser.add_argument('--no-headless', action='store_true', help='Tampilkan window Chrome')
+    parser.add_argument('--json', help='Simpan laporan ke file JSON')
+    args = parser.parse_args()
+
+    reports = run(
+        args.sizes,
+        mode=args.mode,
+        delay_ms=args.delay_ms,
+        batch=args.batch,
+        headless=not args.no_headless,
+        feed_idle_timeout=args.feed_idle_timeout,
+        extraction_mode=args.extraction_mode,
+        lightweight=args.lightweight,
+        source=args.source,
+        replay_dir=args.replay,
+        engine=args.engine,
+        enrich=args.enrich,
+        enrich_tabs=args.enrich_tabs
+    )
+
+    print()
+    print(f"{'kartu':>6} {'waktu (s)':>10} {'perintah':>9} {'tempat/s':>9} {'recall':>7} {'akurasi':>8}")
+    for report in reports:
+        print(f"{report['cards']:>6} {report['wall_time_s']:>10} {report['webdriver_commands']:>9} "
+              f"{report['places_per_s']:>9} {str(report['recall']):>7} {str(report['accuracy']):>8}")
+
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump(reports, f, indent=2)
+        print(f"[INFO] Laporan disimpan ke {args.json}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,243 @@
+import json
+import os
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+
+
+def normalize_search_key(query, location='', lat=None, lng=None, radius_m=None):
+    """
+    Key pencarian yang stabil: huruf kecil, spasi dirapikan, koordinat dibulatkan
+
+    min_rating dan max_results sengaja tidak masuk key supaya filter bisa dijalankan
+    di atas data yang sudah ada.
+    """
+    def clean(text):
+        return ' '.join((text or '').lower().split())
+
+    if lat is not None and lng is not None:
+        # 4 desimal ~ 11 meter, cukup untuk menganggap dua pencarian berada di titik yang sama
+        where = f"@{round(float(lat), 4)},{round(float(lng), 4)},{int(radius_m or 5000)}m"
+    else:
+        where = clean(location)
+    return f"{clean(query)}|{where}"
+
+
+class ResultCache:
+    def __init__(self, path, ttl=6 * 3600, max_entries=500, max_bytes=50 * 1024 * 1024):
+        """
+        Cache hasil search_places di SQLite dengan TTL dan eviction LRU
+
+        Args:
+            path: Lokasi file SQLite
+            ttl: Umur maksimal entry dalam detik
+            max_entries: Jumlah entry maksimal sebelum entry paling lama tidak dipakai dibuang
+            max_bytes: Total ukuran hasil (JSON) maksimal
+        """
+        self.path = path
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.lock = threading.Lock()
+        if os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        with self._connect() as conn:
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS search_cache (
+                    key TEXT PRIMARY KEY,
+                    min_rating REAL NOT NULL,
+                    max_results INTEGER NOT NULL,
+                    results TEXT NOT NULL,
+                    loaded INTEGER NOT NULL DEFAULT 0,
+                    size INTEGER NOT NULL,
+                    created_at REAL NOT NULL,
+                    expires_at REAL NOT NULL,
+                    last_access REAL NOT NULL
+                )
+            """)
+            # Database lama (sebelum kolom loaded): tambahkan kolomnya
+            if 'loaded' not in {row[1] for row in conn.execute("PRAGMA table_info(search_cache)")}:
+                conn.execute("ALTER TABLE search_cache ADD COLUMN loaded INTEGER NOT NULL DEFAULT 0")
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_search_cache_access ON search_cache (last_access)")
+
+    @contextmanager
+    def _connect(self):
+        """Koneksi per operasi (aman dipakai dari banyak thread), commit lalu ditutup"""
+        conn = sqlite3.connect(self.path, timeout=30)
+        try:
+            with conn:
+                yield conn
+        finally:
+            conn.close()
+
+    def get(self, query, location='', min_rating=0, max_results=100, lat=None, lng=None, radius_m=None,
+            with_loaded=False):
+        """
+        Ambil hasil dari cache, sudah difilter min_rating dan dipotong max_results
+
+        Entry dipakai jika di-scrape dengan min_rating yang sama atau lebih longgar, dan
+        berisi cukup hasil (atau scraping sebelumnya sudah menghabiskan semua hasil).
+
+        Args:
+            with_loaded: True untuk juga mengembalikan jumlah kartu mentah yang ter-load saat
+                         entry di-scrape (sebelum filter min_rating)
+
+        Returns:
+            List of dict tempat, atau None jika cache miss; (list, loaded) jika with_loaded
+        """
+        miss = (None, 0) if with_loaded else None
+        key = normalize_search_key(query, location, lat, lng, radius_m)
+        now = time.time()
+        with self._connect() as conn:
+            row = conn.execute(
+                "SELECT min_rating, max_results, results, loaded, expires_at FROM search_cache WHERE key = ?",
+                (key,)
+            ).fetchone()
+            if not row:
+                return miss
+            cached_min_rating, cached_max_results, results_json, loaded, expires_at = row
+            if expires_at < now:
+                conn.execute("DELETE FROM search_cache WHERE key = ?", (key,))
+                return miss
+            if cached_min_rating > min_rating:
+                return miss
+
+            cached = json.loads(results_json)
+            # Scraping sebelumnya dapat lebih sedikit dari yang diminta: berarti hasil sudah habis
+            exhausted = cached_max_results <= 0 or len(cached) < cached_max_results
+            results = [place for place in cached if place.get('rating', 0) >= min_rating]
+            if max_results > 0:
+                if len(results) < max_results and not exhausted:
+                    return miss
+                results = results[:max_results]
+            elif not exhausted:
+                return miss
+
+            conn.execute("UPDATE search_cache SET last_access = ? WHERE key = ?", (now, key))
+        if with_loaded:
+            return results, max(loaded, len(cached))
+        return results
+
+    def put(self, results, query, location='', min_rating=0, max_results=100, lat=None, lng=None, radius_m=None,
+            loaded=0):
+        """
+        Simpan hasil search_places lalu jalankan eviction; entry yang lebih luas dipertahankan
+
+        loaded: Jumlah kartu mentah yang ter-load di feed (sebelum filter min_rating); dipakai
+        crawler tiling untuk menilai kepadatan tile saat cache hit
+        """
+        key = normalize_search_key(query, location, lat, lng, radius_m)
+        results_json = json.dumps(results, ensure_ascii=False)
+        now = time.time()
+        with self.lock, self._connect() as conn:
+            # Entry lama yang masih berlaku dan lebih luas (min_rating sama/lebih rendah, max_results
+            # sama/lebih besar atau tanpa batas) tidak ditimpa hasil scraping yang lebih sempit
+            conn.execute(
+                "INSERT INTO search_cache "
+                "(key, min_rating, max_results, results, loaded, size, created_at, expires_at, last_access) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?) "
+                "ON CONFLICT (key) DO UPDATE SET min_rating = excluded.min_rating, "
+                "max_results = excluded.max_results, results = excluded.results, loaded = excluded.loaded, "
+                "size = excluded.size, created_at = excluded.created_at, expires_at = excluded.expires_at, "
+                "last_access = excluded.last_access "
+                "WHERE search_cache.expires_at < excluded.created_at "
+                "OR (search_cache.min_rating = excluded.min_rating AND search_cache.max_results = excluded.max_results) "
+                "OR search_cache.min_rating > excluded.min_rating "
+                "OR (search_cache.max_results > 0 "
+                "AND (excluded.max_results <= 0 OR search_cache.max_results < excluded.max_results))",
+                (key, min_rating, max_results, results_json, loaded or 0, len(results_json), now, now + self.ttl, now)
+            )
+            self._evict(conn, now)
+
+    def _evict(self, conn, now):
+        conn.execute("DELETE FROM search_cache WHERE expires_at < ?", (now,))
+        count, total_size = conn.execute("SELECT COUNT(*), COALESCE(SUM(size), 0) FROM search_cache").fetchone()
+        if count <= self.max_entries and total_size <= self.max_bytes:
+            return
+        # Buang entry yang paling lama tidak diakses sampai kembali di bawah batas
+        for key, size in conn.execute("SELECT key, size FROM search_cache ORDER BY last_access").fetchall():
+            if count <= self.max_entries and total_size <= self.max_bytes:
+                break
+            conn.execute("DELETE FROM search_cache WHERE key = ?", (key,))
+            count -= 1
+            total_size -= size
+
+    def clear(self):
+        with self.lock, self._connect() as conn:
+            conn.execute("DELETE FROM search_cache")
+
+
+class DetailCache:
+    def __init__(self, path, ttl=7 * 24 * 3600):
+        """
+        Cache detail tempat (telepon, website, jam buka, plus code) per place_id di SQLite
+
+        Args:
+            path: Lokasi file SQLite (boleh sama dengan ResultCache, tabelnya berbeda)
+            ttl: Umur maksimal detail dalam detik; detail tempat jarang berubah, jadi default 7 hari
+        """
+        self.path = path
+        self.ttl = ttl
+        self.lock = threading.Lock()
+        if os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        with self._connect() as conn:
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS place_details (
+                    place_id TEXT PRIMARY KEY,
+                    details TEXT NOT NULL,
+                    fetched_at REAL NOT NULL,
+                    expires_at REAL NOT NULL
+                )
+            """)
+
+    @contextmanager
+    def _connect(self):
+        conn = sqlite3.connect(self.path, timeout=30)
+        try:
+            with conn:
+                yield conn
+        finally:
+            conn.close()
+
+    def get_many(self, place_ids):
+        """
+        Ambil detail yang belum kedaluwarsa
+
+        Returns:
+            dict place_id -> dict detail (place_id yang tidak ada/kedaluwarsa tidak disertakan)
+        """
+        place_ids = [place_id for place_id in dict.fromkeys(place_ids) if place_id]
+        found = {}
+        now = time.time()
+        with self._connect() as conn:
+            # Batas jumlah parameter SQLite: ambil per 500 id
+            for i in range(0, len(place_ids), 500):
+                chunk = place_ids[i:i + 500]
+                rows = conn.execute(
+                    f"SELECT place_id, details FROM place_details WHERE expires_at >= ? "
+                    f"AND place_id IN ({','.join('?' * len(chunk))})",
+                    [now] + chunk
+                ).fetchall()
+                for place_id, details_json in rows:
+                    found[place_id] = json.loads(details_json)
+        return found
+
+    def get(self, place_id):
+        return self.get_many([place_id]).get(place_id)
+
+    def put(self, place_id, details):
+        if not place_id:
+            return
+        now = time.time()
+        with self.lock, self._connect() as conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO place_details (place_id, details, fetched_at, expires_at) VALUES (?, ?, ?, ?)",
+                (place_id, json.dumps(details, ensure_ascii=False), now, now + self.ttl)
+            )
+            conn.execute("DELETE FROM place_details WHERE expires_at < ?", (now,))
+
+    def clear(self):
+        with self.lock, self._connect() as conn:
+            conn.execute("DELETE FROM place_details")
@@ -0,0 +1,124 @@
+"""
+Checkpoint crawl panjang (pencarian dengan banyak radius, mode tiles) supaya bisa dilanjutkan
+
+Selama crawl berjalan, hasil yang sudah diekstrak dan tahap yang sudah selesai (feed, radius,
+tile) ditulis berkala ke SQLite. Jika Chrome crash, worker restart atau jaringan putus, request
+yang sama dengan `resume` memuat checkpoint dan melewati pekerjaan yang sudah selesai. Checkpoint
+dihapus setelah crawl selesai dengan sukses.
+"""
+import json
+import os
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+
+
+class CheckpointStore:
+    def __init__(self, path, ttl=7 * 24 * 3600):
+        """
+        Args:
+            path: Lokasi file SQLite
+            ttl: Checkpoint yang lebih tua dari ini (detik) diabaikan saat resume
+        """
+        self.path = path
+        self.ttl = ttl
+        self.lock = threading.Lock()
+        if os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        with self._connect() as conn:
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS checkpoints (
+                    key TEXT PRIMARY KEY,
+                    state TEXT NOT NULL,
+                    updated_at REAL NOT NULL
+                )
+            """)
+
+    @contextmanager
+    def _connect(self):
+        conn = sqlite3.connect(self.path, timeout=30)
+        try:
+            with conn:
+                yield conn
+        finally:
+            conn.close()
+
+    def load(self, key):
+        """State checkpoint terakhir, atau None jika tidak ada/kedaluwarsa"""
+        with self._connect() as conn:
+            row = conn.execute("SELECT state, updated_at FROM checkpoints WHERE key = ?", (key,)).fetchone()
+        if not row or row[1] < time.time() - self.ttl:
+            return None
+        return json.loads(row[0])
+
+    def save(self, key, state):
+        data = json.dumps(state, ensure_ascii=False)
+        with self.lock, self._connect() as conn:
+            conn.execute("INSERT OR REPLACE INTO checkpoints (key, state, updated_at) VALUES (?, ?, ?)",
+                         (key, data, time.time()))
+
+    def clear(self, key):
+        with self.lock, self._connect() as conn:
+            conn.execute("DELETE FROM checkpoints WHERE key = ?", (key,))
+
+    def checkpoint(self, key, resume=False, interval=5.0):
+        """
+        Checkpoint untuk satu crawl; resume=False mengabaikan checkpoint lama (ditimpa saat
+        checkpoint pertama ditulis) dan mulai dari awal
+
+        Returns:
+            Checkpoint (state kosong jika tidak resume atau tidak ada checkpoint)
+        """
+        state = None
+        if resume:
+            try:
+                state = self.load(key)
+            except Exception as e:
+                print(f"[DEBUG] Gagal membaca checkpoint: {e}")
+            if state:
+                print(f"[INFO] Melanjutkan checkpoint: {len(state.get('results', []))} hasil sudah tersimpan")
+            else:
+                print(f"[INFO] Tidak ada checkpoint untuk dilanjutkan, mulai dari awal")
+        return Checkpoint(self, key, state, interval)
+
+
+class Checkpoint:
+    """State satu crawl: dict JSON (mis. results, stages, radii, tiles) yang disimpan berkala"""
+
+    def __init__(self, store, key, state=None, interval=5.0):
+        self.store = store
+        self.key = key
+        self.state = state or {}
+        self.interval = interval
+        self.saved_at = time.monotonic()
+        self.lock = threading.Lock()
+
+    def get(self, name, default=None):
+        with self.lock:
+            return self.state.get(name, default)
+
+    def save(self, force=False, **updates):
+        """
+        Perbarui state; ditulis ke disk paling sering sekali per `interval` detik kecuali force
+
+        Gagal menulis tidak menggagalkan crawl (checkpoint hanya untuk resume).
+        """
+        with self.lock:
+            self.state.update(updates)
+            now = time.monotonic()
+            if not force and now - self.saved_at < self.interval:
+                return
+            self.saved_at = now
+            state = dict(self.state)
+        try:
+            self.store.save(self.key, state)
+        except Exception as e:
+            print(f"[DEBUG] Gagal menyimpan checkpoint: {e}")
+
+    def clear(self):
+        """Crawl selesai: checkpoint tidak diperlukan lagi"""
+        try:
+            self.store.clear(self.key)
+        except Exception as e:
+            print(f"[DEBUG] Gagal menghapus checkpoint: {e}")
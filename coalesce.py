@@ -0,0 +1,154 @@
+"""
+Single-flight: request scraping identik yang datang bersamaan menumpang satu scraping yang sedang
+berjalan, bukan membuka sesi Chrome sendiri
+
+Scraping dijalankan di thread background; semua peminta (termasuk yang datang belakangan)
+menerima progress event (replay event yang masih di buffer, lalu live) dan hasil/exception yang
+sama. Buffer replay dibatasi FLIGHT_REPLAY_EVENTS supaya flight besar (mis. mode tiles) tidak
+menyimpan seluruh hasil di memori: event 'place' yang sudah terbuang dari buffer dikirim ke
+peminta yang melewatkannya dari hasil akhir setelah scraping selesai. Begitu scraping selesai,
+key dilepas sehingga request berikutnya dijawab lewat jalur biasa (result cache).
+"""
+import json
+import threading
+from collections import deque
+
+from cache import normalize_search_key
+from metrics import COALESCED_REQUESTS
+
+# Event terakhir yang disimpan untuk replay per flight
+FLIGHT_REPLAY_EVENTS = 1000
+
+
+def flight_key(params):
+    """Key single-flight: lokasi dinormalisasi seperti key cache, parameter lain harus sama persis"""
+    where = normalize_search_key(params.get('query'), params.get('location'), params.get('lat'),
+                                 params.get('lng'), params.get('radius_m'))
+    rest = {key: value for key, value in params.items() if key not in ('query', 'location', 'lat', 'lng', 'radius_m')}
+    return f"{where}|{json.dumps(rest, sort_keys=True, default=str)}"
+
+
+class Flight:
+    """Satu scraping yang sedang berjalan beserta semua progress event-nya"""
+
+    def __init__(self, key, replay_limit=FLIGHT_REPLAY_EVENTS):
+        self.key = key
+        # (event, data, jumlah event 'place' sebelum event ini); event pertama di buffer bernomor `offset`
+        self.events = deque(maxlen=replay_limit)
+        self.offset = 0
+        self.places = 0
+        self.result = None
+        self.error = None
+        self.done = False
+        self.followers = 0
+        self.cond = threading.Condition()
+
+    def publish(self, event, data):
+        """progress_callback untuk runner"""
+        with self.cond:
+            if len(self.events) == self.events.maxlen:
+                self.offset += 1
+            self.events.append((event, data, self.places))
+            if event == 'place':
+                self.places += 1
+            self.cond.notify_all()
+
+    def finish(self, result=None, error=None):
+        with self.cond:
+            self.result = result
+            self.error = error
+            self.done = True
+            self.cond.notify_all()
+
+    def iter_events(self):
+        """
+        Yield (event, data) mulai event tertua di buffer; blok sampai event berikutnya atau selesai
+
+        Event 'place' yang terlewat (sudah terbuang dari buffer sebelum dibaca) dikirim di akhir
+        dari hasil scraping, berdasarkan urutan event 'place'.
+        """
+        index = 0
+        place_seq = 0
+        missed = []
+        while True:
+            with self.cond:
+                self.cond.wait_for(lambda: index < self.offset + len(self.events) or self.done)
+                if index < self.offset:
+                    # Terlambat bergabung atau tertinggal: lompat ke buffer, catat tempat yang terlewat
+                    index = self.offset
+                    skipped_to = self.events[0][2] if self.events else self.places
+                    if skipped_to > place_seq:
+                        missed.append((place_seq, skipped_to))
+                    place_seq = skipped_to
+                if index >= self.offset + len(self.events):
+                    break
+                event, data, _ = self.events[index - self.offset]
+            index += 1
+            if event == 'place':
+                place_seq += 1
+            yield event, data
+        if missed and self.error is None and isinstance(self.result, list):
+            for start, end in missed:
+                for place in self.result[start:end]:
+                    yield 'place', place
+
+    def wait(self):
+        """Hasil scraping; exception dari scraping di-raise ulang di setiap peminta"""
+        with self.cond:
+            self.cond.wait_for(lambda: self.done)
+            if self.error is not None:
+                raise self.error
+            return self.result
+
+
+class SingleFlight:
+    def __init__(self):
+        self.flights = {}
+        self.lock = threading.Lock()
+
+    def start(self, key, fn):
+        """
+        Jalankan fn(progress_callback) di background, atau menumpang flight yang sedang berjalan
+
+        Returns:
+            Flight (baru atau yang sudah berjalan)
+        """
+        with self.lock:
+            flight = self.flights.get(key)
+            if flight is not None:
+                flight.followers += 1
+                COALESCED_REQUESTS.inc()
+                print(f"[INFO] Request identik menumpang scraping yang sedang berjalan ({flight.followers + 1} peminta)")
+                return flight
+            flight = self.flights[key] = Flight(key)
+        threading.Thread(target=self._run, args=(flight, fn), name='scrape-flight', daemon=True).start()
+        return flight
+
+    def _run(self, flight, fn):
+        result = None
+        error = None
+        try:
+            result = fn(flight.publish)
+        except Exception as e:
+            error = e
+        finally:
+            # Lepas key dulu supaya request setelah ini tidak menumpang flight yang sudah selesai
+            with self.lock:
+                if self.flights.get(flight.key) is flight:
+                    del self.flights[flight.key]
+            flight.finish(result, error)
+
+    def run(self, key, fn, progress_callback=None):
+        """Versi blocking: teruskan progress event ke progress_callback lalu kembalikan hasil"""
+        flight = self.start(key, fn)
+        for event, data in flight.iter_events():
+            if progress_callback:
+                try:
+                    progress_callback(event, data)
+                except Exception as e:
+                    print(f"[DEBUG] Error di progress_callback: {e}")
+        return flight.wait()
+
+    def in_flight(self):
+        with self.lock:
+            return len(self.flights)
@@ -0,0 +1,154 @@
+import threading
+import time
+from contextlib import contextmanager
+
+
+class DriverPool:
+    def __init__(self, factory, max_size=2, acquire_timeout=300, max_uses=50):
+        """
+        Pool Chrome driver yang dipakai bersama oleh banyak request
+
+        Args:
+            factory: Callable tanpa argumen yang membuat driver baru
+            max_size: Maksimal browser yang boleh hidup bersamaan di host ini
+            acquire_timeout: Detik menunggu driver kosong sebelum menyerah
+            max_uses: Driver di-recycle setelah dipakai sebanyak ini (mencegah memory leak Chrome)
+        """
+        self.factory = factory
+        self.max_size = max(1, int(max_size))
+        self.acquire_timeout = acquire_timeout
+        self.max_uses = max_uses
+        self._idle = []
+        self._uses = {}
+        self._created = 0
+        self._closed = False
+        self._cond = threading.Condition()
+
+    def acquire(self, timeout=None):
+        """Ambil driver dari pool, buat baru jika belum penuh, atau tunggu sampai ada yang kembali"""
+        timeout = self.acquire_timeout if timeout is None else timeout
+        deadline = time.monotonic() + timeout
+        while True:
+            driver = None
+            with self._cond:
+                while True:
+                    if self._closed:
+                        raise Exception("Driver pool sudah ditutup")
+                    if self._idle:
+                        # Sudah terhitung di _created; health check dilakukan di luar lock
+                        driver = self._idle.pop()
+                        break
+                    if self._created < self.max_size:
+                        self._created += 1
+                        break
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        raise Exception(f"Timeout menunggu Chrome driver kosong (maksimal {self.max_size} browser)")
+                    self._cond.wait(remaining)
+            if driver is None:
+                break
+            # Round trip WebDriver tanpa memegang lock: Chrome yang lambat/hang tidak memblokir pool
+            if self.is_healthy(driver):
+                return driver
+            print(f"[INFO] Driver di pool tidak sehat, dibuang")
+            self._discard(driver)
+
+        # Buat driver di luar lock karena start Chrome butuh beberapa detik
+        try:
+            print(f"[INFO] Membuat Chrome driver baru untuk pool...")
+            driver = self.factory()
+        except Exception:
+            with self._cond:
+                self._created -= 1
+                self._cond.notify()
+            raise
+        with self._cond:
+            self._uses[id(driver)] = 0
+        return driver
+
+    def release(self, driver, discard=False):
+        """Kembalikan driver ke pool setelah di-reset, atau buang jika rusak"""
+        if driver is None:
+            return
+        with self._cond:
+            self._uses[id(driver)] = self._uses.get(id(driver), 0) + 1
+            worn_out = self.max_uses and self._uses[id(driver)] >= self.max_uses
+        if discard or worn_out or self._closed or not self._reset(driver):
+            self._discard(driver)
+            return
+        with self._cond:
+            self._idle.append(driver)
+            self._cond.notify()
+
+    @contextmanager
+    def driver(self, timeout=None):
+        """Context manager: `with pool.driver() as driver: ...`"""
+        driver = self.acquire(timeout)
+        broken = False
+        try:
+            yield driver
+        except Exception:
+            broken = not self.is_healthy(driver)
+            raise
+        finally:
+            self.release(driver, discard=broken)
+
+    def stats(self):
+        with self._cond:
+            return {
+                'max_size': self.max_size,
+                'created': self._created,
+                'idle': len(self._idle),
+                'in_use': self._created - len(self._idle)
+            }
+
+    def close_all(self):
+        """Tutup semua driver yang sedang idle dan tolak acquire berikutnya"""
+        with self._cond:
+            self._closed = True
+            idle, self._idle = self._idle, []
+            for driver in idle:
+                self._forget_locked(driver)
+            self._cond.notify_all()
+        for driver in idle:
+            self._quit(driver)
+
+    def _forget_locked(self, driver):
+        """Keluarkan driver dari hitungan pool (dipanggil dengan _cond dipegang)"""
+        self._uses.pop(id(driver), None)
+        self._created = max(0, self._created - 1)
+
+    def _discard(self, driver):
+        """Buang driver: hitungan diperbarui di bawah lock, quit() (bisa beberapa detik) di luar lock"""
+        with self._cond:
+            self._forget_locked(driver)
+            self._cond.notify()
+        self._quit(driver)
+
+    def _quit(self, driver):
+        try:
+            driver.quit()
+        except:
+            pass
+
+    def is_healthy(self, driver):
+        """Health check murah: session masih hidup dan window masih ada"""
+        try:
+            return len(driver.window_handles) > 0
+        except:
+            return False
+
+    def _reset(self, driver):
+        """Bersihkan state antar job: tutup tab tambahan, hapus cookies, buka halaman kosong"""
+        try:
+            handles = driver.window_handles
+            for handle in handles[1:]:
+                driver.switch_to.window(handle)
+                driver.close()
+            driver.switch_to.window(handles[0])
+            driver.delete_all_cookies()
+            driver.get("about:blank")
+            return True
+        except Exception as e:
+            print(f"[DEBUG] Gagal reset driver: {e}")
+            return False
@@ -0,0 +1,127 @@
+"""
+Engine scraping untuk GoogleMapsScraper.search_places
+
+Engine adalah objek dengan method iter_pages(query, location, lat, lng, radius_m) yang
+menghasilkan (yield) list tempat per halaman hasil, dalam format dict yang sama dengan
+GoogleMapsScraper._extract_place_info. Cache, deduplikasi, filter min_rating, batas
+max_results dan progress event tetap ditangani search_places, jadi engine cukup mengambil
+dan mem-parse data.
+
+'selenium' adalah jalur browser bawaan GoogleMapsScraper; engine lain didaftarkan lewat
+argumen `engines` pada GoogleMapsScraper.
+"""
+from urllib.parse import urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from maps_payload import MAPS_BASE_URL, build_search_url, load_payload, parse_embedded_places, parse_search_payload
+from throttle import BlockedError
+
+HTTP_HEADERS = {
+    'User-Agent': "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36",
+    'Accept-Language': 'id-ID,id;q=0.9,en;q=0.8',
+    'Accept-Encoding': 'gzip, deflate'
+}
+
+
+def create_http_session(pool_size=20, retries=2):
+    """Session bersama: koneksi keep-alive di-pool per host, retry untuk error 5xx sementara"""
+    session = requests.Session()
+    retry = Retry(total=retries, backoff_factor=0.5, status_forcelist=(500, 502, 503, 504), allowed_methods=('GET',))
+    adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size, max_retries=retry)
+    session.mount('http://', adapter)
+    session.mount('https://', adapter)
+    session.headers.update(HTTP_HEADERS)
+    return session
+
+
+class HttpEngine:
+    name = 'http'
+
+    def __init__(self, base_url=None, session=None, pool_size=20, timeout=15, page_size=20, max_pages=25,
+                 language='id', scheduler=None):
+        """
+        Engine tanpa browser: ambil halaman pencarian dan XHR /search?tbm=map langsung dengan requests
+
+        Args:
+            base_url: Basis URL Maps (default env MAPS_BASE_URL), bisa diarahkan ke server fixture
+            session: requests.Session opsional; default session dengan pool koneksi sebesar pool_size.
+                     Satu engine aman dipakai bersama oleh banyak thread
+            timeout: Timeout per request (detik)
+            page_size: Jumlah hasil per halaman XHR (feed Maps memuat 20 per batch)
+            max_pages: Batas halaman XHR per pencarian
+            language: Parameter hl (bahasa hasil)
+            scheduler: NavigationScheduler opsional; setiap request menunggu giliran dan
+                       response blokir/consent memicu backoff
+        """
+        self.base_url = (base_url or MAPS_BASE_URL).rstrip('/')
+        parts = urlsplit(self.base_url)
+        self.origin = f"{parts.scheme}://{parts.netloc}"
+        self.session = session or create_http_session(pool_size)
+        self.timeout = timeout
+        self.page_size = page_size
+        self.max_pages = max_pages
+        self.language = language
+        self.scheduler = scheduler
+
+    def _get(self, url, params=None):
+        """GET lewat scheduler (jika ada); response blokir dicoba ulang setelah backoff"""
+        attempts = self.scheduler.retries + 1 if self.scheduler else 1
+        for _ in range(attempts):
+            if self.scheduler:
+                self.scheduler.wait_turn()
+            response = self.session.get(url, params=params, timeout=self.timeout)
+            if 'consent.google' in response.url:
+                reason = 'consent'
+            elif response.status_code == 429 or '/sorry/' in response.url:
+                reason = 'unusual_traffic'
+            else:
+                response.raise_for_status()
+                if self.scheduler:
+                    self.scheduler.record_success()
+                return response.text
+            if self.scheduler:
+                self.scheduler.record_block(reason)
+        raise BlockedError(reason, response.url)
+
+    def _page_params(self, query, location, lat, lng, radius_m, start):
+        search_query = query if lat and lng else f"{query} {location}"
+        # pb: viewport (jika ada koordinat) + !7i jumlah per halaman + !8i offset, seperti XHR feed
+        viewport = f"!4m8!1m3!1d{(radius_m or 5000) * 2}!2d{lng}!3d{lat}!3m2!1i1024!2i768" if lat and lng else ''
+        return {
+            'tbm': 'map',
+            'hl': self.language,
+            'q': search_query.strip(),
+            'start': start,
+            'num': self.page_size,
+            'pb': f"{viewport}!7i{self.page_size}!8i{start}"
+        }
+
+    def iter_pages(self, query, location, lat=None, lng=None, radius_m=None):
+        """
+        Yield list tempat per halaman: halaman pertama dari state yang tertanam di HTML,
+        berikutnya dari XHR /search?tbm=map sampai halaman kosong/tidak penuh atau max_pages
+
+        Filter min_rating sengaja tidak dilakukan di sini karena offset halaman dihitung dari
+        jumlah hasil mentah.
+        """
+        html = self._get(build_search_url(self.base_url, query, location, lat, lng, radius_m))
+        first_page = parse_embedded_places(html, 0, self.base_url) or []
+        if first_page:
+            yield first_page
+        start = len(first_page)
+
+        for _ in range(self.max_pages):
+            body = self._get(f"{self.origin}/search", self._page_params(query, location, lat, lng, radius_m, start))
+            if load_payload(body) is None:
+                print(f"[DEBUG] Response pencarian HTTP tidak dikenali (offset {start})")
+                return
+            page = parse_search_payload(body, 0, self.base_url)
+            if not page:
+                return
+            yield page
+            start += len(page)
+            if len(page) < self.page_size:
+                return
@@ -0,0 +1,262 @@
+"""
+Enrichment detail tempat: telepon, website, jam buka, plus code dan koordinat
+
+Halaman detail dibuka paralel di beberapa tab per driver (window.open tidak menunggu
+halaman selesai dimuat, jadi semua tab memuat bersamaan), dan beberapa driver dari pool
+bekerja bersamaan. Detail disimpan di DetailCache per place_id supaya tempat yang sama
+tidak dibuka ulang selama TTL.
+"""
+import json
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from selenium.webdriver.support.ui import WebDriverWait
+
+from metrics import ENRICH_SECONDS, PLACES_ENRICHED
+from places import parse_place_link
+from throttle import detect_block_page
+
+DETAIL_FIELDS = ('phone', 'website', 'hours', 'plus_code')
+
+# Halaman detail siap dibaca: judul tempat sudah ada dan panel info (data-item-id) sudah di-render
+DETAIL_READY_JS = """
+if (!document.querySelector('h1')) return false;
+return !!document.querySelector('[data-item-id]') || document.readyState === 'complete';
+"""
+
+# Baca semua detail sekaligus dalam satu round-trip WebDriver
+DETAIL_EXTRACT_JS = """
+function clean(text) { return (text || '').replace(/\\s+/g, ' ').trim(); }
+function afterColon(text) {
+    text = clean(text);
+    var i = text.indexOf(': ');
+    return i >= 0 ? text.slice(i + 2) : text;
+}
+var phone = '';
+var phoneButton = document.querySelector("[data-item-id^='phone:tel:']");
+if (phoneButton) {
+    phone = afterColon(phoneButton.getAttribute('aria-label')) ||
+            phoneButton.getAttribute('data-item-id').slice('phone:tel:'.length);
+}
+var website = document.querySelector("a[data-item-id='authority']");
+var plusCode = document.querySelector("[data-item-id='oloc']");
+var hours = [];
+document.querySelectorAll('table tr').forEach(function(row) {
+    var cells = row.querySelectorAll('td');
+    if (cells.length < 2) return;
+    var day = clean(cells[0].innerText);
+    var time = clean(cells[1].getAttribute('aria-label') || cells[1].innerText);
+    if (day && time) hours.push(day + ': ' + time);
+});
+if (!hours.length) {
+    // Ringkasan jam buka di aria-label: "Senin, 08.00–22.00; Selasa, ..."
+    var summary = document.querySelector("[aria-label*='Senin'], [aria-label*='Monday']");
+    if (summary) {
+        summary.getAttribute('aria-label').split(';').forEach(function(part) {
+            part = clean(part);
+            if (part) hours.push(part.replace(/^([^,]+),\\s*/, '$1: '));
+        });
+    }
+}
+return JSON.stringify({
+    phone: phone,
+    website: website ? website.href : '',
+    plus_code: plusCode ? afterColon(plusCode.getAttribute('aria-label') || plusCode.innerText) : '',
+    hours: hours,
+    url: location.href
+});
+"""
+
+
+def has_details(details):
+    """True jika minimal satu field detail terisi (bukan N/A/kosong)"""
+    return any(details.get(field) not in (None, '', 'N/A', []) for field in DETAIL_FIELDS)
+
+
+class BrokenDriverError(Exception):
+    """Driver tidak bisa kembali ke tab utama; harus dibuang dari pool, bukan dipakai ulang"""
+
+
+class PlaceEnricher:
+    def __init__(self, driver_pool, cache=None, workers=None, tabs_per_driver=4, page_timeout=15, scheduler=None):
+        """
+        Enrichment detail tempat secara paralel
+
+        Args:
+            driver_pool: DriverPool tempat meminjam driver
+            cache: DetailCache opsional (detail per place_id dengan TTL)
+            workers: Jumlah driver yang dipakai bersamaan (default ukuran pool)
+            tabs_per_driver: Jumlah halaman detail yang dimuat bersamaan per driver
+            page_timeout: Batas tunggu satu halaman detail (detik)
+            scheduler: NavigationScheduler opsional; setiap tab menunggu giliran navigasi dan
+                       halaman blokir memicu backoff
+        """
+        self.driver_pool = driver_pool
+        self.cache = cache
+        self.workers = workers or driver_pool.max_size
+        self.tabs_per_driver = max(1, tabs_per_driver)
+        self.page_timeout = page_timeout
+        self.scheduler = scheduler
+
+    def enrich(self, places, progress_callback=None):
+        """
+        Lengkapi place dict dengan phone, website, hours, plus_code (dan lat/lng jika kosong)
+
+        Dict diubah langsung (in place). Tempat yang halaman detailnya gagal dibuka tidak
+        mendapat field detail. progress_callback(event, data) menerima 'enriched' dengan
+        jumlah tempat yang sudah diproses.
+
+        Returns:
+            List places yang sama
+        """
+        started = time.perf_counter()
+        targets = [place for place in places if place.get('link')]
+        done = [0]
+        lock = threading.Lock()
+
+        def finished(count):
+            with lock:
+                done[0] += count
+                total = done[0]
+            if progress_callback:
+                try:
+                    progress_callback('enriched', total)
+                except Exception as e:
+                    print(f"[DEBUG] Error di progress_callback: {e}")
+
+        cached = {}
+        if self.cache is not None:
+            try:
+                cached = self.cache.get_many(place.get('place_id') for place in targets)
+            except Exception as e:
+                print(f"[DEBUG] Gagal membaca cache detail: {e}")
+        pending = []
+        for place in targets:
+            details = cached.get(place.get('place_id'))
+            if details is not None:
+                self._apply(place, details)
+            else:
+                pending.append(place)
+        if len(targets) > len(pending):
+            PLACES_ENRICHED.inc(len(targets) - len(pending), 'cache')
+            finished(len(targets) - len(pending))
+
+        if pending:
+            print(f"[INFO] Membuka {len(pending)} halaman detail ({len(targets) - len(pending)} dari cache)...")
+            batches = [pending[i:i + self.tabs_per_driver] for i in range(0, len(pending), self.tabs_per_driver)]
+            batch_lock = threading.Lock()
+
+            def worker():
+                # Slot scheduler dipegang selama worker berjalan (batasnya turun saat diblokir);
+                # satu driver per worker, dipakai untuk batch berikutnya sampai antrean habis
+                if self.scheduler:
+                    self.scheduler.acquire_slot()
+                try:
+                    driver = self.driver_pool.acquire()
+                    broken = False
+                    try:
+                        while True:
+                            with batch_lock:
+                                if not batches:
+                                    return
+                                batch = batches.pop(0)
+                            self._enrich_batch(driver, batch)
+                            finished(len(batch))
+                    except BrokenDriverError:
+                        broken = True
+                        raise
+                    except Exception:
+                        broken = not self.driver_pool.is_healthy(driver)
+                        raise
+                    finally:
+                        self.driver_pool.release(driver, discard=broken)
+                finally:
+                    if self.scheduler:
+                        self.scheduler.release_slot()
+
+            workers = min(self.workers, len(batches))
+            with ThreadPoolExecutor(max_workers=workers, thread_name_prefix='enrich') as executor:
+                futures = [executor.submit(worker) for _ in range(workers)]
+                for future in futures:
+                    try:
+                        future.result()
+                    except Exception as e:
+                        print(f"[GAGAL] Worker enrichment gagal: {e}")
+
+        ENRICH_SECONDS.observe(time.perf_counter() - started)
+        print(f"[INFO] Enrichment selesai: {len(targets)} tempat dalam {time.perf_counter() - started:.1f} detik")
+        return places
+
+    def _enrich_batch(self, driver, batch):
+        """Buka semua halaman batch di tab baru sekaligus, lalu baca satu per satu"""
+        main_handle = driver.current_window_handle
+        tabs = []
+        for place in batch:
+            if self.scheduler:
+                self.scheduler.wait_turn()
+            before = set(driver.window_handles)
+            driver.execute_script("window.open(arguments[0], '_blank');", place['link'])
+            opened = [handle for handle in driver.window_handles if handle not in before]
+            if opened:
+                tabs.append((opened[0], place))
+            else:
+                PLACES_ENRICHED.inc(1, 'failed')
+                print(f"[DEBUG] Tab detail gagal dibuka: {place.get('name')}")
+
+        for handle, place in tabs:
+            try:
+                driver.switch_to.window(handle)
+            except Exception as e:
+                # Jangan close(): fokus masih di tab lain (bisa tab utama); tab sisa dibersihkan pool
+                PLACES_ENRICHED.inc(1, 'failed')
+                print(f"[DEBUG] Gagal pindah ke tab detail {place.get('name')}: {e}")
+                continue
+            try:
+                details = self._extract_details(driver)
+                self._apply(place, details)
+                PLACES_ENRICHED.inc(1, 'page')
+                if self.scheduler:
+                    self.scheduler.record_success()
+                if self.cache is not None and place.get('place_id') and has_details(details):
+                    # Detail kosong semua biasanya panel info belum ter-render: jangan di-cache selama TTL
+                    self.cache.put(place['place_id'], details)
+            except Exception as e:
+                PLACES_ENRICHED.inc(1, 'failed')
+                print(f"[DEBUG] Gagal membaca detail {place.get('name')}: {e}")
+                reason = detect_block_page(driver) if self.scheduler else None
+                if reason:
+                    self.scheduler.record_block(reason)
+            finally:
+                try:
+                    driver.close()
+                except:
+                    pass
+        try:
+            driver.switch_to.window(main_handle)
+        except Exception as e:
+            # Tanpa tab utama driver tidak bisa dipakai batch berikutnya
+            raise BrokenDriverError(f"Gagal kembali ke tab utama: {e}")
+
+    def _extract_details(self, driver):
+        WebDriverWait(driver, self.page_timeout, poll_frequency=0.25).until(
+            lambda d: d.execute_script(DETAIL_READY_JS)
+        )
+        raw = json.loads(driver.execute_script(DETAIL_EXTRACT_JS))
+        coords = parse_place_link(raw.get('url'))
+        return {
+            'phone': raw.get('phone') or "N/A",
+            'website': raw.get('website') or "N/A",
+            'hours': raw.get('hours') or [],
+            'plus_code': raw.get('plus_code') or "N/A",
+            'lat': coords['lat'],
+            'lng': coords['lng']
+        }
+
+    def _apply(self, place, details):
+        for field in DETAIL_FIELDS:
+            place[field] = details.get(field)
+        # Koordinat dari link kartu adalah lokasi tempat; URL detail hanya mengisi yang kosong
+        if place.get('lat') is None and details.get('lat') is not None:
+            place['lat'] = details['lat']
+            place['lng'] = details['lng']
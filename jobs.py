@@ -0,0 +1,252 @@
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+
+from places import place_key
+
+
+class Job:
+    """Satu job scraping yang berjalan di background worker"""
+
+    def __init__(self, params):
+        self.id = uuid.uuid4().hex
+        self.params = params
+        self.state = 'queued'
+        self.loaded = 0
+        self.enriched = 0
+        self.results = []
+        self.metrics = []
+        # Diff terhadap snapshot sebelumnya (params 'delta'), dikirim runner lewat event 'delta'
+        self.delta = None
+        self.error = None
+        self.created_at = time.time()
+        self.started_at = None
+        self.finished_at = None
+        self.on_finish = []
+        self.lock = threading.Lock()
+
+    def on_progress(self, event, data):
+        """progress_callback untuk runner (format sama dengan GoogleMapsScraper.search_places)"""
+        with self.lock:
+            if event == 'loaded':
+                self.loaded = data
+            elif event == 'enriched':
+                self.enriched = data
+            elif event == 'place':
+                # search_places memotong ke max_results di akhir; job memotong di sini
+                max_results = self.params.get('max_results') or 0
+                if max_results <= 0 or len(self.results) < max_results:
+                    self.results.append(data)
+            elif event == 'metrics':
+                # Satu entry per search_places (mode tiles: satu per tile)
+                self.metrics.append(data)
+            elif event == 'delta':
+                self.delta = data
+
+    def merge_results(self, results):
+        """
+        Gabungkan hasil akhir runner ke list yang sudah di-stream tanpa menggeser index
+
+        Tempat yang sudah di-stream diganti di index yang sama (mis. versi hasil enrichment),
+        tempat yang belum ada ditambahkan di akhir, sehingga polling `?since=N` tidak melewatkan
+        atau mengulang tempat. Dipanggil dengan lock dipegang.
+        """
+        positions = {place_key(place): index for index, place in enumerate(self.results)}
+        for place in results or []:
+            key = place_key(place)
+            if key in positions:
+                self.results[positions[key]] = place
+            else:
+                positions[key] = len(self.results)
+                self.results.append(place)
+
+    def to_dict(self, since=0):
+        """Status job; results hanya dari index `since` supaya polling tidak mengirim ulang semuanya"""
+        with self.lock:
+            return {
+                'job_id': self.id,
+                'state': self.state,
+                'params': self.params,
+                'progress': {
+                    'loaded': self.loaded,
+                    'found': len(self.results),
+                    'enriched': self.enriched
+                },
+                'since': since,
+                'results': self.results[since:],
+                'metrics': self.metrics,
+                'delta': self.delta,
+                'error': self.error,
+                'created_at': self.created_at,
+                'started_at': self.started_at,
+                'finished_at': self.finished_at
+            }
+
+    def to_record(self):
+        """Satu baris hasil batch (JSONL) untuk job yang sudah selesai; job delta berisi diff, bukan results"""
+        with self.lock:
+            record = {
+                'job_id': self.id,
+                'query': self.params.get('query'),
+                'location': self.params.get('location'),
+                'state': self.state,
+                'total_results': len(self.results),
+                'results': self.results,
+                'error': self.error,
+                'seconds': round(self.finished_at - self.started_at, 2) if self.finished_at and self.started_at else None
+            }
+            if self.params.get('delta'):
+                del record['results']
+                record['delta'] = self.delta
+            return record
+
+
+class Batch:
+    """Sekumpulan job (mis. query x lokasi) yang dijadwalkan sekaligus"""
+
+    def __init__(self, jobs):
+        self.id = uuid.uuid4().hex
+        self.jobs = list(jobs)
+        self.finished = []
+        self.created_at = time.time()
+        self.cond = threading.Condition()
+        for job in self.jobs:
+            job.on_finish.append(self._job_finished)
+
+    def _job_finished(self, job):
+        with self.cond:
+            self.finished.append(job)
+            self.cond.notify_all()
+
+    @property
+    def done(self):
+        with self.cond:
+            return len(self.finished) >= len(self.jobs)
+
+    def iter_finished(self, timeout=None):
+        """
+        Yield job sesuai urutan selesai; blok sampai job berikutnya selesai
+
+        Args:
+            timeout: Batas tunggu per job (detik); None = tunggu sampai semua selesai
+        """
+        index = 0
+        while True:
+            with self.cond:
+                if index >= len(self.finished) and len(self.finished) < len(self.jobs):
+                    self.cond.wait_for(lambda: index < len(self.finished), timeout)
+                if index >= len(self.finished):
+                    return
+                job = self.finished[index]
+            index += 1
+            yield job
+
+    def to_dict(self):
+        jobs = [job.to_dict() for job in self.jobs]
+        states = {}
+        for job in jobs:
+            states[job['state']] = states.get(job['state'], 0) + 1
+        return {
+            'batch_id': self.id,
+            'state': 'done' if self.done else 'running',
+            'total_jobs': len(jobs),
+            'states': states,
+            'total_results': sum(job['progress']['found'] for job in jobs),
+            'created_at': self.created_at,
+            'jobs': [{
+                'job_id': job['job_id'],
+                'query': job['params'].get('query'),
+                'location': job['params'].get('location'),
+                'state': job['state'],
+                'found': job['progress']['found'],
+                'error': job['error']
+            } for job in jobs]
+        }
+
+
+class JobManager:
+    def __init__(self, runner, max_workers=2, max_history=200):
+        """
+        Menjalankan scraping di thread pool dan menyimpan status job di memory
+
+        Args:
+            runner: Callable runner(params, progress_callback) yang menjalankan scraping
+                    (mis. search_places atau crawler tiling) dan mengembalikan list hasil
+            max_workers: Jumlah scraping yang berjalan bersamaan (sebaiknya = ukuran driver pool)
+            max_history: Jumlah job selesai yang disimpan untuk polling
+        """
+        self.runner = runner
+        self.max_history = max_history
+        self.executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='scrape-job')
+        self.jobs = {}
+        self.batches = {}
+        self.lock = threading.Lock()
+
+    def submit(self, params):
+        """Buat job baru dan jadwalkan; params diteruskan apa adanya ke runner"""
+        job = Job(params)
+        with self.lock:
+            self.jobs[job.id] = job
+            self._prune_locked()
+        self.executor.submit(self._run, job)
+        return job
+
+    def submit_batch(self, params_list):
+        """
+        Jadwalkan banyak job sekaligus; dijalankan paralel sebanyak max_workers, sisanya antre
+
+        Returns:
+            Batch berisi semua job, urut sesuai params_list
+        """
+        batch = Batch(Job(params) for params in params_list)
+        with self.lock:
+            for job in batch.jobs:
+                self.jobs[job.id] = job
+            self.batches[batch.id] = batch
+            self._prune_locked()
+        for job in batch.jobs:
+            self.executor.submit(self._run, job)
+        return batch
+
+    def get(self, job_id):
+        with self.lock:
+            return self.jobs.get(job_id)
+
+    def get_batch(self, batch_id):
+        with self.lock:
+            return self.batches.get(batch_id)
+
+    def _run(self, job):
+        with job.lock:
+            job.state = 'running'
+            job.started_at = time.time()
+        try:
+            results = self.runner(job.params, job.on_progress)
+            with job.lock:
+                job.merge_results(results)
+                job.state = 'done'
+        except Exception as e:
+            print(f"[GAGAL] Job {job.id} gagal: {e}")
+            with job.lock:
+                job.error = str(e)
+                job.state = 'failed'
+        finally:
+            with job.lock:
+                job.finished_at = time.time()
+            for callback in job.on_finish:
+                try:
+                    callback(job)
+                except Exception as e:
+                    print(f"[DEBUG] Error callback job selesai: {e}")
+
+    def _prune_locked(self):
+        finished = [job for job in self.jobs.values() if job.state in ('done', 'failed')]
+        if len(finished) > self.max_history:
+            finished.sort(key=lambda job: job.finished_at or 0)
+            for job in finished[:len(finished) - self.max_history]:
+                del self.jobs[job.id]
+        finished_batches = sorted((batch for batch in self.batches.values() if batch.done),
+                                  key=lambda batch: batch.created_at)
+        for batch in finished_batches[:max(0, len(finished_batches) - self.max_history)]:
+            del self.batches[batch.id]
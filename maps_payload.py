@@ -0,0 +1,181 @@
+import json
+import os
+import re
+from urllib.parse import quote_plus
+
+from places import parse_place_link
+
+MAPS_BASE_URL = os.environ.get('MAPS_BASE_URL', 'https://www.google.com/maps')
+
+# Response XHR pencarian Maps (/search?tbm=map&...) yang dimuat feed saat di-scroll
+SEARCH_PAYLOAD_URL_PATTERN = re.compile(r'/search\?(?:.*&)?tbm=map(?:&|$)')
+XSSI_PREFIX = ")]}'"
+# Feature id mentah di payload: "0x2e7a5..:0x1b2c.."
+RAW_FEATURE_ID_PATTERN = re.compile(r'^0x[0-9a-fA-F]+:0x[0-9a-fA-F]+$')
+MAX_SCAN_DEPTH = 12
+# State awal halaman pencarian; halaman pertama hasil ada di dalamnya sebagai string )]}'...
+APP_STATE_PATTERN = re.compile(r'window\.APP_INITIALIZATION_STATE\s*=\s*(\[.*?\]);\s*window\.APP_', re.DOTALL)
+
+
+def build_search_url(base_url, query, location, lat=None, lng=None, radius_m=None):
+    """URL halaman pencarian Maps; dengan koordinat memakai viewport /@lat,lng,{radius}m (default 5000m)"""
+    base_url = base_url.rstrip('/')
+    if lat and lng:
+        return f"{base_url}/search/{query.replace(' ', '+')}/@{lat},{lng},{radius_m or 5000}m/data=!3m2!1e3!4b1?entry=ttu"
+    search_query = f"{query} {location}"
+    return f"{base_url}/search/{search_query.replace(' ', '+')}"
+
+
+def load_payload(text):
+    """
+    Decode body response pencarian Maps menjadi struktur JSON
+
+    Body bisa berupa `)]}'\\n[...]` atau dibungkus `{"c":0,"d":")]}'\\n[...]"}/*""*/`.
+    Returns None jika bukan payload yang dikenali.
+    """
+    if not text:
+        return None
+    text = text.strip()
+    if text.endswith('/*""*/'):
+        text = text[:-len('/*""*/')]
+    try:
+        if text.startswith('{'):
+            wrapper = json.loads(text)
+            text = (wrapper.get('d') or '').strip()
+        if text.startswith(XSSI_PREFIX):
+            text = text[len(XSSI_PREFIX):]
+        return json.loads(text)
+    except (ValueError, AttributeError):
+        return None
+
+
+def _dig(data, *path):
+    """Ambil data[path[0]][path[1]]... ; None jika index tidak ada atau tipe tidak cocok"""
+    for index in path:
+        if not isinstance(data, list) or index >= len(data):
+            return None
+        data = data[index]
+    return data
+
+
+def _is_place_info(node):
+    """Array info tempat: [10] feature id, [11] nama"""
+    return (
+        isinstance(node, list) and len(node) > 11 and
+        isinstance(node[11], str) and isinstance(node[10], str) and
+        bool(RAW_FEATURE_ID_PATTERN.match(node[10]))
+    )
+
+
+def _find_place_infos(node, depth=0):
+    """Cari semua array info tempat; posisinya di payload sering bergeser, jadi tidak di-hardcode"""
+    if not isinstance(node, list) or depth > MAX_SCAN_DEPTH:
+        return
+    if _is_place_info(node):
+        yield node
+        return
+    for child in node:
+        yield from _find_place_infos(child, depth + 1)
+
+
+def parse_place_info(info, base_url='https://www.google.com/maps'):
+    """Konversi array info tempat menjadi dict yang sama dengan GoogleMapsScraper._extract_place_info"""
+    name = (info[11] or '').strip()
+    if not name:
+        return None
+    feature_id = info[10].lower()
+
+    rating = _dig(info, 4, 7)
+    rating = float(rating) if isinstance(rating, (int, float)) and 0 <= rating <= 5 else 0.0
+    review_count = _dig(info, 4, 8)
+    review_count = int(review_count) if isinstance(review_count, (int, float)) else 0
+
+    categories = _dig(info, 13)
+    category = categories[0] if isinstance(categories, list) and categories and isinstance(categories[0], str) else "N/A"
+
+    address = _dig(info, 39)
+    if not isinstance(address, str) or not address:
+        full_address = _dig(info, 18)
+        if isinstance(full_address, str) and full_address.startswith(name + ', '):
+            address = full_address[len(name) + 2:]
+        else:
+            parts = _dig(info, 2)
+            address = ', '.join(part for part in parts if isinstance(part, str)) if isinstance(parts, list) else ''
+    address = address or "N/A"
+
+    lat = _dig(info, 9, 2)
+    lng = _dig(info, 9, 3)
+    # Link dibuat dengan format yang sama seperti href kartu di feed
+    link = f"{base_url.rstrip('/')}/place/{quote_plus(name)}/data=!4m7!3m6!1s{feature_id}"
+    if isinstance(lat, (int, float)) and isinstance(lng, (int, float)):
+        link += f"!8m2!3d{lat}!4d{lng}"
+
+    return {
+        'name': name,
+        'rating': rating,
+        'review_count': review_count,
+        'category': category,
+        'address': address,
+        'link': link,
+        **parse_place_link(link)
+    }
+
+
+def parse_search_payload(text, min_rating=0, base_url='https://www.google.com/maps'):
+    """
+    Parse satu response pencarian Maps
+
+    Returns:
+        List of dict tempat (urut sesuai payload, sudah difilter min_rating), atau None jika
+        body tidak bisa di-decode
+    """
+    data = load_payload(text)
+    if data is None:
+        return None
+    places = []
+    seen_ids = set()
+    for info in _find_place_infos(data):
+        place = parse_place_info(info, base_url)
+        if not place or place['place_id'] in seen_ids or place['rating'] < min_rating:
+            continue
+        seen_ids.add(place['place_id'])
+        places.append(place)
+    return places
+
+
+def _find_payload_strings(node, depth=0):
+    if isinstance(node, str):
+        if node.lstrip().startswith(XSSI_PREFIX):
+            yield node
+    elif isinstance(node, list) and depth <= MAX_SCAN_DEPTH:
+        for child in node:
+            yield from _find_payload_strings(child, depth + 1)
+
+
+def parse_embedded_places(html, min_rating=0, base_url='https://www.google.com/maps'):
+    """
+    Parse halaman pertama hasil yang tertanam di HTML halaman pencarian (APP_INITIALIZATION_STATE)
+
+    Returns:
+        List of dict tempat, atau None jika state tidak ditemukan di HTML
+    """
+    match = APP_STATE_PATTERN.search(html or '')
+    if not match:
+        return None
+    try:
+        state = json.loads(match.group(1))
+    except ValueError:
+        return None
+    places = []
+    seen_ids = set()
+    for payload in _find_payload_strings(state):
+        for place in parse_search_payload(payload, min_rating, base_url) or []:
+            if place['place_id'] not in seen_ids:
+                seen_ids.add(place['place_id'])
+                places.append(place)
+    return places
+
+
+def is_search_payload_url(url):
+    return bool(url) and bool(SEARCH_PAYLOAD_URL_PATTERN.search(url))
+
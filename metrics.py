@@ -0,0 +1,236 @@
+import threading
+import time
+from contextlib import contextmanager
+
+# Bucket histogram (detik): dari satu perintah WebDriver sampai crawl berjam-jam
+DEFAULT_BUCKETS = (0.01, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 120, 300, 600, 1800)
+
+
+def _format_labels(names, values):
+    if not names:
+        return ''
+    pairs = ','.join(f'{name}="{str(value)}"'.replace('\n', ' ') for name, value in zip(names, values))
+    return '{' + pairs + '}'
+
+
+class Counter:
+    def __init__(self, name, help_text, labels=()):
+        self.name = name
+        self.help_text = help_text
+        self.labels = tuple(labels)
+        self.values = {}
+        self.lock = threading.Lock()
+
+    def inc(self, amount=1, *label_values):
+        with self.lock:
+            self.values[label_values] = self.values.get(label_values, 0) + amount
+
+    def render(self):
+        lines = [f"# HELP {self.name} {self.help_text}", f"# TYPE {self.name} counter"]
+        with self.lock:
+            for label_values, value in sorted(self.values.items()):
+                lines.append(f"{self.name}{_format_labels(self.labels, label_values)} {value}")
+        return lines
+
+
+class Gauge(Counter):
+    def set(self, value, *label_values):
+        with self.lock:
+            self.values[label_values] = value
+
+    def render(self):
+        lines = super().render()
+        lines[1] = f"# TYPE {self.name} gauge"
+        return lines
+
+
+class Histogram:
+    def __init__(self, name, help_text, labels=(), buckets=DEFAULT_BUCKETS):
+        self.name = name
+        self.help_text = help_text
+        self.labels = tuple(labels)
+        self.buckets = tuple(buckets)
+        self.values = {}
+        self.lock = threading.Lock()
+
+    def observe(self, value, *label_values):
+        with self.lock:
+            counts, total, count = self.values.get(label_values, ([0] * len(self.buckets), 0.0, 0))
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    counts[i] += 1
+            self.values[label_values] = (counts, total + value, count + 1)
+
+    def render(self):
+        lines = [f"# HELP {self.name} {self.help_text}", f"# TYPE {self.name} histogram"]
+        with self.lock:
+            for label_values, (counts, total, count) in sorted(self.values.items()):
+                for bound, bucket_count in zip(self.buckets, counts):
+                    labels = _format_labels(self.labels + ('le',), label_values + (bound,))
+                    lines.append(f"{self.name}_bucket{labels} {bucket_count}")
+                labels = _format_labels(self.labels + ('le',), label_values + ('+Inf',))
+                lines.append(f"{self.name}_bucket{labels} {count}")
+                lines.append(f"{self.name}_sum{_format_labels(self.labels, label_values)} {total}")
+                lines.append(f"{self.name}_count{_format_labels(self.labels, label_values)} {count}")
+        return lines
+
+
+class Registry:
+    def __init__(self):
+        self.metrics = []
+        self.collectors = []
+
+    def register(self, metric):
+        self.metrics.append(metric)
+        return metric
+
+    def add_collector(self, collector):
+        """Callable yang dipanggil sebelum render, mis. untuk mengisi gauge dari DriverPool.stats()"""
+        self.collectors.append(collector)
+
+    def render(self):
+        for collector in self.collectors:
+            try:
+                collector()
+            except Exception as e:
+                print(f"[DEBUG] Error collector metrics: {e}")
+        lines = []
+        for metric in self.metrics:
+            lines.extend(metric.render())
+        return '\n'.join(lines) + '\n'
+
+
+REGISTRY = Registry()
+
+PHASE_SECONDS = REGISTRY.register(Histogram(
+    'scraper_phase_seconds', 'Durasi tiap fase scraping', labels=('phase',)))
+SEARCH_SECONDS = REGISTRY.register(Histogram(
+    'scraper_search_seconds', 'Durasi total search_places', labels=('status',)))
+SEARCHES = REGISTRY.register(Counter(
+    'scraper_searches_total', 'Jumlah search_places', labels=('status',)))
+WEBDRIVER_COMMANDS = REGISTRY.register(Counter(
+    'scraper_webdriver_commands_total', 'Perintah WebDriver yang dikirim ke chromedriver', labels=('command',)))
+WAITS = REGISTRY.register(Counter(
+    'scraper_waits_total', 'Jumlah tunggu feed/sleep', labels=('outcome',)))
+WAIT_SECONDS = REGISTRY.register(Counter(
+    'scraper_wait_seconds_total', 'Total detik yang dihabiskan menunggu feed/sleep', labels=('outcome',)))
+ELEMENTS_SEEN = REGISTRY.register(Counter(
+    'scraper_elements_seen_total', 'Kartu hasil yang dilihat di feed'))
+PLACES_KEPT = REGISTRY.register(Counter(
+    'scraper_places_kept_total', 'Tempat unik yang lolos filter dan disimpan'))
+PLACES_ENRICHED = REGISTRY.register(Counter(
+    'scraper_places_enriched_total', 'Tempat yang diperkaya detail (telepon, website, jam buka)', labels=('source',)))
+COALESCED_REQUESTS = REGISTRY.register(Counter(
+    'scraper_coalesced_requests_total', 'Request yang menumpang scraping identik yang sedang berjalan'))
+NAVIGATIONS = REGISTRY.register(Counter(
+    'scraper_navigations_total', 'Navigasi ke Maps lewat NavigationScheduler', labels=('outcome',)))
+THROTTLE_WAIT_SECONDS = REGISTRY.register(Counter(
+    'scraper_throttle_wait_seconds_total', 'Total detik menunggu token navigasi/backoff'))
+NAVIGATION_RATE = REGISTRY.register(Gauge(
+    'scraper_navigation_rate', 'Laju navigasi yang sedang berlaku (per detik, 0 = tanpa batas)'))
+NAVIGATION_LIMIT = REGISTRY.register(Gauge(
+    'scraper_navigation_concurrency_limit', 'Batas pencarian bersamaan yang sedang berlaku'))
+ENRICH_SECONDS = REGISTRY.register(Histogram(
+    'scraper_enrich_seconds', 'Durasi enrichment detail per batch tempat'))
+
+
+class ScrapeMetrics:
+    """Metrics satu kali search_places; dikirim ke REGISTRY saat finish() dan dilampirkan ke hasil job"""
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.phases = {}
+        self.commands = {}
+        self.waits = {}
+        self.elements_seen = 0
+        self.places_kept = 0
+        self.total_seconds = None
+        self.current_phase = None
+        self.phase_started = None
+        self.lock = threading.Lock()
+
+    def _record_phase(self, name, elapsed):
+        with self.lock:
+            self.phases[name] = self.phases.get(name, 0.0) + elapsed
+        PHASE_SECONDS.observe(elapsed, name)
+
+    @contextmanager
+    def phase(self, name):
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self._record_phase(name, time.perf_counter() - started)
+
+    def mark(self, name):
+        """Stopwatch berurutan: tutup fase yang sedang berjalan lalu mulai fase `name` (None = berhenti)"""
+        now = time.perf_counter()
+        if self.current_phase is not None:
+            self._record_phase(self.current_phase, now - self.phase_started)
+        self.current_phase = name
+        self.phase_started = now
+
+    def command(self, name):
+        with self.lock:
+            self.commands[name] = self.commands.get(name, 0) + 1
+        WEBDRIVER_COMMANDS.inc(1, name)
+
+    def wait(self, outcome, seconds):
+        with self.lock:
+            count, total = self.waits.get(outcome, (0, 0.0))
+            self.waits[outcome] = (count + 1, total + seconds)
+        WAITS.inc(1, outcome)
+        WAIT_SECONDS.inc(seconds, outcome)
+
+    def seen(self, count):
+        with self.lock:
+            self.elements_seen = max(self.elements_seen, count)
+
+    def finish(self, status, places_kept):
+        self.mark(None)
+        elapsed = time.perf_counter() - self.started
+        self.places_kept = places_kept
+        ELEMENTS_SEEN.inc(self.elements_seen)
+        PLACES_KEPT.inc(places_kept)
+        SEARCHES.inc(1, status)
+        SEARCH_SECONDS.observe(elapsed, status)
+        self.total_seconds = elapsed
+        return self.to_dict()
+
+    def to_dict(self):
+        with self.lock:
+            return {
+                'total_seconds': round(self.total_seconds if self.total_seconds is not None else time.perf_counter() - self.started, 3),
+                'phases': {name: round(seconds, 3) for name, seconds in self.phases.items()},
+                'webdriver_commands': sum(self.commands.values()),
+                'commands': dict(self.commands),
+                'waits': {outcome: {'count': count, 'seconds': round(seconds, 3)}
+                          for outcome, (count, seconds) in self.waits.items()},
+                'elements_seen': self.elements_seen,
+                'places_kept': self.places_kept
+            }
+
+
+def instrument_driver(driver):
+    """
+    Bungkus driver.execute supaya setiap perintah WebDriver dihitung
+
+    Perintah dicatat ke ScrapeMetrics yang sedang aktif di driver.scrape_metrics (diganti
+    per search_places karena driver dipakai ulang lewat pool). Aman dipanggil berulang kali.
+    """
+    if getattr(driver, 'instrumented', False):
+        return driver
+    original_execute = driver.execute
+
+    def execute(driver_command, params=None):
+        metrics = getattr(driver, 'scrape_metrics', None)
+        if metrics is not None:
+            metrics.command(driver_command)
+        else:
+            WEBDRIVER_COMMANDS.inc(1, driver_command)
+        return original_execute(driver_command, params)
+
+    driver.execute = execute
+    driver.instrumented = True
+    driver.scrape_metrics = None
+    return driver
@@ -0,0 +1,106 @@
+import re
+from urllib.parse import unquote
+
+# Link tempat Google Maps: /maps/place/<nama>/@lat,lng,zoom/data=...!1s0x..:0x..!...!3d<lat>!4d<lng>...
+FEATURE_ID_PATTERN = re.compile(r'!1s(0x[0-9a-fA-F]+:0x[0-9a-fA-F]+)')
+DATA_COORDS_PATTERN = re.compile(r'!3d(-?\d+(?:\.\d+)?)!4d(-?\d+(?:\.\d+)?)')
+VIEWPORT_COORDS_PATTERN = re.compile(r'/@(-?\d+(?:\.\d+)?),(-?\d+(?:\.\d+)?)')
+CID_PATTERN = re.compile(r'[?&]cid=(\d+)')
+
+
+def parse_place_link(link):
+    """
+    Ambil identitas tempat dari link Google Maps
+
+    Returns:
+        dict {'place_id', 'lat', 'lng'}; nilai None jika tidak ada di link.
+        Koordinat dari !3d/!4d (lokasi tempat) lebih diutamakan daripada /@ (posisi viewport).
+    """
+    info = {'place_id': None, 'lat': None, 'lng': None}
+    if not link:
+        return info
+    link = unquote(link)
+
+    match = FEATURE_ID_PATTERN.search(link)
+    if match:
+        info['place_id'] = match.group(1).lower()
+    else:
+        match = CID_PATTERN.search(link)
+        if match:
+            # cid adalah bagian kedua dari feature id dalam bentuk desimal
+            info['place_id'] = f"cid:{match.group(1)}"
+
+    match = DATA_COORDS_PATTERN.search(link) or VIEWPORT_COORDS_PATTERN.search(link)
+    if match:
+        info['lat'] = float(match.group(1))
+        info['lng'] = float(match.group(2))
+    return info
+
+
+def dedup_place_id(place_id):
+    """
+    Id untuk dedup: feature id 0x..:0x.. dan cid:<desimal> dari tempat yang sama menjadi satu id
+
+    cid adalah bagian kedua feature id dalam bentuk desimal, jadi keduanya dinormalisasi ke cid.
+    """
+    if not place_id:
+        return None
+    match = re.fullmatch(r'0x[0-9a-f]+:(0x[0-9a-f]+)', place_id.lower())
+    if match:
+        return f"cid:{int(match.group(1), 16)}"
+    return place_id
+
+
+def normalize_name(name):
+    return ' '.join((name or '').lower().split())
+
+
+def place_key(place):
+    """Key dedup: place_id jika ada, fallback ke nama (case-insensitive)"""
+    if place.get('place_id'):
+        return f"id:{place['place_id']}"
+    return f"name:{normalize_name(place.get('name'))}"
+
+
+class PlaceIndex:
+    """
+    Index dedup O(1) berdasarkan place_id (feature id dan cid tempat yang sama dianggap sama)
+
+    Cabang jaringan dengan nama sama ("Kopi Kenangan") tetap dianggap tempat berbeda
+    selama place_id-nya berbeda. Tempat tanpa place_id didedup berdasarkan nama terhadap
+    semua tempat yang sudah ada.
+    """
+
+    def __init__(self, places=None):
+        self.ids = set()
+        self.names = set()
+        self.count = 0
+        for place in places or []:
+            self.add(place)
+
+    def __len__(self):
+        return self.count
+
+    def __contains__(self, place):
+        if place.get('place_id'):
+            return dedup_place_id(place['place_id']) in self.ids
+        return normalize_name(place.get('name')) in self.names
+
+    def add(self, place):
+        """
+        Tambahkan tempat; return False jika duplikat
+
+        Tempat tanpa place_id dilengkapi dari link-nya, hanya untuk field yang kosong
+        (koordinat kartu tidak ditimpa None jika link tidak berisi koordinat).
+        """
+        if place.get('place_id') is None and place.get('link'):
+            for key, value in parse_place_link(place['link']).items():
+                if value is not None and place.get(key) is None:
+                    place[key] = value
+        if place in self:
+            return False
+        if place.get('place_id'):
+            self.ids.add(dedup_place_id(place['place_id']))
+        self.names.add(normalize_name(place.get('name')))
+        self.count += 1
+        return True
@@ -6,14 +6,375 @@ from selenium.webdriver.common.keys import Keys
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 from webdriver_manager.chrome import ChromeDriverManager
+from places import PlaceIndex, parse_place_link
+from metrics import ScrapeMetrics, instrument_driver
+from engines import HttpEngine
+from throttle import BlockedError, NavigationScheduler, detect_block_page
+from maps_payload import MAPS_BASE_URL, build_search_url, is_search_payload_url, parse_search_payload
+import json
+import platform
+import shutil
+import subprocess
+import threading
 import time
 import re
 import os
-import shutil
+
+
+# Mode ringan: resource yang tidak pernah dibaca extractor (tile peta, foto, font).
+# Feed hasil (HTML/JS/XHR pencarian) tetap dimuat.
+LIGHTWEIGHT_BLOCKED_URLS = [
+    '*/maps/vt*',                      # tile peta raster/vector
+    '*/maps/vt/*',
+    '*/kh/v=*',                        # tile satelit
+    '*.googleusercontent.com/*',       # foto tempat, avatar ulasan
+    '*streetviewpixels-pa.googleapis.com/*',
+    '*/maps/preview/photo*',
+    '*fonts.gstatic.com/*',
+    '*fonts.googleapis.com/*',
+    '*.woff2*', '*.woff*', '*.ttf*',
+    '*.png*', '*.jpg*', '*.jpeg*', '*.gif*', '*.webp*',
+]
+LIGHTWEIGHT_CHROME_PREFS = {
+    'profile.managed_default_content_settings.images': 2,
+    'profile.default_content_setting_values.notifications': 2,
+    'profile.default_content_setting_values.geolocation': 2,
+    'profile.managed_default_content_settings.media_stream': 2,
+}
+
+# Feed Maps berhenti di sekitar 120 kartu: feed sepanjang ini kemungkinan terpotong, jadi
+# areanya tidak dicatat sebagai coverage lengkap
+FEED_CARD_LIMIT = 120
+
+# Cache hasil resolve chromedriver: di memory per proses dan di disk antar proses
+CHROMEDRIVER_CACHE_FILE = os.environ.get(
+    'CHROMEDRIVER_CACHE_FILE',
+    os.path.join(os.path.expanduser("~"), ".wdm", "scraping-maps-chromedriver.json")
+)
+_chromedriver_lock = threading.Lock()
+_chromedriver_info = None
+# Resolve ulang karena path basi hanya dilakukan sekali per proses (lihat refresh_stale_chromedriver)
+_chromedriver_refreshed = False
+
+# Pesan error Selenium saat versi chromedriver tidak cocok dengan Chrome yang terinstall
+CHROMEDRIVER_MISMATCH_ERRORS = ('session not created', 'only supports chrome version', 'this version of chromedriver')
+
+
+def _chromedriver_binary_name():
+    return 'chromedriver.exe' if platform.system() == 'Windows' else 'chromedriver'
+
+
+def _is_executable(path):
+    return bool(path) and os.path.isfile(path) and os.access(path, os.X_OK)
+
+
+def _find_chromedriver_binary(path):
+    """Cari binary chromedriver yang benar untuk OS ini dari path yang dikembalikan webdriver-manager"""
+    binary_name = _chromedriver_binary_name()
+    if os.path.isfile(path) and os.path.basename(path) == binary_name:
+        return path
+    # webdriver-manager kadang mengembalikan file lain (mis. THIRD_PARTY_NOTICES.chromedriver)
+    search_dir = path if os.path.isdir(path) else os.path.dirname(path)
+    candidate = os.path.join(search_dir, binary_name)
+    if os.path.isfile(candidate):
+        return candidate
+    for root, dirs, files in os.walk(search_dir):
+        if binary_name in files:
+            return os.path.join(root, binary_name)
+    return None
+
+
+def _chromedriver_version(path):
+    try:
+        output = subprocess.run([path, '--version'], capture_output=True, text=True, timeout=10).stdout
+        match = re.search(r'(\d+(?:\.\d+)+)', output)
+        return match.group(1) if match else None
+    except Exception:
+        return None
+
+
+def resolve_chromedriver(refresh=False):
+    """
+    Resolve path chromedriver sekali per proses
+
+    Urutan: env CHROMEDRIVER_PATH, cache di disk, webdriver-manager, chromedriver di PATH.
+    Tidak pernah menghapus cache ~/.wdm. Gunakan refresh=True (mis. dari shell) untuk
+    memaksa resolve ulang setelah Chrome di-update.
+
+    Returns:
+        Path ke binary chromedriver, atau None jika harus diserahkan ke Selenium Manager
+    """
+    global _chromedriver_info
+    if _chromedriver_info is not None and not refresh:
+        return _chromedriver_info['path']
+
+    with _chromedriver_lock:
+        if _chromedriver_info is not None and not refresh:
+            return _chromedriver_info['path']
+
+        info = None
+        env_path = os.environ.get('CHROMEDRIVER_PATH')
+        if _is_executable(env_path):
+            info = {'path': env_path, 'source': 'env'}
+
+        if info is None and not refresh:
+            try:
+                with open(CHROMEDRIVER_CACHE_FILE) as f:
+                    cached = json.load(f)
+                if cached.get('platform') == platform.system() and _is_executable(cached.get('path')):
+                    info = cached
+            except (OSError, ValueError):
+                pass
+
+        if info is None:
+            try:
+                installed = _find_chromedriver_binary(ChromeDriverManager().install())
+                if _is_executable(installed):
+                    info = {'path': installed, 'source': 'webdriver-manager'}
+            except Exception as e:
+                print(f"[GAGAL] Error dengan ChromeDriverManager: {e}")
+
+        if info is None:
+            on_path = shutil.which(_chromedriver_binary_name())
+            if on_path:
+                info = {'path': on_path, 'source': 'PATH'}
+
+        if info is None:
+            print(f"[INFO] Chromedriver tidak ditemukan, driver akan dibuat oleh Selenium Manager")
+            info = {'path': None, 'source': 'selenium-manager'}
+        else:
+            info.setdefault('version', _chromedriver_version(info['path']))
+            info['platform'] = platform.system()
+            if info['source'] != 'cache':
+                try:
+                    os.makedirs(os.path.dirname(CHROMEDRIVER_CACHE_FILE), exist_ok=True)
+                    with open(CHROMEDRIVER_CACHE_FILE, 'w') as f:
+                        json.dump(dict(info, source='cache'), f)
+                except OSError as e:
+                    print(f"[DEBUG] Gagal menyimpan cache chromedriver: {e}")
+            print(f"[INFO] Chromedriver {info.get('version') or ''} dari {info['source']}: {info['path']}")
+
+        _chromedriver_info = info
+        return info['path']
+
+
+def refresh_stale_chromedriver(failed_path, error):
+    """
+    Resolve ulang chromedriver setelah path hasil resolve gagal dijalankan, paling banyak sekali per proses
+
+    Hanya jika binary-nya hilang/tidak executable atau error-nya versi tidak cocok (Chrome di-update);
+    Chrome yang memang rusak tidak perlu membayar install webdriver-manager di setiap pembuatan driver.
+
+    Returns:
+        Path chromedriver baru, atau None jika tidak ada path lain yang perlu dicoba
+    """
+    global _chromedriver_refreshed
+    message = str(error).lower()
+    if _is_executable(failed_path) and not any(text in message for text in CHROMEDRIVER_MISMATCH_ERRORS):
+        return None
+    with _chromedriver_lock:
+        refreshed = _chromedriver_refreshed
+        _chromedriver_refreshed = True
+    fresh_path = resolve_chromedriver() if refreshed else resolve_chromedriver(refresh=True)
+    return fresh_path if fresh_path != failed_path else None
+
+
+def chromedriver_info():
+    """Info chromedriver yang sudah di-resolve (path, version, source)"""
+    resolve_chromedriver()
+    return dict(_chromedriver_info)
+
+# Ekstraksi massal: serialisasi semua kartu hasil dalam satu panggilan execute_script.
+# Parsing detail (rating, review, kategori, alamat) dilakukan di Python oleh _parse_bulk_card
+# supaya aturannya sama dengan _extract_place_info.
+BULK_EXTRACT_JS = """
+var startIndex = arguments[0] || 0;
+var cards = document.querySelectorAll("div[role='article']");
+var out = [];
+for (var i = startIndex; i < cards.length; i++) {
+    var card = cards[i];
+    var link = card.querySelector("a[href*='/maps/place/']");
+    var heading = card.querySelector(".fontHeadlineSmall, div[role='heading'], h3, h2");
+    var ratingEl = card.querySelector("span[role='img'][aria-label], span[aria-label*='tar'], span[aria-label*='intang']");
+    var reviewEl = card.querySelector("span[aria-label*='eview'], span[aria-label*='lasan']");
+    var bodies = card.querySelectorAll(".fontBodyMedium > div, .W4Efsd");
+    var lines = [];
+    for (var j = 0; j < bodies.length; j++) {
+        var t = (bodies[j].innerText || '').trim();
+        if (t && lines.indexOf(t) === -1) lines.push(t);
+    }
+    out.push({
+        index: i,
+        label: card.getAttribute('aria-label') || (link && link.getAttribute('aria-label')) || '',
+        heading: heading ? heading.innerText : '',
+        rating_label: ratingEl ? (ratingEl.getAttribute('aria-label') || ratingEl.innerText) : '',
+        review_label: reviewEl ? (reviewEl.getAttribute('aria-label') || reviewEl.innerText) : '',
+        lines: lines,
+        text: card.innerText || '',
+        link: link ? link.href : ''
+    });
+}
+return JSON.stringify({total: cards.length, cards: out});
+"""
+
+# Feed diproses dengan cursor index DOM (feed Maps hanya bertambah di akhir): perintah di bawah
+# hanya menyentuh kartu mulai startIndex, jadi setiap kartu di-scroll dan diekstrak sekali.
+COUNT_CARDS_JS = "return document.querySelectorAll(\"div[role='article']\").length;"
+NEW_CARDS_JS = """
+return Array.prototype.slice.call(document.querySelectorAll("div[role='article']"), arguments[0] || 0);
+"""
+# Tunggu feed berubah secara event-driven: resolve begitu ada kartu baru, penanda akhir daftar
+# muncul, atau tidak ada mutasi selama idle timeout. Dipanggil via execute_async_script.
+# Argumen ketiga opsional (scrollFrom): sebelum menunggu, hover kartu mulai index itu dan scroll
+# feed ke dasar, jadi satu langkah scroll + tunggu hanya satu round trip WebDriver.
+# Selain jumlah kartu, state melaporkan spinner loading, posisi scroll dan tombol "more" supaya
+# feed yang sudah habis bisa dibedakan dari lazy-load yang lambat.
+WAIT_FOR_FEED_JS = """
+var previousCount = arguments[0];
+var idleTimeoutMs = arguments[1];
+var scrollFrom = arguments.length > 3 ? arguments[2] : null;
+var done = arguments[arguments.length - 1];
+var endPattern = /end of the list|akhir daftar|reached the end/i;
+var morePattern = /more|lainnya|tampilkan|muat/i;
+var feed = document.querySelector("div[role='feed']");
+function moreButton() {
+    if (!feed) return null;
+    var buttons = feed.querySelectorAll("button, div[role='button']");
+    for (var i = buttons.length - 1; i >= 0; i--) {
+        var button = buttons[i];
+        if (button.closest("div[role='article']") || !button.offsetParent) continue;
+        if (morePattern.test(button.getAttribute('aria-label') || button.innerText || '')) return button;
+    }
+    return null;
+}
+function state(timedOut) {
+    var count = document.querySelectorAll("div[role='article']").length;
+    var marker = document.querySelector(".HlvSq, span.m6QErb");
+    var ended = !!(marker && endPattern.test(marker.innerText || ''));
+    if (!ended && feed && feed.lastElementChild) {
+        ended = endPattern.test(feed.lastElementChild.innerText || '');
+    }
+    var loading = !!(feed && feed.querySelector("[role='progressbar'], .qjESne, .lXJj5c"));
+    var atBottom = !feed || feed.scrollTop + feed.clientHeight >= feed.scrollHeight - 250;
+    return {count: count, ended: ended, timed_out: !!timedOut, loading: loading, at_bottom: atBottom,
+            more_button: !!moreButton()};
+}
+if (feed && scrollFrom !== null) {
+    var cards = document.querySelectorAll("div[role='article']");
+    for (var i = scrollFrom; i < cards.length; i++) {
+        cards[i].dispatchEvent(new MouseEvent('mouseover', {bubbles: true}));
+    }
+    if (cards.length) cards[cards.length - 1].scrollIntoView({block: 'end'});
+    feed.scrollTop = feed.scrollHeight;
+}
+var initial = state(false);
+if (!feed || initial.count > previousCount || initial.ended) { done(initial); return; }
+var finished = false;
+var timer = null;
+var observer = new MutationObserver(function() {
+    var current = state(false);
+    if (current.count > previousCount || current.ended) { finish(current); return; }
+    // Masih ada aktivitas (spinner, placeholder): perpanjang idle timeout
+    clearTimeout(timer);
+    timer = setTimeout(function() { finish(state(true)); }, idleTimeoutMs);
+});
+function finish(result) {
+    if (finished) return;
+    finished = true;
+    observer.disconnect();
+    clearTimeout(timer);
+    done(result);
+}
+observer.observe(feed, {childList: true, subtree: true});
+timer = setTimeout(function() { finish(state(true)); }, idleTimeoutMs);
+// Batas keras supaya mutasi terus-menerus (animasi) tidak menahan selamanya
+setTimeout(function() { finish(state(true)); }, idleTimeoutMs * 3);
+"""
+
+# Aksi untuk feed yang macet saat lazy-load: naik sedikit lalu turun lagi (memicu ulang
+# IntersectionObserver), over-scroll, dan klik tombol "more" jika ada
+NUDGE_FEED_JS = """
+var feed = document.querySelector("div[role='feed']");
+if (feed) feed.scrollTop = Math.max(0, feed.scrollHeight - feed.clientHeight - 1000);
+"""
+OVERSCROLL_FEED_JS = """
+var feed = document.querySelector("div[role='feed']");
+if (feed) feed.scrollTop = feed.scrollHeight + 3000;
+"""
+CLICK_MORE_JS = """
+var morePattern = /more|lainnya|tampilkan|muat/i;
+var feed = document.querySelector("div[role='feed']");
+var buttons = feed ? feed.querySelectorAll("button, div[role='button']") : [];
+for (var i = buttons.length - 1; i >= 0; i--) {
+    var button = buttons[i];
+    if (button.closest("div[role='article']") || !button.offsetParent) continue;
+    if (morePattern.test(button.getAttribute('aria-label') || button.innerText || '')) { button.click(); return true; }
+}
+return false;
+"""
+
+
+def apply_resource_blocking(driver, patterns=None):
+    """
+    Blokir URL lewat DevTools (Network.setBlockedURLs) untuk sesi driver ini
+
+    Berlaku sampai driver ditutup, jadi cukup sekali per driver (termasuk driver di pool).
+    Returns True jika berhasil; driver non-Chromium dilewati tanpa error.
+    """
+    try:
+        driver.execute_cdp_cmd('Network.enable', {})
+        driver.execute_cdp_cmd('Network.setBlockedURLs', {'urls': list(patterns or LIGHTWEIGHT_BLOCKED_URLS)})
+        return True
+    except Exception as e:
+        print(f"[DEBUG] Gagal mengaktifkan blokir resource: {e}")
+        return False
+
 
 class GoogleMapsScraper:
-    def __init__(self, headless=True):
-        """Inisialisasi scraper dengan Selenium"""
+    def __init__(self, headless=True, driver_pool=None, extraction_mode='bulk', feed_idle_timeout=5.0,
+                 result_cache=None, base_url=None, lightweight=False, engine='selenium', engines=None,
+                 scheduler=None, place_store=None):
+        """
+        Inisialisasi scraper dengan Selenium
+
+        Args:
+            headless: Jalankan Chrome tanpa window
+            driver_pool: DriverPool opsional; jika ada, driver dipinjam dari pool
+                         dan dikembalikan setelah selesai (tidak di-quit)
+            extraction_mode: 'bulk' (semua kartu dalam satu execute_script, fallback ke
+                             per elemen jika gagal), 'element' (selalu per elemen) atau
+                             'network' (parse response XHR pencarian dari performance log,
+                             kartu yang tidak ada di response diambil dari DOM)
+            feed_idle_timeout: Detik tanpa perubahan feed sebelum dianggap tidak ada hasil baru
+            result_cache: ResultCache opsional; search_places menjawab dari cache jika ada
+            base_url: Basis URL Maps (default env MAPS_BASE_URL atau https://www.google.com/maps),
+                      bisa diarahkan ke server fixture lokal untuk benchmark
+            lightweight: Blokir gambar, font dan tile peta (Chrome prefs + DevTools) di driver
+                         yang dibuat scraper ini; feed hasil tetap berfungsi
+            engine: Engine default search_places: 'selenium' (browser) atau nama engine di `engines`
+            engines: dict nama -> engine (lihat engines.py); 'http' dibuat otomatis jika tidak diberikan
+            scheduler: NavigationScheduler bersama (lihat throttle.py) untuk semua navigasi ke Maps;
+                       default scheduler milik instance ini tanpa batas laju (tetap mendeteksi
+                       halaman blokir dan menerapkan backoff)
+            place_store: PlaceStore opsional (lihat store.py); setiap hasil scraping di-upsert
+                         dan dipakai mode incremental
+        """
+        self.base_url = (base_url or MAPS_BASE_URL).rstrip('/')
+        self.result_cache = result_cache
+        self.place_store = place_store
+        # Metrics search_places yang sedang/terakhir berjalan (lihat metrics.ScrapeMetrics)
+        self.metrics = None
+        # True jika _scroll_results terakhir berhenti karena penanda akhir daftar
+        self.feed_ended = False
+        self.feed_idle_timeout = feed_idle_timeout
+        self.driver_pool = driver_pool
+        self.extraction_mode = extraction_mode
+        self.lightweight = lightweight
+        self.engine = engine
+        self.engines = dict(engines or {})
+        self.scheduler = scheduler or NavigationScheduler(
+            rate=None, max_concurrency=driver_pool.max_size if driver_pool else 1
+        )
         self.options = Options()
         if headless:
             self.options.add_argument("--headless")
@@ -24,66 +385,55 @@ class GoogleMapsScraper:
         self.options.add_experimental_option("excludeSwitches", ["enable-automation"])
         self.options.add_experimental_option('useAutomationExtension', False)
         self.options.add_argument("user-agent=Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36")
+        if extraction_mode == 'network':
+            # Response XHR pencarian dibaca dari performance log chromedriver
+            self.options.set_capability('goog:loggingPrefs', {'performance': 'ALL'})
+            self.options.add_experimental_option('perfLoggingPrefs', {'enableNetwork': True, 'enablePage': False})
+        if lightweight:
+            self.options.add_experimental_option('prefs', LIGHTWEIGHT_CHROME_PREFS)
+            self.options.add_argument("--blink-settings=imagesEnabled=false")
+            self.options.add_argument("--disable-remote-fonts")
+            self.options.add_argument("--mute-audio")
         
     def _get_driver(self):
-        """Membuat driver Chrome dengan error handling yang lebih baik"""
+        """Membuat driver Chrome; mode lightweight juga memasang blokir resource via DevTools"""
+        driver = self._create_driver()
+        if self.lightweight:
+            apply_resource_blocking(driver)
+        return driver
+    
+    def _create_driver(self):
+        """Membuat driver Chrome; path chromedriver sudah di-resolve sekali per proses"""
+        driver_path = resolve_chromedriver()
         try:
-            # Coba dengan ChromeDriverManager
-            driver_path = ChromeDriverManager().install()
-            
-            # Pastikan path adalah file executable, bukan file lain
-            if not driver_path.endswith('.exe') and os.path.isdir(driver_path):
-                # Cari chromedriver.exe di dalam folder
-                for root, dirs, files in os.walk(driver_path):
-                    for file in files:
-                        if file == 'chromedriver.exe':
-                            driver_path = os.path.join(root, file)
-                            break
-                    if driver_path.endswith('.exe'):
-                        break
-            
-            # Jika masih bukan .exe, coba cari di parent directory
-            if not driver_path.endswith('.exe'):
-                parent_dir = os.path.dirname(driver_path) if os.path.isfile(driver_path) else driver_path
-                exe_path = os.path.join(parent_dir, 'chromedriver.exe')
-                if os.path.exists(exe_path):
-                    driver_path = exe_path
-            
-            service = Service(driver_path)
-            return webdriver.Chrome(service=service, options=self.options)
+            if driver_path:
+                return webdriver.Chrome(service=Service(driver_path), options=self.options)
+            # Tidak ada chromedriver yang ditemukan, biarkan Selenium Manager yang mencari
+            return webdriver.Chrome(options=self.options)
         except Exception as e:
-            print(f"[GAGAL] Error dengan ChromeDriverManager: {e}")
+            print(f"[GAGAL] Error membuat driver dengan {driver_path or 'Selenium Manager'}: {e}")
+            if not driver_path:
+                raise Exception(f"Tidak dapat membuat Chrome driver. Pastikan Chrome browser terinstall. Error: {e}")
+            # Path hasil resolve (mis. dari cache) mungkin basi setelah Chrome di-update:
+            # resolve ulang sekali per proses supaya path lama tidak dipakai lagi di memori maupun cache disk
+            fresh_path = refresh_stale_chromedriver(driver_path, e)
+            if fresh_path:
+                try:
+                    print(f"[INFO] Mencoba chromedriver hasil resolve ulang: {fresh_path}")
+                    return webdriver.Chrome(service=Service(fresh_path), options=self.options)
+                except Exception as e:
+                    print(f"[GAGAL] Error membuat driver dengan {fresh_path}: {e}")
             # Fallback: coba tanpa service (gunakan Chrome yang sudah terinstall)
             try:
                 print("[INFO] Mencoba menggunakan Chrome yang sudah terinstall...")
                 return webdriver.Chrome(options=self.options)
             except Exception as e2:
-                print(f"[GAGAL] Error membuat driver: {e2}")
-                # Coba bersihkan cache dan install ulang
-                try:
-                    cache_path = os.path.join(os.path.expanduser("~"), ".wdm")
-                    if os.path.exists(cache_path):
-                        print("[INFO] Membersihkan cache ChromeDriver...")
-                        shutil.rmtree(cache_path, ignore_errors=True)
-                    driver_path = ChromeDriverManager().install()
-                    
-                    # Cari chromedriver.exe
-                    if not driver_path.endswith('.exe'):
-                        for root, dirs, files in os.walk(driver_path if os.path.isdir(driver_path) else os.path.dirname(driver_path)):
-                            for file in files:
-                                if file == 'chromedriver.exe':
-                                    driver_path = os.path.join(root, file)
-                                    break
-                            if driver_path.endswith('.exe'):
-                                break
-                    
-                    service = Service(driver_path)
-                    return webdriver.Chrome(service=service, options=self.options)
-                except Exception as e3:
-                    print(f"[GAGAL] Semua metode gagal: {e3}")
-                    raise Exception(f"Tidak dapat membuat Chrome driver. Pastikan Chrome browser terinstall. Error: {e3}")
+                print(f"[GAGAL] Semua metode gagal: {e2}")
+                raise Exception(f"Tidak dapat membuat Chrome driver. Pastikan Chrome browser terinstall. Error: {e2}")
     
-    def search_places(self, query, location, min_rating=0, max_results=100, lat=None, lng=None, radius_m=None):
+    def search_places(self, query, location, min_rating=0, max_results=100, lat=None, lng=None, radius_m=None,
+                      progress_callback=None, use_cache=True, refresh_cache=False, fallbacks=True, engine=None,
+                      incremental_max_age=None, index_max_age=None, checkpoint=None, coverage_radius_m=None):
         """
         Mencari tempat di Google Maps
         
@@ -95,175 +445,273 @@ class GoogleMapsScraper:
             lat: Latitude (opsional, untuk koordinat spesifik)
             lng: Longitude (opsional, untuk koordinat spesifik)
             radius_m: Radius dalam meter (opsional, untuk area spesifik)
+            progress_callback: Callable opsional progress_callback(event, data); event 'loaded'
+                               dengan jumlah elemen ter-load, 'place' dengan dict tempat baru,
+                               'metrics' dengan ringkasan timing/perintah WebDriver di akhir
+            use_cache: False untuk bypass result_cache sepenuhnya (tidak baca, tidak tulis)
+            refresh_cache: True untuk selalu scraping ulang lalu memperbarui cache
+            fallbacks: False untuk melewati teknik alternatif dan multiple radius
+                       (dipakai crawler tiling yang sudah membagi area sendiri)
+            engine: Override engine untuk pencarian ini ('selenium', 'http', ...)
+            incremental_max_age: Mode incremental (butuh place_store): scraping ulang tanpa membaca
+                                 cache, dan berhenti scroll begitu satu batch kartu hanya berisi
+                                 tempat yang sudah di-refresh dalam sekian detik terakhir. Hasilnya
+                                 parsial, jadi tidak disimpan ke result_cache
+            index_max_age: Jawab dari index spasial place_store (butuh lat/lng) jika seluruh area
+                           sudah di-scrape untuk query ini dalam sekian detik terakhir; jika
+                           coverage kurang/kedaluwarsa, scraping seperti biasa
+            checkpoint: Checkpoint opsional (lihat checkpoint.py, hanya engine selenium): hasil,
+                        feed yang selesai dan radius yang selesai disimpan berkala; state yang
+                        sudah ada (resume) dipakai untuk melewati pekerjaan yang sudah selesai
+            coverage_radius_m: Radius area yang dicek/dicatat di index coverage (default radius_m);
+                               crawler tiling memakai setengah diagonal tile karena radius_m tile
+                               adalah lebar viewport
         
         Returns:
             List of dict dengan informasi tempat
         """
         driver = None
+        failed = False
+        results = []
+        metrics = self.metrics = ScrapeMetrics()
+        
+        def emit(event, data):
+            if progress_callback:
+                try:
+                    progress_callback(event, data)
+                except Exception as e:
+                    print(f"[DEBUG] Error di progress_callback: {e}")
+        
+        cache_args = dict(query=query, location=location, min_rating=min_rating, max_results=max_results,
+                          lat=lat, lng=lng, radius_m=radius_m)
+        use_cache = use_cache and self.result_cache is not None
+        incremental = incremental_max_age is not None and self.place_store is not None
+        if use_cache and not refresh_cache and not incremental:
+            try:
+                with metrics.phase('cache_lookup'):
+                    cached, loaded = self.result_cache.get(with_loaded=True, **cache_args)
+            except Exception as e:
+                print(f"[DEBUG] Gagal membaca cache: {e}")
+                cached = None
+            if cached is not None:
+                print(f"[INFO] Cache hit: {len(cached)} hasil untuk '{query}'")
+                # Jumlah kartu mentah saat entry di-scrape (crawler tiling menilai kepadatan tile dari sini)
+                metrics.seen(loaded)
+                emit('loaded', loaded)
+                for place in cached:
+                    emit('place', place)
+                emit('metrics', metrics.finish('cache_hit', len(cached)))
+                return cached
+        
+        if (index_max_age is not None and self.place_store is not None and lat is not None and lng is not None
+                and not incremental):
+            try:
+                with metrics.phase('index_lookup'):
+                    indexed = self.place_store.query_area(query, lat, lng, coverage_radius_m or radius_m or 5000,
+                                                          min_rating, index_max_age)
+            except Exception as e:
+                print(f"[DEBUG] Gagal membaca index tempat: {e}")
+                indexed = None
+            if indexed is not None:
+                if max_results > 0:
+                    indexed = indexed[:max_results]
+                print(f"[INFO] Index hit: {len(indexed)} hasil untuk '{query}' dalam {radius_m or 5000}m")
+                emit('loaded', len(indexed))
+                for place in indexed:
+                    emit('place', place)
+                emit('metrics', metrics.finish('index_hit', len(indexed)))
+                return indexed
+        
+        engine = engine or self.engine
+        if engine != 'selenium':
+            return self._search_with_engine(
+                self._get_engine(engine), query, location, min_rating, max_results, lat, lng, radius_m,
+                emit, metrics, cache_args if use_cache else None, incremental_max_age if incremental else None,
+                coverage_radius_m
+            )
+        
+        # Resume: hasil dan tahap yang sudah selesai dari crawl sebelumnya yang terputus
+        stages = list(checkpoint.get('stages', [])) if checkpoint is not None else []
+        done_radii = set(checkpoint.get('radii', [])) if checkpoint is not None else set()
+        # Feed utama dibaca sampai penanda akhir daftar tanpa menyentuh batas feed Maps
+        feed_complete = [bool(checkpoint.get('feed_complete')) if checkpoint is not None else False]
+        if checkpoint is not None and checkpoint.get('results'):
+            results.extend(checkpoint.get('results'))
+            for place in results:
+                emit('place', place)
+        
+        # Slot pencarian bersamaan diambil sebelum driver; batasnya turun saat Google memblokir
+        self.scheduler.acquire_slot()
         try:
-            print(f"[INFO] Membuat Chrome driver...")
-            driver = self._get_driver()
-            print(f"[INFO] Chrome driver berhasil dibuat")
-            
-            wait = WebDriverWait(driver, 20)
-            
-            # Buat URL berdasarkan koordinat atau location
-            if lat and lng:
-                # Gunakan format URL dengan koordinat dan radius
-                if radius_m:
-                    url = f"https://www.google.com/maps/search/{query.replace(' ', '+')}/@{lat},{lng},{radius_m}m/data=!3m2!1e3!4b1?entry=ttu"
-                else:
-                    # Default radius 5000m jika tidak ditentukan
-                    url = f"https://www.google.com/maps/search/{query.replace(' ', '+')}/@{lat},{lng},5000m/data=!3m2!1e3!4b1?entry=ttu"
-                print(f"[INFO] Menggunakan koordinat: {lat}, {lng} dengan radius: {radius_m or 5000}m")
+            metrics.mark('driver_startup')
+            if self.driver_pool:
+                print(f"[INFO] Meminjam Chrome driver dari pool...")
+                driver = self.driver_pool.acquire()
             else:
-                # Gunakan format URL biasa dengan location
-                search_query = f"{query} {location}"
-                url = f"https://www.google.com/maps/search/{search_query.replace(' ', '+')}"
+                print(f"[INFO] Membuat Chrome driver...")
+                driver = self._get_driver()
+            print(f"[INFO] Chrome driver siap")
+            instrument_driver(driver)
+            driver.scrape_metrics = metrics
             
-            print(f"[INFO] Membuka URL: {url}")
-            driver.get(url)
+            # Index deduplikasi berdasarkan place_id (fallback nama)
+            seen = PlaceIndex(results)
+            # Cursor index DOM: kartu dengan index < cursor sudah diekstrak (setiap kartu sekali)
+            cursor = [0]
+            # Mode incremental: True setelah scroll dihentikan karena batch hanya berisi tempat yang masih segar
+            caught_up = [False]
             
-            # Tunggu hasil muncul
-            wait.until(EC.presence_of_element_located((By.TAG_NAME, "body")))
-            time.sleep(3)
+            def target_reached():
+                return max_results > 0 and len(results) >= max_results
             
-            # Tunggu sampai hasil pencarian muncul
-            try:
-                wait.until(EC.presence_of_element_located((By.CSS_SELECTOR, "div[role='article']")))
-                print(f"[INFO] Hasil pencarian sudah muncul")
-            except:
-                print(f"[INFO] Menunggu hasil pencarian...")
-                time.sleep(5)
-            
-            # Scroll untuk memuat lebih banyak hasil
-            print(f"[INFO] Scroll untuk memuat lebih banyak hasil...")
-            place_elements = self._scroll_results(driver, max_results)
-            
-            # Tunggu sedikit lagi setelah scroll
-            time.sleep(3)
+            def add_places(places):
+                for place_data in places:
+                    if target_reached():
+                        break
+                    if seen.add(place_data):
+                        results.append(place_data)
+                        emit('place', place_data)
             
-            # Scroll ke setiap elemen secara individual untuk memastikan konten ter-load
-            # Hapus batasan untuk memastikan semua elemen ter-load
-            print(f"[INFO] Memastikan semua elemen ter-load dengan scroll individual...")
-            print(f"[INFO] Total elemen yang akan di-scroll: {len(place_elements)}")
+            def collect(count):
+                """Ekstrak kartu yang muncul sejak batch sebelumnya; True jika target max_results tercapai"""
+                if count < cursor[0]:
+                    # Feed di-render ulang: mulai dari awal, duplikat dilewati index dedup
+                    cursor[0] = 0
+                if cursor[0] < count:
+                    emit('loaded', count)
+                    metrics.seen(count)
+                    places, cursor[0] = self._extract_places_from(driver, min_rating, cursor[0])
+                    add_places(places)
+                    if checkpoint is not None:
+                        checkpoint.save(results=results)
+                    if incremental and not caught_up[0] and self._all_fresh(places, incremental_max_age):
+                        caught_up[0] = True
+                return target_reached() or caught_up[0]
             
-            # Scroll ke semua elemen, tidak ada batasan
-            for idx, elem in enumerate(place_elements):
+            if 'feed' in stages:
+                print(f"[INFO] Feed utama sudah selesai di checkpoint, dilanjutkan dari tahap berikutnya")
+            else:
+                metrics.mark('navigate')
+                wait = WebDriverWait(driver, 20)
+                if self.extraction_mode == 'network':
+                    # Buang log dari pencarian sebelumnya di driver pool yang sama
+                    self._read_performance_log(driver)
+                
+                # Buat URL berdasarkan koordinat atau location
+                url = self._build_search_url(query, location, lat, lng, radius_m)
+                if lat and lng:
+                    print(f"[INFO] Menggunakan koordinat: {lat}, {lng} dengan radius: {radius_m or 5000}m")
+                
+                print(f"[INFO] Membuka URL: {url}")
+                self._navigate(driver, url)
+                
+                # Tunggu hasil muncul
+                wait.until(EC.presence_of_element_located((By.TAG_NAME, "body")))
+                
+                # Tunggu sampai hasil pencarian muncul
                 try:
-                    driver.execute_script("arguments[0].scrollIntoView({block: 'center', behavior: 'smooth'});", elem)
-                    time.sleep(0.2)  # Sedikit lebih lama untuk memastikan loading
-                    if (idx + 1) % 25 == 0:
-                        print(f"[INFO] Scrolled to element {idx+1}/{len(place_elements)}")
+                    wait.until(EC.presence_of_element_located((By.CSS_SELECTOR, "div[role='article']")))
+                    print(f"[INFO] Hasil pencarian sudah muncul")
                 except:
-                    pass
-            
-            # Tunggu lagi untuk lazy loading
-            time.sleep(3)
-            
-            # Scroll sekali lagi ke bawah untuk memastikan semua ter-load
-            try:
-                sidebar = driver.find_element(By.CSS_SELECTOR, "div[role='feed']")
-                driver.execute_script("arguments[0].scrollTop = arguments[0].scrollHeight;", sidebar)
-                time.sleep(2)
-            except:
-                pass
-            
-            # Ambil ulang semua elemen setelah scroll individual
-            place_elements = driver.find_elements(By.CSS_SELECTOR, "div[role='article']")
-            print(f"[INFO] Setelah scroll individual: {len(place_elements)} elemen")
-            
-            # Ambil semua hasil yang sudah ter-load
-            print(f"[INFO] Mengekstrak data tempat...")
-            results = []
-            
-            # Jika tidak ada elemen dari scroll, coba ambil langsung
-            if len(place_elements) == 0:
-                place_elements = driver.find_elements(By.CSS_SELECTOR, "div[role='article']")
-                print(f"[INFO] Ditemukan {len(place_elements)} elemen tempat")
+                    print(f"[INFO] Menunggu hasil pencarian...")
+                    self._wait_for_feed_growth(driver, 0)
                 
-                # Jika masih tidak ada, coba selector alternatif
-                if len(place_elements) == 0:
+                # Scroll untuk memuat lebih banyak hasil; kartu diekstrak per batch selama scroll
+                # sehingga scroll berhenti begitu max_results tempat yang lolos filter terkumpul
+                metrics.mark('scroll')
+                print(f"[INFO] Scroll untuk memuat lebih banyak hasil...")
+                card_count = self._scroll_results(driver, max_results, on_batch=collect)
+                feed_complete[0] = self.feed_ended and max(card_count, cursor[0]) < FEED_CARD_LIMIT
+                
+                metrics.mark('extract')
+                if target_reached():
+                    print(f"[INFO] Target {max_results} tempat tercapai selama scroll")
+                elif caught_up[0]:
+                    print(f"[INFO] Incremental: batch terakhir hanya berisi tempat yang sudah di-refresh, scroll dihentikan")
+                elif card_count > 0:
+                    # Sisa kartu yang muncul setelah batch terakhir (termasuk yang tadinya belum ter-render)
+                    collect(card_count)
+                else:
+                    # Feed kosong: bisa berarti tidak ada hasil, atau halaman blokir/consent yang muncul
+                    # setelah navigasi (jangan disimpan ke cache sebagai "0 hasil")
+                    reason = detect_block_page(driver)
+                    if reason:
+                        self.scheduler.record_block(reason)
+                        raise BlockedError(reason, url)
+                    # Tidak ada kartu feed, coba selector alternatif
                     print(f"[INFO] Mencoba selector alternatif...")
-                    place_elements = driver.find_elements(By.CSS_SELECTOR, "a[href*='/maps/place/']")
-                    print(f"[INFO] Ditemukan {len(place_elements)} elemen dengan selector alternatif")
-            else:
-                print(f"[INFO] Total {len(place_elements)} elemen tempat ter-load")
-            
-            # Ekstrak data dari SEMUA elemen yang ter-load, bukan hanya max_results
-            # max_results hanya digunakan untuk filtering akhir jika diperlukan
-            total_to_process = len(place_elements)
-            print(f"[INFO] Memproses SEMUA {total_to_process} elemen yang ter-load...")
-            
-            # Set untuk deduplikasi berdasarkan nama
-            seen_names = set()
-            
-            for idx, element in enumerate(place_elements):
-                try:
-                    # Jika elemen adalah link, cari parent article
-                    if element.tag_name == 'a':
-                        try:
-                            # Cari parent dengan role='article'
-                            parent = element.find_element(By.XPATH, "./ancestor::div[@role='article']")
-                            if parent:
-                                element = parent
-                        except:
-                            # Jika tidak ada parent article, gunakan elemen asli
-                            pass
-                    
-                    place_data = self._extract_place_info(element, min_rating)
-                    if place_data:
-                        # Deduplikasi berdasarkan nama (case-insensitive)
-                        name_lower = place_data['name'].lower().strip()
-                        if name_lower not in seen_names:
-                            seen_names.add(name_lower)
-                            results.append(place_data)
-                            if (idx + 1) % 10 == 0:
-                                print(f"[INFO] Berhasil mengekstrak {idx+1}/{total_to_process}: {place_data['name']} (Rating: {place_data['rating']})")
-                        else:
-                            if (idx + 1) % 50 == 0:
-                                print(f"[INFO] Duplikat ditemukan dan diabaikan: {place_data['name']}")
-                    else:
-                        if (idx + 1) % 50 == 0:
-                            print(f"[INFO] Elemen {idx+1} tidak memenuhi kriteria (rating < min_rating atau tidak ada nama)")
-                except Exception as e:
-                    if (idx + 1) % 50 == 0:
-                        print(f"[GAGAL] Error extracting place info untuk elemen {idx+1}: {e}")
-                    continue
-            
-            print(f"[INFO] Berhasil mengekstrak {len(results)} tempat (setelah deduplikasi)")
-            
-            # Filter berdasarkan max_results jika diperlukan (setelah ekstraksi semua)
-            if max_results > 0 and len(results) > max_results:
-                print(f"[INFO] Membatasi hasil dari {len(results)} menjadi {max_results} sesuai max_results")
-                results = results[:max_results]
-            
-            # Jika hasil masih kurang dari yang diharapkan, coba teknik alternatif
-            # Perbaiki kondisi: tidak perlu batasan len(results) < 20, cukup cek apakah kurang dari max_results
-            if max_results > 0 and len(results) < max_results:
-                print(f"[INFO] Hasil ({len(results)}) kurang dari yang diharapkan ({max_results}), mencoba teknik alternatif...")
-                additional_results = self._try_alternative_scraping(driver, query, location, min_rating, seen_names)
-                for res in additional_results:
-                    name_lower = res['name'].lower().strip()
-                    if name_lower not in seen_names:
-                        seen_names.add(name_lower)
+                    link_elements = driver.find_elements(By.CSS_SELECTOR, "a[href*='/maps/place/']")
+                    print(f"[INFO] Ditemukan {len(link_elements)} elemen dengan selector alternatif")
+                    places, _ = self._extract_places_from(driver, min_rating, elements=link_elements)
+                    add_places(places)
+                emit('loaded', max(card_count, cursor[0]))
+                
+                print(f"[INFO] Berhasil mengekstrak {len(results)} tempat (setelah deduplikasi)")
+                
+                if caught_up[0]:
+                    # Sisa feed sudah tersimpan dan masih segar: teknik alternatif tidak perlu
+                    fallbacks = False
+                
+                # Jika hasil masih kurang dari yang diharapkan, coba teknik alternatif
+                # Perbaiki kondisi: tidak perlu batasan len(results) < 20, cukup cek apakah kurang dari max_results
+                if fallbacks and max_results > 0 and len(results) < max_results:
+                    metrics.mark('alternative')
+                    print(f"[INFO] Hasil ({len(results)}) kurang dari yang diharapkan ({max_results}), mencoba teknik alternatif...")
+                    # Hasil tambahan sudah didedup terhadap `seen` oleh _try_alternative_scraping
+                    additional_results = self._try_alternative_scraping(
+                        driver, query, location, min_rating, seen, target_count=max_results - len(results)
+                    )
+                    for res in additional_results:
                         results.append(res)
-                print(f"[INFO] Total hasil setelah teknik alternatif: {len(results)}")
+                        emit('place', res)
+                    print(f"[INFO] Total hasil setelah teknik alternatif: {len(results)}")
+                
+                    # Filter lagi jika melebihi max_results
+                    if len(results) > max_results:
+                        results = results[:max_results]
                 
-                # Filter lagi jika melebihi max_results
-                if len(results) > max_results:
-                    results = results[:max_results]
+                if checkpoint is not None:
+                    stages.append('feed')
+                    checkpoint.save(force=True, results=results, stages=stages, feed_complete=feed_complete[0])
             
             # Jika menggunakan koordinat dan hasil masih kurang, coba beberapa radius berbeda
-            if lat and lng and max_results > 0 and len(results) < max_results:
+            if fallbacks and lat and lng and max_results > 0 and len(results) < max_results:
+                metrics.mark('radii')
                 print(f"[INFO] Mencoba beberapa radius berbeda untuk mendapatkan lebih banyak hasil...")
-                additional_results = self._try_multiple_radii(driver, query, lat, lng, min_rating, seen_names, max_results - len(results))
+                
+                def radius_done(radius, additional):
+                    if checkpoint is not None:
+                        done_radii.add(radius)
+                        checkpoint.save(force=True, results=results + additional, radii=sorted(done_radii))
+                
+                additional_results = self._try_multiple_radii(driver, query, lat, lng, min_rating, seen,
+                                                              max_results - len(results), done_radii, radius_done)
                 results.extend(additional_results)
+                for res in additional_results:
+                    emit('place', res)
                 print(f"[INFO] Total hasil setelah mencoba multiple radius: {len(results)}")
             
+            metrics.mark(None)
+            # Coverage hanya jika seluruh feed terbaca: tidak terpotong max_results/incremental,
+            # penanda akhir daftar terlihat dan jumlah kartu di bawah batas feed Maps
+            self._store_places(results, query, lat, lng, coverage_radius_m or radius_m, min_rating,
+                               covered=feed_complete[0] and not caught_up[0] and not target_reached())
+            if use_cache and not caught_up[0]:
+                try:
+                    self.result_cache.put(results, loaded=metrics.elements_seen, **cache_args)
+                except Exception as e:
+                    print(f"[DEBUG] Gagal menyimpan cache: {e}")
+            if checkpoint is not None:
+                checkpoint.clear()
+            
             return results
             
+        except BlockedError as e:
+            failed = True
+            print(f"[GAGAL] {e}")
+            raise
         except Exception as e:
+            failed = True
             error_msg = str(e)
             print(f"[GAGAL] Error during scraping: {error_msg}")
             # Berikan pesan error yang lebih informatif
@@ -274,323 +722,304 @@ class GoogleMapsScraper:
             else:
                 raise Exception(f"Error saat scraping: {error_msg}")
         finally:
+            if failed and checkpoint is not None:
+                # Hasil yang sudah terkumpul tetap tersimpan untuk resume
+                checkpoint.save(force=True, results=results)
+            metrics.mark('driver_release')
+            self.scheduler.release_slot()
             if driver:
+                driver.scrape_metrics = None
+            if driver and self.driver_pool:
+                # Driver yang error dicek ulang oleh pool; yang rusak dibuang
+                self.driver_pool.release(driver, discard=failed and not self.driver_pool.is_healthy(driver))
+                print(f"[INFO] Chrome driver dikembalikan ke pool")
+            elif driver:
                 try:
                     driver.quit()
                     print(f"[INFO] Chrome driver ditutup")
                 except:
                     pass
+            emit('metrics', metrics.finish('error' if failed else 'ok', len(results)))
     
-    def _scroll_results(self, driver, max_results):
-        """Scroll sidebar untuk memuat lebih banyak hasil dengan teknik yang lebih efektif dan agresif"""
-        place_elements = []
+    def _get_engine(self, name):
+        if name not in self.engines:
+            if name != 'http':
+                raise ValueError(f"Engine tidak dikenal: {name}")
+            self.engines[name] = HttpEngine(base_url=self.base_url, scheduler=self.scheduler)
+        return self.engines[name]
+    
+    def _search_with_engine(self, engine, query, location, min_rating, max_results, lat, lng, radius_m,
+                            emit, metrics, cache_args=None, incremental_max_age=None, coverage_radius_m=None):
+        """search_places lewat engine non-browser: dedup, filter dan batas hasil sama dengan jalur Selenium"""
+        results = []
+        caught_up = False
+        # True jika halaman engine habis sendiri (bukan dihentikan max_results/incremental)
+        exhausted = False
+        seen = PlaceIndex()
+        loaded = 0
+        failed = False
+        name = getattr(engine, 'name', engine.__class__.__name__)
+        print(f"[INFO] Mencari '{query}' dengan engine {name}...")
+        self.scheduler.acquire_slot()
         try:
-            # Temukan sidebar hasil
-            sidebar = driver.find_element(By.CSS_SELECTOR, "div[role='feed']")
-            
-            # Scroll lebih agresif untuk memuat lebih banyak hasil
-            previous_count = 0
-            scroll_attempts = 0
-            no_change_count = 0
-            # Tingkatkan max_scroll_attempts untuk lebih agresif
-            max_scroll_attempts = max(100, max_results // 2) if max_results > 0 else 150
+            metrics.mark('fetch')
+            for page in engine.iter_pages(query, location, lat=lat, lng=lng, radius_m=radius_m):
+                metrics.mark('extract')
+                loaded += len(page)
+                metrics.seen(loaded)
+                emit('loaded', loaded)
+                for place in page:
+                    if (place.get('rating') or 0) < min_rating or not seen.add(place):
+                        continue
+                    results.append(place)
+                    emit('place', place)
+                    if max_results > 0 and len(results) >= max_results:
+                        break
+                if max_results > 0 and len(results) >= max_results:
+                    break
+                if incremental_max_age is not None and self._all_fresh(page, incremental_max_age):
+                    print(f"[INFO] Incremental: {len(page)} hasil terakhir sudah di-refresh, berhenti")
+                    caught_up = True
+                    break
+                metrics.mark('fetch')
+            else:
+                exhausted = True
+            metrics.mark(None)
+            print(f"[INFO] Engine {name}: {len(results)} tempat dari {loaded} hasil")
             
-            print(f"[INFO] Mulai scroll (maksimal {max_scroll_attempts} kali)...")
+            self._store_places(results, query, lat, lng, coverage_radius_m or radius_m, min_rating,
+                               covered=exhausted and loaded < FEED_CARD_LIMIT)
+            if cache_args is not None and not caught_up:
+                try:
+                    self.result_cache.put(results, loaded=metrics.elements_seen, **cache_args)
+                except Exception as e:
+                    print(f"[DEBUG] Gagal menyimpan cache: {e}")
+            return results
+        except BlockedError as e:
+            failed = True
+            print(f"[GAGAL] {e}")
+            raise
+        except Exception as e:
+            failed = True
+            print(f"[GAGAL] Error during scraping ({name}): {e}")
+            raise Exception(f"Error saat scraping: {e}")
+        finally:
+            self.scheduler.release_slot()
+            emit('metrics', metrics.finish('error' if failed else 'ok', len(results)))
+    
+    def _all_fresh(self, places, max_age):
+        """True jika semua tempat batch punya place_id dan sudah terlihat di place_store dalam max_age detik"""
+        ids = [place.get('place_id') for place in places]
+        if not ids or not all(ids):
+            return False
+        try:
+            return len(self.place_store.fresh_ids(ids, max_age)) == len(set(ids))
+        except Exception as e:
+            print(f"[DEBUG] Gagal membaca place store: {e}")
+            return False
+
+    def _store_places(self, results, query, lat=None, lng=None, radius_m=None, min_rating=0, covered=False):
+        """
+        Upsert hasil ke place_store (first_seen/last_seen, histori rating); gagal simpan tidak menggagalkan scraping
+
+        covered: pencarian koordinat yang membaca seluruh feed (tidak terpotong max_results,
+        incremental atau batas feed Maps); areanya dicatat sebagai coverage query ini sehingga
+        bisa dijawab dari index
+        """
+        if self.place_store is None:
+            return
+        try:
+            if results:
+                stats = self.place_store.upsert_many(results, query=query)
+                print(f"[INFO] Place store: {stats['new']} baru, {stats['changed']} berubah, {stats['unchanged']} tetap")
+            if covered and lat is not None and lng is not None:
+                self.place_store.record_coverage(query, lat, lng, radius_m or 5000, min_rating)
+        except Exception as e:
+            print(f"[DEBUG] Gagal menyimpan ke place store: {e}")
+
+    def _navigate(self, driver, url):
+        """driver.get lewat NavigationScheduler: laju dibatasi, halaman blokir dideteksi dan di-backoff"""
+        waited = self.scheduler.navigate(driver, url)
+        if self.metrics and waited > 0.001:
+            self.metrics.wait('throttle', waited)
+
+    def _build_search_url(self, query, location, lat=None, lng=None, radius_m=None):
+        """URL pencarian Maps; dengan koordinat memakai viewport /@lat,lng,{radius}m (default 5000m)"""
+        return build_search_url(self.base_url, query, location, lat, lng, radius_m)
+    
+    def _wait_for_feed_growth(self, driver, previous_count, timeout=None, scroll_from=None):
+        """
+        Tunggu sampai feed punya lebih dari previous_count kartu atau penanda akhir daftar muncul
+
+        Args:
+            scroll_from: Jika diisi, hover kartu mulai index ini dan scroll feed ke dasar dulu
+                         (dalam round trip yang sama)
+
+        Returns:
+            dict {'count', 'ended', 'timed_out', 'loading', 'at_bottom', 'more_button'};
+            timed_out berarti feed idle selama timeout, loading berarti spinner masih tampil
+        """
+        timeout = self.feed_idle_timeout if timeout is None else timeout
+        started = time.perf_counter()
+        result = None
+        try:
+            # Script timeout hanya dikirim ulang jika berubah (hemat satu perintah per tunggu)
+            script_timeout = timeout * 3 + 5
+            if getattr(driver, 'feed_script_timeout', None) != script_timeout:
+                driver.set_script_timeout(script_timeout)
+                driver.feed_script_timeout = script_timeout
+            result = driver.execute_async_script(WAIT_FOR_FEED_JS, previous_count, int(timeout * 1000), scroll_from)
+        except Exception as e:
+            print(f"[DEBUG] Gagal menunggu feed: {e}")
+        if not result:
+            try:
+                count = len(driver.find_elements(By.CSS_SELECTOR, "div[role='article']"))
+            except:
+                count = previous_count
+            result = {'count': count, 'ended': False, 'timed_out': True}
+        result.setdefault('loading', False)
+        result.setdefault('at_bottom', True)
+        result.setdefault('more_button', False)
+        if self.metrics:
+            outcome = 'ended' if result['ended'] else 'grew' if result['count'] > previous_count else 'timeout'
+            self.metrics.wait(outcome, time.perf_counter() - started)
+        return result
+    
+    def _scroll_results(self, driver, max_results, on_batch=None):
+        """
+        Scroll feed hasil sampai target tercapai atau daftar habis
+
+        Setiap langkah adalah satu round trip: hover kartu baru, scroll ke dasar feed, lalu tunggu
+        batch berikutnya secara event-driven. Waktu tunggu menyesuaikan laju feed (rata-rata
+        latensi per batch yang dipelajari), penanda akhir daftar langsung menghentikan scroll,
+        dan feed yang idle tanpa spinner di dasar daftar dianggap habis setelah satu konfirmasi.
+        Eskalasi (nudge, over-scroll, tombol End) hanya untuk feed yang macet saat lazy-load.
+
+        Args:
+            on_batch: Callable opsional on_batch(count) yang dipanggil setiap kali feed bertambah;
+                      jika mengembalikan True (target tercapai) scroll langsung berhenti. Tanpa
+                      on_batch, scroll berhenti saat jumlah kartu mencapai max_results.
+
+        Returns:
+            Jumlah kartu di feed setelah scroll; self.feed_ended True jika berhenti karena
+            penanda akhir daftar
+        """
+        self.feed_ended = False
+        try:
+            sidebar = driver.find_element(By.CSS_SELECTOR, "div[role='feed']")
+            count = driver.execute_script(COUNT_CARDS_JS) or 0
+            if on_batch and count and on_batch(count):
+                print(f"[INFO] Target tercapai dari halaman pertama, tidak perlu scroll")
+                return count
             
-            # Teknik khusus: scroll ke setiap elemen secara individual untuk memicu loading
-            def scroll_to_each_element(elements, start_idx=0):
-                """Scroll ke setiap elemen secara individual"""
-                for idx, elem in enumerate(elements[start_idx:], start=start_idx):
-                    try:
-                        # Scroll ke elemen dengan berbagai teknik
-                        driver.execute_script("arguments[0].scrollIntoView({block: 'center', behavior: 'smooth'});", elem)
-                        time.sleep(0.5)  # Delay untuk lazy loading
-                        
-                        # Coba klik elemen untuk memicu loading lebih banyak data
-                        try:
-                            # Hover dulu
-                            driver.execute_script("arguments[0].dispatchEvent(new MouseEvent('mouseover', {bubbles: true}));", elem)
-                            time.sleep(0.2)
-                        except:
-                            pass
-                        
-                        # Setiap 10 elemen, cek apakah ada elemen baru
-                        if (idx + 1) % 10 == 0:
-                            new_elements = driver.find_elements(By.CSS_SELECTOR, "div[role='article']")
-                            if len(new_elements) > len(elements):
-                                print(f"[INFO] Setelah scroll ke elemen {idx+1}, ditemukan {len(new_elements)} elemen total")
-                                return new_elements
-                    except Exception as e:
-                        print(f"[DEBUG] Error scrolling to element {idx}: {e}")
-                        continue
-                return elements
+            # Batas pengaman saja; scroll normalnya berhenti karena target, penanda akhir atau feed habis
+            max_steps = max(30, max_results // 5) if max_results > 0 else 200
+            # Laju feed yang dipelajari (rata-rata bergerak): kartu per batch dan detik per batch
+            batch_size = None
+            batch_seconds = None
+            # Kartu dengan index < hovered sudah di-hover (setiap kartu sekali)
+            hovered = 0
+            idle_checks = 0
+            stalls = 0
+            steps = 0
+            print(f"[INFO] Mulai scroll adaptif ({count} kartu awal)...")
             
-            while scroll_attempts < max_scroll_attempts:
-                # Teknik 1: Scroll bertahap dengan lebih banyak step
-                scroll_position = driver.execute_script("return arguments[0].scrollTop;", sidebar)
-                scroll_height = driver.execute_script("return arguments[0].scrollHeight;", sidebar)
-                client_height = driver.execute_script("return arguments[0].clientHeight;", sidebar)
-                
-                # Scroll incremental dengan lebih banyak step untuk memicu lazy loading
-                steps = 10  # Tingkatkan dari 5 ke 10
-                step_size = max(200, (scroll_height - scroll_position) // steps) if scroll_height > scroll_position else 400
-                
-                for i in range(steps):
-                    new_position = scroll_position + (i + 1) * step_size
-                    driver.execute_script(
-                        f"arguments[0].scrollTop = {new_position};", 
-                        sidebar
-                    )
-                    time.sleep(1.0)  # Tingkatkan delay untuk lazy loading
-                
-                # Teknik 2: Scroll ke bawah penuh
-                driver.execute_script(
-                    "arguments[0].scrollTop = arguments[0].scrollHeight;", 
-                    sidebar
-                )
-                time.sleep(3.0)  # Tingkatkan delay
-                
-                # Teknik 3: Scroll naik-turun untuk memicu loading
-                driver.execute_script(
-                    "arguments[0].scrollTop = arguments[0].scrollHeight - 1000;", 
-                    sidebar
-                )
-                time.sleep(1.5)
-                driver.execute_script(
-                    "arguments[0].scrollTop = arguments[0].scrollHeight;", 
-                    sidebar
-                )
-                time.sleep(2.0)
-                
-                # Teknik 4: Scroll ke setiap elemen yang sudah ter-load secara individual
-                current_elements = driver.find_elements(By.CSS_SELECTOR, "div[role='article']")
-                if len(current_elements) > previous_count:
-                    print(f"[INFO] Ditemukan {len(current_elements)} elemen, scroll ke setiap elemen baru...")
-                    # Scroll ke elemen baru secara individual
-                    current_elements = scroll_to_each_element(current_elements, previous_count)
+            while steps < max_steps:
+                steps += 1
+                if stalls:
+                    timeout = self.feed_idle_timeout
+                elif batch_seconds is None:
+                    timeout = min(self.feed_idle_timeout, 3.0)
+                else:
+                    # Cukup longgar untuk batch yang sedikit lebih lambat dari biasanya
+                    timeout = min(self.feed_idle_timeout, max(1.0, batch_seconds * 2.5 + 0.3))
+                started = time.perf_counter()
+                state = self._wait_for_feed_growth(driver, count, timeout=timeout, scroll_from=hovered)
+                elapsed = time.perf_counter() - started
+                hovered = count
                 
-                # Teknik 5: Scroll ke semua elemen secara individual (setiap 5 scroll attempts)
-                if scroll_attempts % 5 == 0 and len(current_elements) > 0:
-                    print(f"[INFO] Scroll periodik ke semua elemen ({len(current_elements)} elemen)...")
-                    current_elements = scroll_to_each_element(current_elements, 0)
+                if state['count'] < count:
+                    # Feed di-render ulang: hitung ulang dari jumlah saat ini
+                    count = hovered = state['count']
+                    continue
                 
-                # Cek jumlah elemen yang sudah ter-load
-                current_elements = driver.find_elements(By.CSS_SELECTOR, "div[role='article']")
-                current_count = len(current_elements)
+                if state['count'] > count:
+                    grew = state['count'] - count
+                    batch_size = grew if batch_size is None else 0.7 * batch_size + 0.3 * grew
+                    batch_seconds = elapsed if batch_seconds is None else 0.7 * batch_seconds + 0.3 * elapsed
+                    count = state['count']
+                    idle_checks = 0
+                    stalls = 0
+                    print(f"[INFO] Scroll {steps}: {count} kartu (+{grew}, {elapsed:.1f}s; "
+                          f"rata-rata {batch_size:.0f} kartu/{batch_seconds:.1f}s)")
+                    if on_batch and on_batch(count):
+                        print(f"[INFO] Target tercapai dengan {count} kartu, berhenti scroll")
+                        return count
+                    if not on_batch and max_results > 0 and count >= max_results:
+                        print(f"[INFO] Sudah mencapai target {max_results} hasil")
+                        return count
+                    if state['ended']:
+                        print(f"[INFO] Penanda akhir daftar ditemukan, total {count} kartu")
+                        self.feed_ended = True
+                        return count
+                    continue
                 
-                scroll_attempts += 1
+                if state['ended']:
+                    print(f"[INFO] Penanda akhir daftar ditemukan, total {count} kartu")
+                    self.feed_ended = True
+                    return count
                 
-                # Jika tidak ada perubahan
-                if current_count == previous_count:
-                    no_change_count += 1
-                    
-                    # Coba berbagai teknik untuk memuat lebih banyak hasil
-                    if no_change_count <= 3:
-                        # Scroll dengan smooth scroll
-                        driver.execute_script(
-                            "arguments[0].scrollTo({top: arguments[0].scrollHeight, behavior: 'smooth'});", 
-                            sidebar
-                        )
-                        time.sleep(3.0)
-                    elif no_change_count <= 6:
-                        # Scroll lebih jauh
-                        driver.execute_script(
-                            "arguments[0].scrollTop = arguments[0].scrollHeight + 3000;", 
-                            sidebar
-                        )
-                        time.sleep(3.0)
-                    elif no_change_count <= 9:
-                        # Coba klik beberapa elemen terakhir untuk memicu loading
-                        try:
-                            if current_elements:
-                                # Klik 3 elemen terakhir
-                                for i in range(min(3, len(current_elements))):
-                                    try:
-                                        last_elem = current_elements[-(i+1)]
-                                        driver.execute_script("arguments[0].scrollIntoView({block: 'end'});", last_elem)
-                                        time.sleep(0.5)
-                                        try:
-                                            last_elem.click()
-                                            time.sleep(1.5)
-                                        except:
-                                            pass
-                                    except:
-                                        continue
-                        except:
-                            pass
-                    elif no_change_count <= 12:
-                        # Coba klik tombol "Show more" atau "Load more" dengan berbagai selector
-                        try:
-                            before_count = len(driver.find_elements(By.CSS_SELECTOR, "div[role='article']"))
-                            
-                            show_more_selectors = [
-                                "button[aria-label*='more']",
-                                "button[aria-label*='More']",
-                                "button[aria-label*='Tampilkan']",
-                                "button[aria-label*='tampilkan']",
-                                "div[role='button'][aria-label*='more']",
-                                "div[role='button'][aria-label*='More']",
-                                "a[aria-label*='more']",
-                                "a[aria-label*='More']",
-                                "button[jsaction*='pane.pagination.next']"
-                            ]
-                            
-                            for selector in show_more_selectors:
-                                try:
-                                    buttons = driver.find_elements(By.CSS_SELECTOR, selector)
-                                    for btn in buttons:
-                                        try:
-                                            if btn.is_displayed() and btn.is_enabled():
-                                                print(f"[INFO] Menemukan tombol 'Show more' dengan selector: {selector}")
-                                                btn.click()
-                                                time.sleep(4)
-                                                
-                                                after_count = len(driver.find_elements(By.CSS_SELECTOR, "div[role='article']"))
-                                                if after_count > before_count:
-                                                    print(f"[INFO] Tombol berhasil memuat {after_count - before_count} elemen baru")
-                                                    no_change_count = 0
-                                                    break
-                                        except:
-                                            continue
-                                    if no_change_count == 0:
-                                        break
-                                except:
-                                    continue
-                        except Exception as e:
-                            print(f"[DEBUG] Error mencari tombol show more: {e}")
-                    elif no_change_count <= 15:
-                        # Coba scroll dengan keyboard (Page Down, END)
-                        try:
-                            sidebar.send_keys(Keys.PAGE_DOWN)
-                            time.sleep(2)
-                            sidebar.send_keys(Keys.PAGE_DOWN)
-                            time.sleep(2)
-                            sidebar.send_keys(Keys.END)
-                            time.sleep(3)
-                        except:
-                            pass
-                    else:
-                        # Coba cari dan klik elemen dengan text "Show more" menggunakan XPath
-                        try:
-                            xpath_selectors = [
-                                "//button[contains(translate(text(), 'ABCDEFGHIJKLMNOPQRSTUVWXYZ', 'abcdefghijklmnopqrstuvwxyz'), 'more')]",
-                                "//button[contains(translate(text(), 'ABCDEFGHIJKLMNOPQRSTUVWXYZ', 'abcdefghijklmnopqrstuvwxyz'), 'tampilkan')]",
-                                "//button[contains(translate(text(), 'ABCDEFGHIJKLMNOPQRSTUVWXYZ', 'abcdefghijklmnopqrstuvwxyz'), 'load')]",
-                                "//div[@role='button'][contains(translate(text(), 'ABCDEFGHIJKLMNOPQRSTUVWXYZ', 'abcdefghijklmnopqrstuvwxyz'), 'more')]",
-                                "//a[contains(translate(text(), 'ABCDEFGHIJKLMNOPQRSTUVWXYZ', 'abcdefghijklmnopqrstuvwxyz'), 'more')]"
-                            ]
-                            
-                            for xpath in xpath_selectors:
-                                try:
-                                    buttons = driver.find_elements(By.XPATH, xpath)
-                                    for btn in buttons:
-                                        try:
-                                            if btn.is_displayed() and btn.is_enabled():
-                                                print(f"[INFO] Menemukan tombol 'Show more' dengan XPath")
-                                                btn.click()
-                                                time.sleep(4)
-                                                no_change_count = 0
-                                                break
-                                        except:
-                                            continue
-                                    if no_change_count == 0:
-                                        break
-                                except:
-                                    continue
-                            
-                            # Jika XPath tidak berhasil, coba dengan text biasa
-                            if no_change_count > 0:
-                                all_buttons = driver.find_elements(By.TAG_NAME, "button")
-                                for btn in all_buttons:
-                                    try:
-                                        if not btn.is_displayed():
-                                            continue
-                                        btn_text = btn.text.lower()
-                                        if 'more' in btn_text or 'tampilkan' in btn_text or 'load' in btn_text:
-                                            print(f"[INFO] Menemukan tombol dengan text: {btn.text}")
-                                            btn.click()
-                                            time.sleep(4)
-                                            no_change_count = 0
-                                            break
-                                    except:
-                                        continue
-                        except Exception as e:
-                            print(f"[DEBUG] Error mencari tombol: {e}")
-                            pass
-                    
-                    # Jika tidak ada perubahan setelah banyak percobaan, coba teknik terakhir
-                    if no_change_count > 20:
-                        print(f"[INFO] Tidak ada hasil baru setelah {scroll_attempts} scroll (no change: {no_change_count})")
-                        # Coba scroll ke setiap elemen sekali lagi
-                        try:
-                            all_elements = driver.find_elements(By.CSS_SELECTOR, "div[role='article']")
-                            print(f"[INFO] Mencoba scroll ke semua {len(all_elements)} elemen sekali lagi...")
-                            for elem in all_elements:
-                                try:
-                                    driver.execute_script("arguments[0].scrollIntoView({block: 'center'});", elem)
-                                    time.sleep(0.3)
-                                except:
-                                    pass
-                            time.sleep(3)
-                            final_elements = driver.find_elements(By.CSS_SELECTOR, "div[role='article']")
-                            if len(final_elements) > current_count:
-                                current_count = len(final_elements)
-                                no_change_count = 0
-                                print(f"[INFO] Setelah scroll ulang, ditemukan {current_count} elemen")
-                            else:
-                                print(f"[INFO] Tidak ada elemen baru setelah scroll ulang. Total: {current_count}")
-                                break
-                        except:
-                            break
-                else:
-                    no_change_count = 0  # Reset counter jika ada perubahan
-                    print(f"[INFO] Scroll {scroll_attempts}: Ditemukan {current_count} elemen (bertambah {current_count - previous_count})")
+                if state['more_button']:
+                    # Feed dengan tombol "more" (bukan lazy-load): klik lalu tunggu batch berikutnya
+                    if driver.execute_script(CLICK_MORE_JS):
+                        print(f"[INFO] Klik tombol 'more' untuk memuat hasil berikutnya")
+                        continue
                 
-                previous_count = current_count
+                if not state['loading'] and state['at_bottom']:
+                    # Di dasar feed tanpa spinner dan tidak ada kartu baru: daftar habis.
+                    # Konfirmasi sekali (scroll naik-turun) supaya batch yang telat tidak terlewat.
+                    idle_checks += 1
+                    if idle_checks >= 2:
+                        print(f"[INFO] Feed tidak bertambah dan tidak memuat lagi, total {count} kartu")
+                        return count
+                    driver.execute_script(NUDGE_FEED_JS)
+                    continue
                 
-                # Jika sudah mencapai max_results dan max_results > 0, stop
-                if max_results > 0 and current_count >= max_results:
-                    print(f"[INFO] Sudah mencapai target {max_results} hasil")
-                    break
-            
-            # Tunggu lebih lama untuk memastikan semua konten ter-load
-            time.sleep(3)
-            
-            # Scroll sekali lagi ke semua elemen untuk memastikan semua ter-load
-            try:
-                all_elements = driver.find_elements(By.CSS_SELECTOR, "div[role='article']")
-                print(f"[INFO] Final scroll ke semua {len(all_elements)} elemen...")
-                for elem in all_elements:
+                # Macet saat lazy-load (spinner masih tampil / belum di dasar feed): eskalasi singkat
+                stalls += 1
+                if stalls == 1:
+                    driver.execute_script(NUDGE_FEED_JS)
+                elif stalls == 2:
+                    driver.execute_script(OVERSCROLL_FEED_JS)
+                elif stalls == 3:
                     try:
-                        driver.execute_script("arguments[0].scrollIntoView({block: 'center'});", elem)
-                        time.sleep(0.2)
+                        sidebar.send_keys(Keys.END)
                     except:
-                        pass
-                time.sleep(2)
-                
-                # Scroll ke bawah sekali lagi
-                driver.execute_script("arguments[0].scrollTop = arguments[0].scrollHeight;", sidebar)
-                time.sleep(2)
-            except:
-                pass
-            
-            # Ambil semua elemen yang ter-load
-            place_elements = driver.find_elements(By.CSS_SELECTOR, "div[role='article']")
-            print(f"[INFO] Total {len(place_elements)} elemen setelah scroll")
+                        driver.execute_script(OVERSCROLL_FEED_JS)
+                else:
+                    print(f"[INFO] Feed macet setelah {stalls - 1} percobaan, berhenti dengan {count} kartu")
+                    return count
+                print(f"[INFO] Feed belum bertambah (loading: {state['loading']}), percobaan {stalls}")
             
-            return place_elements
+            print(f"[INFO] Batas {max_steps} langkah scroll tercapai, total {count} kartu")
+            return count
             
         except Exception as e:
             print(f"[GAGAL] Error scrolling: {e}")
-            # Coba ambil elemen yang sudah ter-load
+            # Coba hitung elemen yang sudah ter-load
             try:
-                place_elements = driver.find_elements(By.CSS_SELECTOR, "div[role='article']")
-                return place_elements
+                return driver.execute_script(COUNT_CARDS_JS) or 0
             except:
-                return []
+                return 0
     
-    def _try_multiple_radii(self, driver, query, lat, lng, min_rating, seen_names, target_count):
-        """Mencoba beberapa radius berbeda untuk mendapatkan lebih banyak hasil"""
+    def _try_multiple_radii(self, driver, query, lat, lng, min_rating, seen, target_count, done_radii=(),
+                            on_radius_done=None):
+        """
+        Mencoba beberapa radius berbeda untuk mendapatkan lebih banyak hasil
+
+        Radius di done_radii dilewati (resume dari checkpoint); on_radius_done(radius, hasil_tambahan)
+        dipanggil setelah setiap radius selesai
+        """
         additional_results = []
         try:
             # Daftar radius yang akan dicoba (dalam meter)
@@ -601,16 +1030,18 @@ class GoogleMapsScraper:
             for radius in radii:
                 if len(additional_results) >= target_count:
                     break
+                if radius in done_radii:
+                    print(f"[INFO] Radius {radius}m sudah selesai di checkpoint, dilewati")
+                    continue
                     
                 try:
                     print(f"[INFO] Mencoba radius {radius}m...")
                     
                     # Buat URL dengan radius baru
-                    url = f"https://www.google.com/maps/search/{query.replace(' ', '+')}/@{lat},{lng},{radius}m/data=!3m2!1e3!4b1?entry=ttu"
-                    driver.get(url)
+                    url = self._build_search_url(query, '', lat, lng, radius)
+                    self._navigate(driver, url)
                     
                     # Tunggu hasil muncul
-                    time.sleep(3)
                     try:
                         WebDriverWait(driver, 10).until(
                             EC.presence_of_element_located((By.CSS_SELECTOR, "div[role='article']"))
@@ -622,30 +1053,32 @@ class GoogleMapsScraper:
                     try:
                         sidebar = driver.find_element(By.CSS_SELECTOR, "div[role='feed']")
                         for _ in range(3):
+                            count = len(driver.find_elements(By.CSS_SELECTOR, "div[role='article']"))
                             driver.execute_script("arguments[0].scrollTop = arguments[0].scrollHeight;", sidebar)
-                            time.sleep(1.5)
+                            growth = self._wait_for_feed_growth(driver, count)
+                            if growth['ended'] or growth['timed_out']:
+                                break
                     except:
                         pass
                     
                     # Ambil elemen
-                    place_elements = driver.find_elements(By.CSS_SELECTOR, "div[role='article']")
-                    print(f"[INFO] Radius {radius}m: Ditemukan {len(place_elements)} elemen")
+                    print(f"[INFO] Radius {radius}m: Ditemukan {driver.execute_script(COUNT_CARDS_JS)} elemen")
                     
-                    # Ekstrak data
-                    for elem in place_elements:
-                        try:
-                            place_data = self._extract_place_info(elem, min_rating)
-                            if place_data:
-                                name_lower = place_data['name'].lower().strip()
-                                if name_lower not in seen_names:
-                                    seen_names.add(name_lower)
-                                    additional_results.append(place_data)
-                                    print(f"[INFO] Berhasil mengekstrak dari radius {radius}m: {place_data['name']}")
-                                    if len(additional_results) >= target_count:
-                                        break
-                        except:
-                            continue
+                    # Ekstrak data (massal jika bisa, fallback per elemen)
+                    places, _ = self._extract_places_from(driver, min_rating)
+                    for place_data in places:
+                        if seen.add(place_data):
+                            additional_results.append(place_data)
+                            print(f"[INFO] Berhasil mengekstrak dari radius {radius}m: {place_data['name']}")
+                            if len(additional_results) >= target_count:
+                                break
+                    if on_radius_done:
+                        on_radius_done(radius, additional_results)
                     
+                except BlockedError as e:
+                    # Radius berikutnya hanya akan diblokir lagi; pakai hasil yang sudah ada
+                    print(f"[GAGAL] Multiple radius dihentikan: {e}")
+                    break
                 except Exception as e:
                     print(f"[DEBUG] Error dengan radius {radius}m: {e}")
                     continue
@@ -657,8 +1090,8 @@ class GoogleMapsScraper:
             print(f"[GAGAL] Error dalam multiple radius: {e}")
             return []
     
-    def _try_alternative_scraping(self, driver, query, location, min_rating, seen_names):
-        """Mencoba teknik alternatif untuk mendapatkan lebih banyak hasil"""
+    def _try_alternative_scraping(self, driver, query, location, min_rating, seen, target_count=0):
+        """Mencoba teknik alternatif untuk mendapatkan lebih banyak hasil (berhenti setelah target_count, 0 = semua)"""
         additional_results = []
         try:
             print(f"[INFO] Mencoba teknik alternatif: mengklik marker di peta...")
@@ -675,9 +1108,13 @@ class GoogleMapsScraper:
                 
                 # Klik beberapa marker untuk memuat lebih banyak hasil di sidebar
                 for i, marker in enumerate(markers[:10]):  # Batasi 10 marker
+                    if target_count and len(additional_results) >= target_count:
+                        break
                     try:
                         marker.click()
                         time.sleep(1.5)
+                        if self.metrics:
+                            self.metrics.wait('sleep', 1.5)
                         
                         # Cek apakah ada elemen baru di sidebar
                         new_elements = driver.find_elements(By.CSS_SELECTOR, "div[role='article']")
@@ -687,9 +1124,7 @@ class GoogleMapsScraper:
                                 try:
                                     place_data = self._extract_place_info(new_elements[-1], min_rating)
                                     if place_data:
-                                        name_lower = place_data['name'].lower().strip()
-                                        if name_lower not in seen_names:
-                                            seen_names.add(name_lower)
+                                        if seen.add(place_data):
                                             additional_results.append(place_data)
                                             print(f"[INFO] Berhasil mengekstrak dari marker: {place_data['name']}")
                                 except:
@@ -700,21 +1135,17 @@ class GoogleMapsScraper:
                 # Setelah klik marker, coba scroll lagi
                 try:
                     sidebar = driver.find_element(By.CSS_SELECTOR, "div[role='feed']")
+                    before_count = len(driver.find_elements(By.CSS_SELECTOR, "div[role='article']"))
                     driver.execute_script("arguments[0].scrollTop = arguments[0].scrollHeight;", sidebar)
-                    time.sleep(2)
+                    self._wait_for_feed_growth(driver, before_count)
                     
                     # Ambil elemen baru
-                    all_elements = driver.find_elements(By.CSS_SELECTOR, "div[role='article']")
-                    for elem in all_elements:
-                        try:
-                            place_data = self._extract_place_info(elem, min_rating)
-                            if place_data:
-                                name_lower = place_data['name'].lower().strip()
-                                if name_lower not in seen_names:
-                                    seen_names.add(name_lower)
-                                    additional_results.append(place_data)
-                        except:
-                            continue
+                    places, _ = self._extract_places_from(driver, min_rating)
+                    for place_data in places:
+                        if target_count and len(additional_results) >= target_count:
+                            break
+                        if seen.add(place_data):
+                            additional_results.append(place_data)
                 except:
                     pass
                     
@@ -728,6 +1159,225 @@ class GoogleMapsScraper:
             print(f"[GAGAL] Error dalam teknik alternatif: {e}")
             return []
     
+    def _extract_places_bulk(self, driver, min_rating, start_index=0):
+        """
+        Ekstrak kartu hasil mulai start_index dengan satu round trip WebDriver
+
+        Returns:
+            (places, next_index): places sudah difilter min_rating, atau None jika ekstraksi massal
+            gagal / tidak menemukan kartu sehingga caller harus fallback ke _extract_place_info.
+            next_index adalah cursor untuk batch berikutnya; kartu yang belum ter-render (belum
+            ada link/nama) tidak dilewati supaya diekstrak di batch berikutnya.
+        """
+        try:
+            payload = json.loads(driver.execute_script(BULK_EXTRACT_JS, start_index))
+        except Exception as e:
+            print(f"[DEBUG] Ekstraksi massal gagal, fallback ke per elemen: {e}")
+            return None, start_index
+        
+        cards = payload.get('cards', [])
+        if payload.get('total', 0) == 0:
+            return None, start_index
+        
+        places = []
+        parsed = 0
+        next_index = payload['total']
+        for card in cards:
+            if not (card.get('link') or card.get('label') or card.get('heading')):
+                next_index = card.get('index', next_index)
+                break
+            parsed += 1
+            place_data = self._parse_bulk_card(card, min_rating)
+            if place_data:
+                places.append(place_data)
+        
+        # Tidak ada satupun nama yang terbaca padahal tidak ada filter rating: markup kemungkinan berubah
+        if not places and parsed and min_rating <= 0:
+            print(f"[DEBUG] Ekstraksi massal tidak menghasilkan data dari {parsed} kartu, fallback ke per elemen")
+            return None, start_index
+        
+        print(f"[INFO] Ekstraksi massal: {len(places)} tempat dari {parsed} kartu (index {start_index}-{next_index})")
+        return places, next_index
+    
+    def _extract_places_from(self, driver, min_rating, start=0, elements=None):
+        """
+        Ekstrak tempat dari kartu feed mulai index start sesuai extraction_mode
+
+        'bulk'/'network' memakai satu execute_script (ditambah response XHR untuk 'network');
+        jika ekstraksi massal gagal, fallback ke _extract_place_info per elemen. `elements`
+        opsional untuk elemen hasil selector lain (mis. link tempat).
+
+        Returns:
+            (places, next_index) dengan next_index = cursor untuk batch berikutnya
+        """
+        places = None
+        next_index = start
+        if elements is None and self.extraction_mode in ('bulk', 'network'):
+            places, next_index = self._extract_places_bulk(driver, min_rating, start_index=start)
+        if self.extraction_mode == 'network':
+            network_places = self._extract_places_network(driver, min_rating)
+            if network_places:
+                places = self._merge_network_places(network_places, places)
+        if places is not None:
+            return places, next_index
+        
+        if elements is None:
+            # Hanya kartu baru yang diambil dari browser, bukan seluruh feed
+            elements = driver.execute_script(NEW_CARDS_JS, start) or []
+        else:
+            elements = elements[start:]
+        places = []
+        for idx, element in enumerate(elements, start=start):
+            try:
+                # Jika elemen adalah link (selector alternatif), cari parent article
+                if element.tag_name == 'a':
+                    try:
+                        element = element.find_element(By.XPATH, "./ancestor::div[@role='article']")
+                    except:
+                        pass
+                place_data = self._extract_place_info(element, min_rating)
+                if place_data:
+                    places.append(place_data)
+            except Exception as e:
+                if (idx + 1) % 50 == 0:
+                    print(f"[GAGAL] Error extracting place info untuk elemen {idx+1}: {e}")
+        return places, start + len(elements)
+    
+    def _read_performance_log(self, driver):
+        """Ambil (dan kosongkan) performance log chromedriver; None jika tidak diaktifkan"""
+        try:
+            return driver.get_log('performance')
+        except Exception as e:
+            print(f"[DEBUG] Performance log tidak tersedia: {e}")
+            return None
+    
+    def _extract_places_network(self, driver, min_rating):
+        """
+        Ekstrak tempat dari response XHR pencarian Maps yang tertangkap di performance log
+
+        Returns:
+            List of dict tempat (urut sesuai response), atau None jika tidak ada response
+            pencarian yang tertangkap/ter-parse sehingga caller memakai hasil DOM saja
+        """
+        entries = self._read_performance_log(driver)
+        if entries is None:
+            return None
+        
+        request_ids = []
+        for entry in entries:
+            try:
+                message = json.loads(entry['message'])['message']
+            except Exception:
+                continue
+            if message.get('method') != 'Network.responseReceived':
+                continue
+            params = message.get('params', {})
+            if is_search_payload_url(params.get('response', {}).get('url')):
+                request_ids.append(params.get('requestId'))
+        
+        places = []
+        parsed = 0
+        for request_id in request_ids:
+            try:
+                body = driver.execute_cdp_cmd('Network.getResponseBody', {'requestId': request_id})
+            except Exception as e:
+                print(f"[DEBUG] Body response {request_id} tidak tersedia: {e}")
+                continue
+            page = parse_search_payload(body.get('body'), min_rating, self.base_url)
+            if page is None:
+                continue
+            parsed += 1
+            places.extend(page)
+        
+        if not parsed:
+            return None
+        print(f"[INFO] Ekstraksi network: {len(places)} tempat dari {parsed} response pencarian")
+        return places
+    
+    def _merge_network_places(self, network_places, dom_places):
+        """
+        Gabungkan hasil network dengan hasil DOM mengikuti urutan feed
+
+        Data network (koordinat, rating presisi) menggantikan kartu DOM dengan place_id sama;
+        kartu yang hanya ada di DOM (mis. halaman pertama yang di-render langsung di HTML)
+        tetap dipakai, dan tempat yang hanya ada di network ditambahkan di akhir.
+        """
+        by_id = {place['place_id']: place for place in network_places if place.get('place_id')}
+        merged = []
+        for place in dom_places or []:
+            merged.append(by_id.pop(place.get('place_id'), place) if place.get('place_id') else place)
+        merged.extend(place for place in network_places if place.get('place_id') in by_id)
+        return merged
+    
+    def _parse_bulk_card(self, card, min_rating):
+        """Parse satu kartu hasil BULK_EXTRACT_JS menjadi dict yang sama dengan _extract_place_info"""
+        text = card.get('text') or ''
+        text_lines = [line.strip() for line in text.split('\n') if line.strip()]
+        
+        # Nama: aria-label kartu, lalu heading, lalu baris pertama yang bukan rating/review
+        name = (card.get('label') or card.get('heading') or '').strip()
+        if not name:
+            for line in text_lines[:5]:
+                if len(line) < 200 and \
+                   not re.search(r'^\d+[.,]\d+\s*(?:star|bintang)', line, re.IGNORECASE) and \
+                   not re.search(r'\d+\s*(?:review|ulasan)', line, re.IGNORECASE):
+                    name = line
+                    break
+        if not name or len(name) >= 200:
+            return None
+        
+        # Rating: dari aria-label ("4,5 bintang 1.234 ulasan"), lalu dari text kartu ("4.5(1,234)")
+        rating = 0.0
+        rating_label = card.get('rating_label') or ''
+        rating_match = re.search(r'(\d+[.,]\d+|\d+)', rating_label)
+        if not rating_match:
+            rating_match = re.search(r'^(\d[.,]\d)\s*\(', text, re.MULTILINE)
+        if rating_match:
+            rating_val = float(rating_match.group(1).replace(',', '.'))
+            if 0 <= rating_val <= 5:
+                rating = rating_val
+        
+        if rating < min_rating:
+            return None
+        
+        # Jumlah review
+        review_count = 0
+        review_source = ' '.join([card.get('review_label') or '', rating_label])
+        review_match = re.search(r'(\d[\d.,]*)\s*(?:review|ulasan)', review_source, re.IGNORECASE)
+        if not review_match:
+            review_match = re.search(r'\d[.,]\d\s*\(([\d.,]+)\)', text)
+        if review_match:
+            review_count = int(re.sub(r'[.,]', '', review_match.group(1)) or 0)
+        
+        # Kategori dan alamat: baris "Kafe · $$ · Jl. Malioboro No. 1"
+        category = "N/A"
+        address = "N/A"
+        for line in (card.get('lines') or []) + text_lines:
+            parts = [part.strip() for part in re.split(r'\s*[·⋅]\s*', line) if part.strip()]
+            if len(parts) < 2:
+                continue
+            if not parts or re.match(r'(?:buka|tutup|open|closed|closes|opens)\b', parts[0], re.IGNORECASE):
+                continue
+            parts = [part for part in parts if not re.match(r'^(?:Rp|[$€£])?[\s\d$€£.,–-]*$', part)]
+            if not parts or re.search(r'(?:review|ulasan|star|bintang)', parts[0], re.IGNORECASE) or re.match(r'^\d', parts[0]):
+                continue
+            if category == "N/A" and len(parts[0]) < 100:
+                category = parts[0]
+            if address == "N/A" and len(parts) > 1 and len(parts[-1]) > 3:
+                address = parts[-1]
+            if category != "N/A" and address != "N/A":
+                break
+        
+        return {
+            'name': name,
+            'rating': rating,
+            'review_count': review_count,
+            'category': category,
+            'address': address,
+            'link': card.get('link') or '',
+            **parse_place_link(card.get('link'))
+        }
+    
     def _extract_place_info(self, element, min_rating):
         """Ekstrak informasi dari elemen tempat dengan teknik yang lebih robust"""
         try:
@@ -985,7 +1635,8 @@ class GoogleMapsScraper:
                 'review_count': review_count,
                 'category': category.strip() if category != "N/A" else "N/A",
                 'address': address.strip() if address != "N/A" else "N/A",
-                'link': link
+                'link': link,
+                **parse_place_link(link)
             }
             
         except Exception as e:
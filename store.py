@@ -0,0 +1,490 @@
+import hashlib
+import json
+import math
+import os
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+
+from cache import normalize_search_key
+from places import place_key
+from tiling import bbox_from_center
+
+# Field yang dibandingkan untuk menentukan tempat berubah (selain rating/ulasan yang punya histori)
+CONTENT_FIELDS = ('name', 'category', 'address')
+
+GEOHASH_BASE32 = '0123456789bcdefghjkmnpqrstuvwxyz'
+# Geohash per tempat (9 karakter ~ 5 meter); pencarian area memakai prefix-nya
+PLACE_GEOHASH_PRECISION = 9
+# Sel coverage (6 karakter ~ 1.2 x 0.6 km): area yang sudah di-scrape per query
+COVERAGE_PRECISION = 6
+# Area yang butuh lebih banyak sel dari ini tidak dicatat/dijawab dari index
+MAX_COVERAGE_CELLS = 2000
+# Jumlah prefix geohash maksimal untuk satu query area (presisi diturunkan sampai cukup)
+MAX_LOOKUP_PREFIXES = 16
+
+# Field yang masuk fingerprint snapshot (mode delta); perubahan field lain tidak dilaporkan
+FINGERPRINT_FIELDS = ('rating', 'review_count', 'category', 'address')
+# Parameter yang menentukan isi hasil pencarian (key snapshot), selain query/lokasi
+SNAPSHOT_PARAMS = ('min_rating', 'max_results', 'mode', 'bbox', 'grid')
+
+
+def normalize_query(query):
+    return ' '.join((query or '').lower().split())
+
+
+def snapshot_key(params):
+    """Key snapshot mode delta: pencarian yang sama = lokasi dinormalisasi dan filter hasil yang sama"""
+    where = normalize_search_key(params.get('query'), params.get('location'), params.get('lat'),
+                                 params.get('lng'), params.get('radius_m'))
+    rest = {key: params.get(key) for key in SNAPSHOT_PARAMS if params.get(key) is not None}
+    return f"{where}|{json.dumps(rest, sort_keys=True)}"
+
+
+def place_fingerprint(place):
+    """Hash pendek dari FINGERPRINT_FIELDS; sama = tidak ada perubahan yang dilaporkan"""
+    content = json.dumps([place.get(field) for field in FINGERPRINT_FIELDS], ensure_ascii=False)
+    return hashlib.blake2b(content.encode('utf-8'), digest_size=8).hexdigest()
+
+
+def geohash_encode(lat, lng, precision=PLACE_GEOHASH_PRECISION):
+    """Geohash base32 standar; prefix yang sama = sel persegi yang sama"""
+    lat_range = [-90.0, 90.0]
+    lng_range = [-180.0, 180.0]
+    chars = []
+    bits = 0
+    bit_count = 0
+    even = True
+    while len(chars) < precision:
+        # Bit genap membagi bujur, bit ganjil membagi lintang
+        bounds, value = (lng_range, lng) if even else (lat_range, lat)
+        mid = (bounds[0] + bounds[1]) / 2
+        bits <<= 1
+        if value >= mid:
+            bits |= 1
+            bounds[0] = mid
+        else:
+            bounds[1] = mid
+        even = not even
+        bit_count += 1
+        if bit_count == 5:
+            chars.append(GEOHASH_BASE32[bits])
+            bits = 0
+            bit_count = 0
+    return ''.join(chars)
+
+
+def geohash_cell_size(precision):
+    """(tinggi, lebar) satu sel geohash dalam derajat"""
+    lat_bits = precision * 5 // 2
+    lng_bits = precision * 5 - lat_bits
+    return 180.0 / 2 ** lat_bits, 360.0 / 2 ** lng_bits
+
+
+def geohash_cell_centers(bbox, precision, limit=MAX_COVERAGE_CELLS):
+    """
+    Titik tengah semua sel geohash yang beririsan dengan bbox
+
+    Returns:
+        List (lat, lng), atau None jika lebih dari `limit` sel
+    """
+    south, west, north, east = bbox
+    dlat, dlng = geohash_cell_size(precision)
+    first_row = math.floor((max(south, -90.0) + 90) / dlat)
+    last_row = math.floor((min(north, 90.0 - 1e-9) + 90) / dlat)
+    first_col = math.floor((max(west, -180.0) + 180) / dlng)
+    last_col = math.floor((min(east, 180.0 - 1e-9) + 180) / dlng)
+    if (last_row - first_row + 1) * (last_col - first_col + 1) > limit:
+        return None
+    return [
+        (-90 + (row + 0.5) * dlat, -180 + (col + 0.5) * dlng)
+        for row in range(first_row, last_row + 1)
+        for col in range(first_col, last_col + 1)
+    ]
+
+
+def distance_m(lat1, lng1, lat2, lng2):
+    """Jarak haversine dalam meter"""
+    phi1, phi2 = math.radians(lat1), math.radians(lat2)
+    a = (math.sin((phi2 - phi1) / 2) ** 2 +
+         math.cos(phi1) * math.cos(phi2) * math.sin(math.radians(lng2 - lng1) / 2) ** 2)
+    return 2 * 6371000 * math.asin(min(1.0, math.sqrt(a)))
+
+
+def coverage_cells(lat, lng, radius_m, inside=False):
+    """
+    Sel coverage lingkaran
+
+    Untuk lookup: sel yang titik tengahnya di dalam lingkaran (selalu termasuk sel titik pusat).
+    Dengan inside=True (saat mencatat coverage): hanya sel yang keempat sudutnya di dalam lingkaran,
+    supaya bagian sel di luar radius yang di-scrape tidak ikut dianggap lengkap.
+
+    Returns:
+        set geohash, atau None jika area terlalu luas
+    """
+    centers = geohash_cell_centers(bbox_from_center(lat, lng, radius_m), COVERAGE_PRECISION)
+    if centers is None:
+        return None
+    if inside:
+        half_lat, half_lng = (size / 2 for size in geohash_cell_size(COVERAGE_PRECISION))
+        return {
+            geohash_encode(cell_lat, cell_lng, COVERAGE_PRECISION)
+            for cell_lat, cell_lng in centers
+            if all(distance_m(lat, lng, cell_lat + dlat, cell_lng + dlng) <= radius_m
+                   for dlat in (-half_lat, half_lat) for dlng in (-half_lng, half_lng))
+        }
+    cells = {geohash_encode(cell_lat, cell_lng, COVERAGE_PRECISION)
+             for cell_lat, cell_lng in centers if distance_m(lat, lng, cell_lat, cell_lng) <= radius_m}
+    cells.add(geohash_encode(lat, lng, COVERAGE_PRECISION))
+    return cells
+
+
+class PlaceStore:
+    def __init__(self, path):
+        """
+        Penyimpanan tempat permanen di SQLite, key place_id
+
+        Setiap hasil scraping di-upsert: first_seen/last_seen dicatat, field terbaru disimpan
+        (field yang tidak ikut di scraping berikutnya, mis. hasil enrichment, tetap dipertahankan),
+        dan setiap perubahan rating/jumlah ulasan ditambahkan ke place_history.
+
+        Args:
+            path: Lokasi file SQLite
+        """
+        self.path = path
+        self.lock = threading.Lock()
+        if os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        with self._connect() as conn:
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS places (
+                    place_id TEXT PRIMARY KEY,
+                    name TEXT,
+                    category TEXT,
+                    address TEXT,
+                    rating REAL,
+                    review_count INTEGER,
+                    lat REAL,
+                    lng REAL,
+                    geohash TEXT,
+                    data TEXT NOT NULL,
+                    first_seen REAL NOT NULL,
+                    last_seen REAL NOT NULL,
+                    updated_at REAL NOT NULL
+                )
+            """)
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_places_last_seen ON places (last_seen)")
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS place_history (
+                    place_id TEXT NOT NULL,
+                    observed_at REAL NOT NULL,
+                    rating REAL,
+                    review_count INTEGER
+                )
+            """)
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_place_history_place ON place_history (place_id, observed_at)")
+            # Database dari versi sebelum index spasial: tambah kolom geohash dan isi dari lat/lng
+            if 'geohash' not in {row[1] for row in conn.execute("PRAGMA table_info(places)")}:
+                conn.execute("ALTER TABLE places ADD COLUMN geohash TEXT")
+                conn.executemany(
+                    "UPDATE places SET geohash = ? WHERE place_id = ?",
+                    [(geohash_encode(lat, lng), place_id) for place_id, lat, lng in conn.execute(
+                        "SELECT place_id, lat, lng FROM places WHERE lat IS NOT NULL AND lng IS NOT NULL"
+                    ).fetchall()]
+                )
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_places_geohash ON places (geohash)")
+            # Query pencarian yang pernah menemukan tempat ini
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS place_queries (
+                    place_id TEXT NOT NULL,
+                    query TEXT NOT NULL,
+                    PRIMARY KEY (query, place_id)
+                )
+            """)
+            # Sel geohash yang sudah di-scrape per query (dengan min_rating saat itu)
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS coverage (
+                    query TEXT NOT NULL,
+                    cell TEXT NOT NULL,
+                    min_rating REAL NOT NULL,
+                    covered_at REAL NOT NULL,
+                    PRIMARY KEY (query, cell)
+                )
+            """)
+            # Snapshot hasil terakhir per pencarian untuk mode delta
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS snapshots (
+                    key TEXT PRIMARY KEY,
+                    taken_at REAL NOT NULL,
+                    size INTEGER NOT NULL
+                )
+            """)
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS snapshot_places (
+                    key TEXT NOT NULL,
+                    place_key TEXT NOT NULL,
+                    fingerprint TEXT NOT NULL,
+                    data TEXT NOT NULL,
+                    PRIMARY KEY (key, place_key)
+                )
+            """)
+
+    @contextmanager
+    def _connect(self):
+        conn = sqlite3.connect(self.path, timeout=30)
+        try:
+            with conn:
+                yield conn
+        finally:
+            conn.close()
+
+    def _select_many(self, conn, columns, place_ids):
+        """Baris places untuk place_ids, per 500 id (batas parameter SQLite)"""
+        place_ids = [place_id for place_id in dict.fromkeys(place_ids) if place_id]
+        rows = []
+        for i in range(0, len(place_ids), 500):
+            chunk = place_ids[i:i + 500]
+            rows.extend(conn.execute(
+                f"SELECT {columns} FROM places WHERE place_id IN ({','.join('?' * len(chunk))})", chunk
+            ).fetchall())
+        return rows
+
+    def upsert_many(self, places, seen_at=None, query=None):
+        """
+        Simpan hasil scraping dalam satu transaksi; tempat tanpa place_id dilewati
+
+        Args:
+            query: Query pencarian yang menemukan tempat-tempat ini (untuk query_area)
+
+        Returns:
+            dict {'new', 'changed', 'unchanged'}; changed = rating, ulasan, nama, kategori atau
+            alamat berbeda dari data tersimpan
+        """
+        now = seen_at or time.time()
+        stats = {'new': 0, 'changed': 0, 'unchanged': 0}
+        places = [place for place in places if place.get('place_id')]
+        if not places:
+            return stats
+        with self.lock, self._connect() as conn:
+            existing = {
+                row[0]: row[1:]
+                for row in self._select_many(conn, "place_id, rating, review_count, name, category, address, data",
+                                             [place['place_id'] for place in places])
+            }
+            if query:
+                conn.executemany(
+                    "INSERT OR IGNORE INTO place_queries (place_id, query) VALUES (?, ?)",
+                    [(place['place_id'], normalize_query(query)) for place in places]
+                )
+            for place in places:
+                place_id = place['place_id']
+                rating = place.get('rating')
+                review_count = place.get('review_count')
+                geohash = (geohash_encode(place['lat'], place['lng'])
+                           if place.get('lat') is not None and place.get('lng') is not None else None)
+                old = existing.get(place_id)
+                if old is None:
+                    conn.execute(
+                        "INSERT INTO places (place_id, name, category, address, rating, review_count, lat, lng, "
+                        "geohash, data, first_seen, last_seen, updated_at) "
+                        "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                        (place_id, place.get('name'), place.get('category'), place.get('address'), rating,
+                         review_count, place.get('lat'), place.get('lng'), geohash,
+                         json.dumps(place, ensure_ascii=False), now, now, now)
+                    )
+                    conn.execute(
+                        "INSERT INTO place_history (place_id, observed_at, rating, review_count) VALUES (?, ?, ?, ?)",
+                        (place_id, now, rating, review_count)
+                    )
+                    # Tempat yang sama bisa muncul dua kali dalam satu batch (mis. tiling)
+                    existing[place_id] = (rating, review_count, place.get('name'), place.get('category'),
+                                          place.get('address'), json.dumps(place, ensure_ascii=False))
+                    stats['new'] += 1
+                    continue
+
+                old_rating, old_review_count, old_name, old_category, old_address, old_data = old
+                stats_changed = (old_rating, old_review_count) != (rating, review_count)
+                content_changed = stats_changed or (old_name, old_category, old_address) != tuple(
+                    place.get(field) for field in CONTENT_FIELDS)
+                data = dict(json.loads(old_data), **place)
+                conn.execute(
+                    "UPDATE places SET name = ?, category = ?, address = ?, rating = ?, review_count = ?, "
+                    "lat = COALESCE(?, lat), lng = COALESCE(?, lng), geohash = COALESCE(?, geohash), data = ?, "
+                    "last_seen = ?, updated_at = CASE WHEN ? THEN ? ELSE updated_at END WHERE place_id = ?",
+                    (place.get('name'), place.get('category'), place.get('address'), rating, review_count,
+                     place.get('lat'), place.get('lng'), geohash, json.dumps(data, ensure_ascii=False), now,
+                     content_changed, now, place_id)
+                )
+                if stats_changed:
+                    conn.execute(
+                        "INSERT INTO place_history (place_id, observed_at, rating, review_count) VALUES (?, ?, ?, ?)",
+                        (place_id, now, rating, review_count)
+                    )
+                existing[place_id] = (rating, review_count, place.get('name'), place.get('category'),
+                                      place.get('address'), json.dumps(data, ensure_ascii=False))
+                stats['changed' if content_changed else 'unchanged'] += 1
+        return stats
+
+    def fresh_ids(self, place_ids, max_age):
+        """place_id yang terakhir terlihat dalam max_age detik terakhir"""
+        cutoff = time.time() - max_age
+        with self._connect() as conn:
+            return {place_id for place_id, last_seen in self._select_many(conn, "place_id, last_seen", place_ids)
+                    if last_seen >= cutoff}
+
+    def record_coverage(self, query, lat, lng, radius_m, min_rating=0, covered_at=None):
+        """
+        Tandai area lingkaran sudah di-scrape lengkap untuk query (tempat dengan rating >= min_rating)
+
+        Hanya sel yang seluruhnya di dalam lingkaran yang dicatat (lihat coverage_cells).
+
+        Returns:
+            Jumlah sel yang dicatat (0 jika area terlalu luas untuk index atau tidak ada sel utuh)
+        """
+        cells = coverage_cells(lat, lng, radius_m, inside=True)
+        if not cells:
+            return 0
+        now = covered_at or time.time()
+        key = normalize_query(query)
+        with self.lock, self._connect() as conn:
+            conn.executemany(
+                "INSERT OR REPLACE INTO coverage (query, cell, min_rating, covered_at) VALUES (?, ?, ?, ?)",
+                [(key, cell, min_rating or 0, now) for cell in cells]
+            )
+        return len(cells)
+
+    def query_area(self, query, lat, lng, radius_m, min_rating=0, max_age=None):
+        """
+        Tempat hasil pencarian `query` dalam radius dari (lat, lng), urut jarak, tanpa scraping
+
+        Hanya menjawab jika semua sel coverage area sudah di-scrape untuk query ini dengan
+        min_rating <= yang diminta, dalam max_age detik terakhir (None = berapa pun umurnya).
+
+        Returns:
+            List place dict, atau None jika coverage area kurang/kedaluwarsa (perlu scraping)
+        """
+        cells = coverage_cells(lat, lng, radius_m)
+        if not cells:
+            return None
+        key = normalize_query(query)
+        cutoff = time.time() - max_age if max_age is not None else 0
+        bbox = bbox_from_center(lat, lng, radius_m)
+        # Presisi prefix turun sampai bbox cukup ditutup beberapa range geohash
+        precision = COVERAGE_PRECISION
+        centers = geohash_cell_centers(bbox, precision, MAX_LOOKUP_PREFIXES)
+        while centers is None and precision > 1:
+            precision -= 1
+            centers = geohash_cell_centers(bbox, precision, MAX_LOOKUP_PREFIXES)
+        prefixes = sorted({geohash_encode(cell_lat, cell_lng, precision) for cell_lat, cell_lng in centers or []})
+
+        with self._connect() as conn:
+            cell_list = sorted(cells)
+            covered = 0
+            for i in range(0, len(cell_list), 500):
+                chunk = cell_list[i:i + 500]
+                covered += conn.execute(
+                    f"SELECT COUNT(*) FROM coverage WHERE query = ? AND cell IN ({','.join('?' * len(chunk))}) "
+                    "AND covered_at >= ? AND min_rating <= ?",
+                    [key] + chunk + [cutoff, min_rating or 0]
+                ).fetchone()[0]
+            if covered < len(cells):
+                print(f"[INFO] Coverage index '{query}': {covered}/{len(cells)} sel segar, perlu scraping")
+                return None
+            rows = []
+            for prefix in prefixes:
+                # '{' adalah karakter setelah 'z', jadi range ini = semua geohash berawalan prefix
+                rows.extend(conn.execute(
+                    "SELECT p.data, p.lat, p.lng FROM places p JOIN place_queries q ON q.place_id = p.place_id "
+                    "WHERE q.query = ? AND p.geohash >= ? AND p.geohash < ? AND COALESCE(p.rating, 0) >= ?",
+                    (key, prefix, prefix + '{', min_rating or 0)
+                ).fetchall())
+
+        found = []
+        for data, place_lat, place_lng in rows:
+            distance = distance_m(lat, lng, place_lat, place_lng)
+            if distance <= radius_m:
+                found.append((distance, json.loads(data)))
+        found.sort(key=lambda item: item[0])
+        return [place for _, place in found]
+
+    def diff_snapshot(self, key, places):
+        """
+        Bandingkan hasil baru dengan snapshot terakhir pencarian `key`, lalu simpan sebagai snapshot baru
+
+        Tempat dicocokkan lewat place_key (place_id, fallback nama) dan dibandingkan lewat
+        fingerprint FINGERPRINT_FIELDS. Snapshot pertama menghasilkan semua tempat sebagai added.
+
+        Returns:
+            dict {'previous_at', 'taken_at', 'added', 'changed', 'removed', 'unchanged'}; changed
+            berisi tempat terbaru dengan field 'changes' {field: [lama, baru]}, removed berisi
+            record ringkas dari snapshot sebelumnya
+        """
+        now = time.time()
+        current = {}
+        for place in places:
+            current.setdefault(place_key(place), place)
+        with self.lock, self._connect() as conn:
+            row = conn.execute("SELECT taken_at FROM snapshots WHERE key = ?", (key,)).fetchone()
+            previous = {
+                place: (fingerprint, json.loads(data))
+                for place, fingerprint, data in conn.execute(
+                    "SELECT place_key, fingerprint, data FROM snapshot_places WHERE key = ?", (key,)
+                )
+            }
+            added = []
+            changed = []
+            rows = []
+            for current_key, place in current.items():
+                fingerprint = place_fingerprint(place)
+                summary = {field: place.get(field) for field in ('place_id', 'name', 'link') + FINGERPRINT_FIELDS}
+                rows.append((key, current_key, fingerprint, json.dumps(summary, ensure_ascii=False)))
+                old = previous.pop(current_key, None)
+                if old is None:
+                    added.append(place)
+                elif old[0] != fingerprint:
+                    changes = {field: [old[1].get(field), place.get(field)]
+                               for field in FINGERPRINT_FIELDS if old[1].get(field) != place.get(field)}
+                    changed.append(dict(place, changes=changes))
+            removed = [data for _, data in previous.values()]
+
+            conn.execute("DELETE FROM snapshot_places WHERE key = ?", (key,))
+            conn.executemany(
+                "INSERT INTO snapshot_places (key, place_key, fingerprint, data) VALUES (?, ?, ?, ?)", rows
+            )
+            conn.execute("INSERT OR REPLACE INTO snapshots (key, taken_at, size) VALUES (?, ?, ?)",
+                         (key, now, len(rows)))
+        return {
+            'previous_at': row[0] if row else None,
+            'taken_at': now,
+            'added': added,
+            'changed': changed,
+            'removed': removed,
+            'unchanged': len(current) - len(added) - len(changed)
+        }
+
+    def get(self, place_id):
+        """Record tempat (field terbaru + first_seen/last_seen/updated_at) beserta histori rating, atau None"""
+        with self._connect() as conn:
+            row = conn.execute(
+                "SELECT data, first_seen, last_seen, updated_at FROM places WHERE place_id = ?", (place_id,)
+            ).fetchone()
+            if not row:
+                return None
+            history = conn.execute(
+                "SELECT observed_at, rating, review_count FROM place_history WHERE place_id = ? ORDER BY observed_at",
+                (place_id,)
+            ).fetchall()
+        data, first_seen, last_seen, updated_at = row
+        return dict(
+            json.loads(data),
+            first_seen=first_seen,
+            last_seen=last_seen,
+            updated_at=updated_at,
+            history=[{'observed_at': observed_at, 'rating': rating, 'review_count': review_count}
+                     for observed_at, rating, review_count in history]
+        )
+
+    def count(self):
+        with self._connect() as conn:
+            return conn.execute("SELECT COUNT(*) FROM places").fetchone()[0]
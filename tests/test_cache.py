@@ -0,0 +1,84 @@
+import time
+
+from cache import DetailCache, ResultCache, normalize_search_key
+
+PLACES = [
+    {'name': 'A', 'rating': 4.8},
+    {'name': 'B', 'rating': 4.2},
+    {'name': 'C', 'rating': 3.5},
+]
+WHERE = dict(lat=-7.7956, lng=110.3695, radius_m=2000)
+
+
+def test_normalize_search_key():
+    assert normalize_search_key('  Kedai   KOPI ', 'Jogja ') == 'kedai kopi|jogja'
+    assert normalize_search_key('kopi', lat=-7.795612, lng=110.369544) == 'kopi|@-7.7956,110.3695,5000m'
+
+
+def test_get_filters_wider_entry(tmp_path):
+    cache = ResultCache(str(tmp_path / 'cache.sqlite3'))
+    cache.put(PLACES, 'kopi', min_rating=0, max_results=0, **WHERE)
+    assert [p['name'] for p in cache.get('kopi', min_rating=4.0, max_results=0, **WHERE)] == ['A', 'B']
+    assert [p['name'] for p in cache.get('kopi', min_rating=0, max_results=2, **WHERE)] == ['A', 'B']
+
+
+def test_get_misses_stricter_or_truncated_entry(tmp_path):
+    cache = ResultCache(str(tmp_path / 'cache.sqlite3'))
+    cache.put(PLACES[:2], 'kopi', min_rating=4.0, max_results=2, **WHERE)
+    # Entry dengan min_rating lebih ketat tidak bisa menjawab min_rating lebih longgar
+    assert cache.get('kopi', min_rating=0, max_results=2, **WHERE) is None
+    # Entry terpotong max_results tidak bisa menjawab permintaan yang lebih banyak
+    assert cache.get('kopi', min_rating=4.0, max_results=5, **WHERE) is None
+    assert len(cache.get('kopi', min_rating=4.0, max_results=2, **WHERE)) == 2
+
+
+def test_get_with_loaded_returns_raw_card_count(tmp_path):
+    cache = ResultCache(str(tmp_path / 'cache.sqlite3'))
+    cache.put(PLACES[:1], 'kopi', min_rating=4.5, max_results=0, loaded=120, **WHERE)
+    results, loaded = cache.get('kopi', min_rating=4.5, max_results=0, with_loaded=True, **WHERE)
+    assert len(results) == 1 and loaded == 120
+    assert cache.get('teh', with_loaded=True, **WHERE) == (None, 0)
+
+
+def test_put_keeps_dominating_entry(tmp_path):
+    cache = ResultCache(str(tmp_path / 'cache.sqlite3'))
+    cache.put(PLACES, 'kopi', min_rating=0, max_results=0, **WHERE)
+    cache.put(PLACES[:1], 'kopi', min_rating=4.5, max_results=20, **WHERE)
+    assert len(cache.get('kopi', min_rating=0, max_results=0, **WHERE)) == 3
+
+
+def test_put_replaces_entry_with_same_or_wider_params(tmp_path):
+    cache = ResultCache(str(tmp_path / 'cache.sqlite3'))
+    cache.put(PLACES[:1], 'kopi', min_rating=4.5, max_results=20, **WHERE)
+    cache.put(PLACES, 'kopi', min_rating=0, max_results=0, **WHERE)
+    assert len(cache.get('kopi', min_rating=0, max_results=0, **WHERE)) == 3
+    # Refresh dengan parameter yang sama selalu menimpa
+    cache.put(PLACES[:2], 'kopi', min_rating=0, max_results=0, **WHERE)
+    assert len(cache.get('kopi', min_rating=0, max_results=0, **WHERE)) == 2
+
+
+def test_put_replaces_expired_dominating_entry(tmp_path):
+    path = str(tmp_path / 'cache.sqlite3')
+    ResultCache(path, ttl=-1).put(PLACES, 'kopi', min_rating=0, max_results=0, **WHERE)
+    cache = ResultCache(path)
+    cache.put(PLACES[:1], 'kopi', min_rating=4.5, max_results=20, **WHERE)
+    assert len(cache.get('kopi', min_rating=4.5, max_results=20, **WHERE)) == 1
+
+
+def test_eviction_drops_least_recently_used(tmp_path):
+    cache = ResultCache(str(tmp_path / 'cache.sqlite3'), max_entries=2)
+    cache.put(PLACES, 'a', location='jogja', max_results=0)
+    time.sleep(0.01)
+    cache.put(PLACES, 'b', location='jogja', max_results=0)
+    time.sleep(0.01)
+    assert cache.get('a', location='jogja', max_results=0) is not None
+    time.sleep(0.01)
+    cache.put(PLACES, 'c', location='jogja', max_results=0)
+    assert cache.get('b', location='jogja', max_results=0) is None
+    assert cache.get('a', location='jogja', max_results=0) is not None
+
+
+def test_detail_cache_round_trip(tmp_path):
+    cache = DetailCache(str(tmp_path / 'cache.sqlite3'))
+    cache.put('0x1:0x2', {'phone': '0274 123'})
+    assert cache.get_many(['0x1:0x2', '0x1:0x3']) == {'0x1:0x2': {'phone': '0274 123'}}
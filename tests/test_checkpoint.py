@@ -0,0 +1,42 @@
+from checkpoint import CheckpointStore
+
+
+def test_resume_loads_saved_state(tmp_path):
+    store = CheckpointStore(str(tmp_path / 'checkpoints.sqlite3'))
+    checkpoint = store.checkpoint('kopi|jogja', interval=0)
+    checkpoint.save(results=[{'name': 'A'}], stages=['feed'])
+
+    resumed = store.checkpoint('kopi|jogja', resume=True)
+    assert resumed.get('results') == [{'name': 'A'}]
+    assert resumed.get('stages') == ['feed']
+    # Tanpa resume checkpoint lama diabaikan
+    assert store.checkpoint('kopi|jogja').get('results') is None
+
+
+def test_save_is_throttled_unless_forced(tmp_path):
+    store = CheckpointStore(str(tmp_path / 'checkpoints.sqlite3'))
+    checkpoint = store.checkpoint('k', interval=60)
+    checkpoint.save(results=[1])
+    assert store.load('k') is None
+    assert checkpoint.get('results') == [1]
+    checkpoint.save(force=True, radii=[1000])
+    assert store.load('k') == {'results': [1], 'radii': [1000]}
+
+
+def test_clear_and_ttl(tmp_path):
+    path = str(tmp_path / 'checkpoints.sqlite3')
+    store = CheckpointStore(path)
+    checkpoint = store.checkpoint('k', interval=0)
+    checkpoint.save(results=[1])
+    checkpoint.clear()
+    assert store.load('k') is None
+
+    store.save('old', {'results': [1]})
+    assert CheckpointStore(path, ttl=-1).load('old') is None
+    assert CheckpointStore(path, ttl=3600).checkpoint('old', resume=True).get('results') == [1]
+
+
+def test_keys_are_independent(tmp_path):
+    store = CheckpointStore(str(tmp_path / 'checkpoints.sqlite3'))
+    store.save('kopi|{"engine": "http"}', {'results': [1]})
+    assert store.checkpoint('kopi|{"engine": "selenium"}', resume=True).get('results') is None
@@ -0,0 +1,79 @@
+import threading
+
+import pytest
+
+from coalesce import Flight, SingleFlight, flight_key
+
+
+def test_flight_key_normalizes_location_and_keeps_other_params():
+    a = flight_key({'query': 'Kopi ', 'location': 'JOGJA', 'max_results': 10, 'engine': 'http'})
+    b = flight_key({'query': 'kopi', 'location': 'jogja', 'engine': 'http', 'max_results': 10})
+    assert a == b
+    assert a != flight_key({'query': 'kopi', 'location': 'jogja', 'engine': 'selenium', 'max_results': 10})
+
+
+def test_identical_requests_share_one_run():
+    sf = SingleFlight()
+    started = threading.Event()
+    release = threading.Event()
+    runs = []
+
+    def fn(progress_callback):
+        runs.append(1)
+        started.set()
+        release.wait(5)
+        progress_callback('place', {'name': 'A'})
+        return [{'name': 'A'}]
+
+    leader = sf.start('k', fn)
+    started.wait(5)
+    follower = sf.start('k', fn)
+    assert follower is leader and sf.in_flight() == 1
+    release.set()
+    assert leader.wait() == follower.wait() == [{'name': 'A'}]
+    assert len(runs) == 1
+    # Setelah selesai key dilepas: request berikutnya menjalankan scraping baru
+    assert sf.run('k', lambda callback: ['B']) == ['B']
+    assert sf.in_flight() == 0
+
+
+def test_errors_are_raised_for_every_requester():
+    sf = SingleFlight()
+
+    def fn(progress_callback):
+        raise RuntimeError('chrome crash')
+
+    with pytest.raises(RuntimeError):
+        sf.run('k', fn)
+
+
+def test_run_forwards_progress_events():
+    events = []
+    result = SingleFlight().run('k', lambda callback: callback('loaded', 3) or [1], lambda e, d: events.append((e, d)))
+    assert result == [1] and events == [('loaded', 3)]
+
+
+def test_replay_buffer_is_bounded_and_missed_places_come_from_result():
+    flight = Flight('k', replay_limit=5)
+    places = [{'i': i} for i in range(20)]
+    for place in places:
+        flight.publish('place', place)
+        flight.publish('loaded', place['i'])
+    assert len(flight.events) == 5
+    flight.finish(places)
+    replayed = [data['i'] for event, data in flight.iter_events() if event == 'place']
+    assert sorted(replayed) == list(range(20))
+
+
+def test_live_subscriber_gets_every_place_once():
+    flight = Flight('k', replay_limit=3)
+    received = []
+    subscriber = threading.Thread(target=lambda: received.extend(
+        data['i'] for event, data in flight.iter_events() if event == 'place'))
+    subscriber.start()
+    places = [{'i': i} for i in range(50)]
+    for place in places:
+        flight.publish('place', place)
+    flight.finish(places)
+    subscriber.join(5)
+    assert sorted(received) == list(range(50))
@@ -0,0 +1,90 @@
+import threading
+import time
+
+import pytest
+
+from driver_pool import DriverPool
+
+
+class FakeDriver:
+    def __init__(self, healthy=True, check_seconds=0.0):
+        self.healthy = healthy
+        self.check_seconds = check_seconds
+        self.quit_called = False
+
+    @property
+    def window_handles(self):
+        time.sleep(self.check_seconds)
+        if not self.healthy:
+            raise Exception('session mati')
+        return ['main']
+
+    class _Switch:
+        def window(self, handle):
+            pass
+
+    switch_to = _Switch()
+
+    def delete_all_cookies(self):
+        pass
+
+    def get(self, url):
+        pass
+
+    def quit(self):
+        self.quit_called = True
+
+
+def test_reuses_released_driver_and_bounds_size():
+    pool = DriverPool(FakeDriver, max_size=1, acquire_timeout=0.05)
+    driver = pool.acquire()
+    with pytest.raises(Exception):
+        pool.acquire()
+    pool.release(driver)
+    assert pool.acquire() is driver
+    assert pool.stats() == {'max_size': 1, 'created': 1, 'idle': 0, 'in_use': 1}
+
+
+def test_unhealthy_idle_driver_is_replaced():
+    pool = DriverPool(FakeDriver, max_size=1)
+    driver = pool.acquire()
+    pool.release(driver)
+    driver.healthy = False
+    replacement = pool.acquire()
+    assert replacement is not driver and driver.quit_called
+    assert pool.stats()['created'] == 1
+
+
+def test_worn_out_and_broken_drivers_are_discarded():
+    pool = DriverPool(FakeDriver, max_size=2, max_uses=1)
+    driver = pool.acquire()
+    pool.release(driver)
+    assert driver.quit_called and pool.stats()['created'] == 0
+
+    pool = DriverPool(FakeDriver, max_size=2)
+    with pytest.raises(RuntimeError):
+        with pool.driver() as driver:
+            driver.healthy = False
+            raise RuntimeError('gagal')
+    assert driver.quit_called and pool.stats()['created'] == 0
+
+
+def test_health_check_runs_outside_lock():
+    slow = FakeDriver(check_seconds=0.3)
+    pool = DriverPool(lambda: slow, max_size=1)
+    pool.release(pool.acquire())
+    threading.Thread(target=pool.acquire, daemon=True).start()
+    time.sleep(0.05)
+    started = time.monotonic()
+    pool.stats()
+    assert time.monotonic() - started < 0.1
+
+
+def test_close_all_quits_idle_drivers():
+    pool = DriverPool(FakeDriver, max_size=1)
+    driver = pool.acquire()
+    pool.release(driver)
+    pool.close_all()
+    assert driver.quit_called
+    with pytest.raises(Exception):
+        pool.acquire()
@@ -0,0 +1,29 @@
+from jobs import Job, JobManager
+
+
+def test_job_caps_streamed_places_at_max_results():
+    job = Job({'max_results': 2})
+    for i in range(3):
+        job.on_progress('place', {'place_id': f'p{i}'})
+    assert [place['place_id'] for place in job.results] == ['p0', 'p1']
+
+
+def test_merge_results_keeps_streamed_indices():
+    job = Job({'max_results': 0})
+    job.on_progress('place', {'place_id': 'p0'})
+    job.on_progress('place', {'place_id': 'p1'})
+    job.merge_results([{'place_id': 'p1', 'phone': '0274'}, {'place_id': 'p2'}, {'place_id': 'p0'}])
+    assert job.results == [{'place_id': 'p0'}, {'place_id': 'p1', 'phone': '0274'}, {'place_id': 'p2'}]
+    assert job.to_dict(since=2)['results'] == [{'place_id': 'p2'}]
+
+
+def test_job_manager_runs_job_and_merges_results():
+    def runner(params, progress_callback):
+        progress_callback('place', {'place_id': 'b'})
+        return [{'place_id': 'a'}, {'place_id': 'b', 'phone': '1'}]
+
+    manager = JobManager(runner, max_workers=1)
+    job = manager.submit({'query': 'kopi', 'max_results': 0})
+    manager.executor.shutdown(wait=True)
+    assert job.state == 'done'
+    assert job.results == [{'place_id': 'b', 'phone': '1'}, {'place_id': 'a'}]
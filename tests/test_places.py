@@ -0,0 +1,57 @@
+from places import PlaceIndex, dedup_place_id, parse_place_link, place_key
+
+FEATURE_LINK = ("https://www.google.com/maps/place/Kopi+Klotok/@-7.70,110.42,17z/"
+                "data=!4m6!3m5!1s0x2e7a5b1e2f:0x1a2b3c!8m2!3d-7.7012!4d110.4234!16s")
+
+
+def test_parse_place_link_prefers_data_coordinates():
+    info = parse_place_link(FEATURE_LINK)
+    assert info == {'place_id': '0x2e7a5b1e2f:0x1a2b3c', 'lat': -7.7012, 'lng': 110.4234}
+
+
+def test_parse_place_link_viewport_and_cid():
+    info = parse_place_link("https://maps.google.com/maps/place/X/@-7.8,110.3,15z?cid=12345")
+    assert info == {'place_id': 'cid:12345', 'lat': -7.8, 'lng': 110.3}
+
+
+def test_parse_place_link_empty():
+    assert parse_place_link(None) == {'place_id': None, 'lat': None, 'lng': None}
+    assert parse_place_link("https://www.google.com/maps/search/kopi") == {'place_id': None, 'lat': None, 'lng': None}
+
+
+def test_dedup_place_id_maps_feature_id_to_cid():
+    assert dedup_place_id('0x2e7a:0x10') == 'cid:16'
+    assert dedup_place_id('cid:16') == 'cid:16'
+    assert dedup_place_id(None) is None
+
+
+def test_place_key_falls_back_to_name():
+    assert place_key({'place_id': 'abc', 'name': 'X'}) == 'id:abc'
+    assert place_key({'name': '  Kopi   Kenangan '}) == 'name:kopi kenangan'
+
+
+def test_index_keeps_branches_with_same_name():
+    index = PlaceIndex()
+    assert index.add({'name': 'Kopi Kenangan', 'place_id': '0x1:0x1'})
+    assert index.add({'name': 'Kopi Kenangan', 'place_id': '0x1:0x2'})
+    assert not index.add({'name': 'Kopi Kenangan', 'place_id': '0x1:0x1'})
+    assert len(index) == 2
+
+
+def test_index_dedups_cid_against_feature_id():
+    index = PlaceIndex([{'name': 'A', 'place_id': '0x2e7a:0x10'}])
+    assert not index.add({'name': 'A', 'link': 'https://maps.google.com/?cid=16'})
+
+
+def test_index_fills_missing_fields_without_overwriting_coordinates():
+    place = {'name': 'A', 'lat': 1.0, 'lng': 2.0,
+             'link': 'https://www.google.com/maps/place/A/data=!4m2!1s0x2e7a:0x10'}
+    assert PlaceIndex().add(place)
+    assert place['place_id'] == '0x2e7a:0x10'
+    assert (place['lat'], place['lng']) == (1.0, 2.0)
+
+
+def test_index_dedups_places_without_id_by_name():
+    index = PlaceIndex([{'name': 'Warung Bu Ageng'}])
+    assert not index.add({'name': 'warung  bu ageng'})
+    assert index.add({'name': 'Warung Lain'})
@@ -0,0 +1,129 @@
+import time
+
+import pytest
+
+from store import (PlaceStore, coverage_cells, distance_m, geohash_cell_centers, geohash_encode,
+                   place_fingerprint, snapshot_key)
+from tiling import bbox_from_center
+
+CENTER = (-7.7956, 110.3695)
+
+
+def make_place(i, rating=4.5, review_count=100, offset_m=0.0, **fields):
+    """Tempat di utara CENTER sejauh offset_m meter"""
+    return dict({
+        'place_id': f'0x1:0x{i:x}',
+        'name': f'Tempat {i}',
+        'rating': rating,
+        'review_count': review_count,
+        'category': 'Kedai Kopi',
+        'address': f'Jl. {i}',
+        'lat': CENTER[0] + offset_m / 111320.0,
+        'lng': CENTER[1],
+    }, **fields)
+
+
+@pytest.fixture
+def store(tmp_path):
+    return PlaceStore(str(tmp_path / 'places.sqlite3'))
+
+
+def test_geohash_encode_known_value():
+    assert geohash_encode(57.64911, 10.40744, 11) == 'u4pruydqqvj'
+    assert geohash_encode(*CENTER, 6) == geohash_encode(*CENTER)[:6]
+
+
+def test_geohash_cell_centers_limit():
+    bbox = bbox_from_center(*CENTER, 1000)
+    centers = geohash_cell_centers(bbox, 6)
+    assert centers and all(geohash_encode(lat, lng, 6) for lat, lng in centers)
+    assert geohash_cell_centers(bbox_from_center(*CENTER, 200000), 6) is None
+
+
+def test_distance_m():
+    assert distance_m(0, 0, 0, 0) == 0
+    assert distance_m(0, 0, 1, 0) == pytest.approx(111195, rel=1e-3)
+
+
+def test_recorded_cells_are_fully_inside_lookup_cells():
+    lookup = coverage_cells(*CENTER, 3000)
+    recorded = coverage_cells(*CENTER, 3000, inside=True)
+    assert recorded and recorded < lookup
+    # Radius lebih kecil dari satu sel: tidak ada sel utuh, tapi lookup tetap berisi sel pusat
+    assert coverage_cells(*CENTER, 200, inside=True) == set()
+    assert coverage_cells(*CENTER, 200) == {geohash_encode(*CENTER, 6)}
+
+
+def test_upsert_many_tracks_new_changed_and_history(store):
+    assert store.upsert_many([make_place(1), make_place(2), {'name': 'tanpa id'}], seen_at=100) == \
+        {'new': 2, 'changed': 0, 'unchanged': 0}
+    stats = store.upsert_many([make_place(1), make_place(2, rating=4.7, review_count=120)], seen_at=200)
+    assert stats == {'new': 0, 'changed': 1, 'unchanged': 1}
+    record = store.get('0x1:0x2')
+    assert record['first_seen'] == 100 and record['last_seen'] == 200 and record['updated_at'] == 200
+    assert [entry['rating'] for entry in record['history']] == [4.5, 4.7]
+    assert store.get('0x1:0x1')['updated_at'] == 100
+    assert store.count() == 2
+
+
+def test_upsert_keeps_enriched_fields(store):
+    store.upsert_many([make_place(1, phone='0274 1')])
+    store.upsert_many([make_place(1)])
+    assert store.get('0x1:0x1')['phone'] == '0274 1'
+
+
+def test_fresh_ids(store):
+    store.upsert_many([make_place(1)], seen_at=time.time())
+    store.upsert_many([make_place(2)], seen_at=time.time() - 7200)
+    assert store.fresh_ids(['0x1:0x1', '0x1:0x2', '0x1:0x3'], 3600) == {'0x1:0x1'}
+
+
+def test_query_area_needs_coverage(store):
+    store.upsert_many([make_place(1, offset_m=100), make_place(2, offset_m=1500), make_place(3, offset_m=5000)],
+                      query='Kedai Kopi')
+    assert store.query_area('kedai kopi', *CENTER, 1000) is None
+
+    store.record_coverage('kedai kopi', *CENTER, 8000)
+    found = store.query_area('Kedai  Kopi', *CENTER, 2000)
+    assert [place['place_id'] for place in found] == ['0x1:0x1', '0x1:0x2']
+    # Query lain tidak punya coverage
+    assert store.query_area('bakso', *CENTER, 2000) is None
+
+
+def test_query_area_respects_min_rating_and_age(store):
+    store.upsert_many([make_place(1, rating=4.0, offset_m=100), make_place(2, rating=4.8, offset_m=200)], query='kopi')
+    store.record_coverage('kopi', *CENTER, 8000, min_rating=4.5, covered_at=time.time() - 7200)
+    # Coverage dengan min_rating 4.5 tidak bisa menjawab min_rating lebih longgar
+    assert store.query_area('kopi', *CENTER, 1000, min_rating=0) is None
+    assert [p['place_id'] for p in store.query_area('kopi', *CENTER, 1000, min_rating=4.5)] == ['0x1:0x2']
+    assert store.query_area('kopi', *CENTER, 1000, min_rating=4.5, max_age=3600) is None
+
+
+def test_query_area_edge_cells_not_covered_by_same_radius(store):
+    store.upsert_many([make_place(1)], query='kopi')
+    store.record_coverage('kopi', *CENTER, 3000)
+    # Sel tepi lingkaran tidak utuh di dalam radius, jadi area yang sama persis belum dianggap lengkap
+    assert store.query_area('kopi', *CENTER, 3000) is None
+    assert store.query_area('kopi', *CENTER, 1500) is not None
+
+
+def test_diff_snapshot(store):
+    key = snapshot_key({'query': 'kopi', 'location': 'jogja', 'min_rating': 4})
+    first = store.diff_snapshot(key, [make_place(1), make_place(2)])
+    assert first['previous_at'] is None and len(first['added']) == 2
+
+    second = store.diff_snapshot(key, [make_place(1), make_place(2, rating=4.9), make_place(3)])
+    assert [p['place_id'] for p in second['added']] == ['0x1:0x3']
+    assert second['changed'][0]['changes'] == {'rating': [4.5, 4.9]}
+    assert second['removed'] == [] and second['unchanged'] == 1
+    assert second['previous_at'] == first['taken_at']
+
+    third = store.diff_snapshot(key, [make_place(3)])
+    assert sorted(p['place_id'] for p in third['removed']) == ['0x1:0x1', '0x1:0x2']
+
+
+def test_snapshot_key_and_fingerprint():
+    assert snapshot_key({'query': 'Kopi', 'location': 'Jogja', 'engine': 'http'}) == \
+        snapshot_key({'query': 'kopi', 'location': 'jogja', 'resume': True})
+    assert place_fingerprint(make_place(1)) == place_fingerprint(make_place(1, name='lain'))
+    assert place_fingerprint(make_place(1)) != place_fingerprint(make_place(1, review_count=101))
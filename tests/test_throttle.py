@@ -0,0 +1,88 @@
+import threading
+
+import pytest
+
+from throttle import BlockedError, NavigationScheduler
+
+
+class FakeDriver:
+    """Driver palsu: execute_script (BLOCK_CHECK_JS) mengembalikan alasan blokir berikutnya"""
+
+    def __init__(self, reasons=()):
+        self.reasons = list(reasons)
+        self.visited = []
+
+    def get(self, url):
+        self.visited.append(url)
+
+    def execute_script(self, script, *args):
+        return self.reasons.pop(0) if self.reasons else ''
+
+
+def test_block_halves_rate_and_limit_with_floor():
+    scheduler = NavigationScheduler(rate=2.0, max_concurrency=4, min_rate=0.5, base_backoff=0.001)
+    scheduler.record_block('captcha')
+    assert scheduler.rate == 1.0 and scheduler.limit == 2
+    scheduler.record_block('captcha')
+    scheduler.record_block('captcha')
+    assert scheduler.rate == 0.5 and scheduler.limit == 1
+    assert scheduler.stats()['consecutive_blocks'] == 3
+
+
+def test_successes_recover_additively_up_to_configured_maximum():
+    scheduler = NavigationScheduler(rate=2.0, max_concurrency=4, base_backoff=0.001, recover_after=3)
+    scheduler.record_block('unusual_traffic')
+    for _ in range(3):
+        scheduler.record_success()
+    assert scheduler.rate == pytest.approx(1.2) and scheduler.limit == 3
+    for _ in range(30):
+        scheduler.record_success()
+    assert scheduler.rate == 2.0 and scheduler.limit == 4
+    assert scheduler.stats()['consecutive_blocks'] == 0
+
+
+def test_backoff_grows_exponentially_and_is_capped():
+    scheduler = NavigationScheduler(rate=None, base_backoff=1.0, max_backoff=3.0)
+    first = scheduler.record_block('consent')
+    second = scheduler.record_block('consent')
+    third = scheduler.record_block('consent')
+    assert 0.8 <= first <= 1.2
+    assert 1.6 <= second <= 2.4
+    assert third <= 3.0 * 1.2
+
+
+def test_wait_turn_respects_token_bucket():
+    scheduler = NavigationScheduler(rate=20.0, burst=2)
+    assert scheduler.wait_turn() < 0.01
+    assert scheduler.wait_turn() < 0.01
+    # Token habis: giliran berikutnya menunggu sekitar 1/rate detik
+    assert scheduler.wait_turn() >= 0.03
+
+
+def test_navigate_retries_block_page_then_raises():
+    scheduler = NavigationScheduler(rate=None, base_backoff=0.001, max_backoff=0.01, retries=1)
+    driver = FakeDriver(['consent', ''])
+    scheduler.navigate(driver, 'https://maps/a')
+    assert len(driver.visited) == 2
+
+    driver = FakeDriver(['captcha', 'captcha'])
+    with pytest.raises(BlockedError) as error:
+        scheduler.navigate(driver, 'https://maps/b')
+    assert error.value.reason == 'captcha'
+
+
+def test_slots_follow_current_limit():
+    scheduler = NavigationScheduler(rate=None, max_concurrency=1)
+    scheduler.acquire_slot()
+    acquired = threading.Event()
+
+    def second():
+        scheduler.acquire_slot()
+        acquired.set()
+
+    threading.Thread(target=second, daemon=True).start()
+    assert not acquired.wait(0.05)
+    scheduler.release_slot()
+    assert acquired.wait(1)
+    scheduler.release_slot()
+    assert scheduler.stats()['active'] == 0
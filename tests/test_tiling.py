@@ -0,0 +1,126 @@
+import threading
+
+import pytest
+
+from tiling import TileCrawler, bbox_from_center, in_bbox, split_bbox, tile_key, tile_radius, tile_viewport
+
+
+def test_split_bbox_covers_area_without_gaps():
+    tiles = split_bbox((0.0, 10.0, 3.0, 16.0), 3, 2)
+    assert len(tiles) == 6
+    assert tiles[0] == (0.0, 10.0, 1.0, 13.0)
+    assert tiles[-1] == (2.0, 13.0, 3.0, 16.0)
+    area = sum((north - south) * (east - west) for south, west, north, east in tiles)
+    assert area == pytest.approx(3.0 * 6.0)
+
+
+def test_bbox_from_center_is_symmetric():
+    south, west, north, east = bbox_from_center(-7.8, 110.4, 1000)
+    assert (south + north) / 2 == pytest.approx(-7.8)
+    assert (west + east) / 2 == pytest.approx(110.4)
+    assert north - south == pytest.approx(2000 / 111320.0)
+
+
+def test_tile_viewport_and_radius():
+    tile = bbox_from_center(0.0, 0.0, 1000)
+    lat, lng, span_m = tile_viewport(tile)
+    assert (lat, lng) == (pytest.approx(0.0), pytest.approx(0.0))
+    assert span_m == 2000
+    # Setengah diagonal tile persegi 2 km
+    assert tile_radius(tile) == pytest.approx(2 ** 0.5 * 1000)
+    assert tile_viewport((0.0, 0.0, 0.0001, 0.0001))[2] == 200
+
+
+def test_tile_key_is_stable():
+    assert tile_key((0.1234567, 1.0, 2.0, 3.0)) == tile_key([0.12345671, 1, 2, 3])
+
+
+def test_in_bbox():
+    bbox = (0.0, 0.0, 1.0, 1.0)
+    assert in_bbox({'lat': 0.5, 'lng': 0.5}, bbox)
+    assert not in_bbox({'lat': 1.5, 'lng': 0.5}, bbox)
+    assert in_bbox({'lat': None, 'lng': None}, bbox)
+
+
+class FakeScraper:
+    """search_places palsu: tile dengan center di `dense` me-load 120 kartu, lainnya 10"""
+
+    def __init__(self, calls, dense):
+        self.calls = calls
+        self.dense = dense
+
+    def search_places(self, query, lat, lng, progress_callback=None, **kwargs):
+        self.calls.append((lat, lng, kwargs))
+        loaded = 120 if self.dense(lat, lng) else 10
+        progress_callback('loaded', loaded)
+        progress_callback('metrics', {'elements_seen': loaded})
+        # Hanya satu kartu yang lolos min_rating: kepadatan tetap dari kartu yang ter-load
+        return [{'place_id': f"{lat:.5f},{lng:.5f}", 'name': 'x', 'lat': lat, 'lng': lng}]
+
+
+def dense_first_tile(lat, lng):
+    # Hanya tile awal kiri bawah (center 0.05, 0.05) yang padat; anak-anaknya tidak
+    return (round(lat, 3), round(lng, 3)) == (0.05, 0.05)
+
+
+def crawl(dense, checkpoint=None, **kwargs):
+    calls = []
+    lock = threading.Lock()
+
+    def factory():
+        class Recorder(FakeScraper):
+            def search_places(self, *args, **kw):
+                with lock:
+                    return super().search_places(*args, **kw)
+        return Recorder(calls, dense)
+
+    crawler = TileCrawler(factory, workers=2, grid=2, max_depth=1, dense_threshold=100)
+    results = crawler.crawl('kopi', bbox=(0.0, 0.0, 0.2, 0.2), min_rating=4.5, checkpoint=checkpoint, **kwargs)
+    return results, calls
+
+
+def test_crawl_splits_dense_tiles_by_loaded_cards():
+    results, calls = crawl(dense_first_tile)
+    # 4 tile awal + 4 anak dari satu tile padat
+    assert len(calls) == 8
+    assert len(results) == 8
+    assert all(kwargs['fallbacks'] is False and kwargs['max_results'] == 0 for _, _, kwargs in calls)
+    assert all(kwargs['coverage_radius_m'] < kwargs['radius_m'] for _, _, kwargs in calls)
+
+
+def test_crawl_without_dense_tiles():
+    results, calls = crawl(lambda lat, lng: False)
+    assert len(calls) == 4 and len(results) == 4
+
+
+def test_crawl_max_results():
+    results, _ = crawl(lambda lat, lng: False, max_results=2)
+    assert len(results) == 2
+
+
+class MemoryCheckpoint:
+    def __init__(self, state=None):
+        self.state = dict(state or {})
+        self.cleared = False
+
+    def get(self, name, default=None):
+        return self.state.get(name, default)
+
+    def save(self, force=False, **updates):
+        self.state.update(updates)
+
+    def clear(self):
+        self.cleared = True
+
+
+def test_crawl_resume_skips_finished_tiles():
+    checkpoint = MemoryCheckpoint()
+    first, _ = crawl(dense_first_tile, checkpoint=checkpoint)
+    assert checkpoint.cleared
+    # Checkpoint menyimpan jumlah kartu ter-load (bukan hasil setelah filter) per tile
+    assert sorted(tile[4] for tile in checkpoint.state['tiles']) == [10] * 7 + [120]
+
+    resumed = MemoryCheckpoint(checkpoint.state)
+    results, calls = crawl(dense_first_tile, checkpoint=resumed)
+    assert calls == []
+    assert len(results) == len(first)
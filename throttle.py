@@ -0,0 +1,193 @@
+"""
+Penjadwal navigasi keluar ke Google Maps
+
+Semua driver.get (search_places, multiple radius, tile crawler, enrichment) dan request engine
+HTTP melewati satu NavigationScheduler bersama:
+- token bucket membatasi laju navigasi (per detik, dengan burst)
+- halaman blokir/consent ("unusual traffic", captcha, consent.google, /sorry/) dideteksi
+- saat diblokir: backoff eksponensial, laju dipotong setengah dan batas pencarian bersamaan
+  diturunkan; setelah beberapa navigasi sukses berturut-turut laju dan batas naik lagi
+  perlahan (AIMD), sehingga throughput stabil di laju tertinggi yang tidak diblokir
+"""
+import random
+import threading
+import time
+
+from metrics import NAVIGATIONS, THROTTLE_WAIT_SECONDS
+
+# Satu round trip: alasan blokir jika halaman saat ini adalah halaman blokir/consent, '' jika normal
+BLOCK_CHECK_JS = """
+var url = location.href;
+if (url.indexOf('consent.google') >= 0) return 'consent';
+if (url.indexOf('/sorry/') >= 0) return 'unusual_traffic';
+if (document.querySelector("#captcha-form, iframe[src*='recaptcha'], form[action*='/sorry/']")) return 'captcha';
+var text = document.body ? document.body.innerText.slice(0, 3000).toLowerCase() : '';
+if (text.indexOf('unusual traffic') >= 0 || text.indexOf('lalu lintas tidak biasa') >= 0) return 'unusual_traffic';
+if (document.querySelector("form[action*='consent']") ||
+    text.indexOf('before you continue to google') >= 0 || text.indexOf('sebelum melanjutkan ke google') >= 0) return 'consent';
+return '';
+"""
+
+
+class BlockedError(Exception):
+    """Google menampilkan halaman blokir/consent, bukan hasil"""
+
+    def __init__(self, reason, url=None):
+        super().__init__(f"Diblokir Google ({reason}){f': {url}' if url else ''}")
+        self.reason = reason
+        self.url = url
+
+
+def detect_block_page(driver):
+    """Alasan blokir ('consent', 'captcha', 'unusual_traffic') atau None"""
+    try:
+        return driver.execute_script(BLOCK_CHECK_JS) or None
+    except Exception as e:
+        print(f"[DEBUG] Gagal memeriksa halaman blokir: {e}")
+        return None
+
+
+class NavigationScheduler:
+    def __init__(self, rate=1.0, burst=3, max_concurrency=2, min_rate=0.05, min_concurrency=1,
+                 base_backoff=5.0, max_backoff=300.0, recover_after=10, retries=2):
+        """
+        Args:
+            rate: Laju navigasi maksimal per detik (None = tanpa batas laju)
+            burst: Jumlah navigasi yang boleh dilakukan berurutan tanpa menunggu
+            max_concurrency: Batas pencarian yang berjalan bersamaan
+            min_rate, min_concurrency: Batas bawah saat diturunkan karena blokir
+            base_backoff, max_backoff: Backoff (detik) setelah blokir pertama / paling lama
+            recover_after: Navigasi sukses berturut-turut sebelum laju dan batas dinaikkan
+            retries: Jumlah percobaan ulang navigate() setelah backoff jika halaman diblokir
+        """
+        self.max_rate = rate
+        self.rate = rate
+        self.burst = max(1, burst)
+        self.min_rate = min_rate
+        self.max_concurrency = max(1, max_concurrency)
+        self.min_concurrency = max(1, min(min_concurrency, self.max_concurrency))
+        self.limit = self.max_concurrency
+        self.base_backoff = base_backoff
+        self.max_backoff = max_backoff
+        self.recover_after = recover_after
+        self.retries = retries
+
+        self.tokens = float(self.burst)
+        self.refilled_at = time.monotonic()
+        self.blocked_until = 0.0
+        self.consecutive_blocks = 0
+        self.successes = 0
+        self.active = 0
+        self.cond = threading.Condition()
+
+    def _refill_locked(self, now):
+        if self.rate is None:
+            self.tokens = float(self.burst)
+        else:
+            self.tokens = min(float(self.burst), self.tokens + (now - self.refilled_at) * self.rate)
+        self.refilled_at = now
+
+    def wait_turn(self):
+        """
+        Tunggu backoff yang sedang berjalan dan token navigasi, lalu ambil satu token
+
+        Returns:
+            Detik yang dihabiskan menunggu
+        """
+        started = time.monotonic()
+        with self.cond:
+            while True:
+                now = time.monotonic()
+                self._refill_locked(now)
+                if now < self.blocked_until:
+                    delay = self.blocked_until - now
+                elif self.tokens >= 1:
+                    self.tokens -= 1
+                    break
+                else:
+                    delay = (1 - self.tokens) / self.rate
+                # wait() melepas lock; record_block() membangunkan supaya backoff baru langsung berlaku
+                self.cond.wait(delay)
+        waited = time.monotonic() - started
+        if waited > 0.001:
+            THROTTLE_WAIT_SECONDS.inc(waited)
+        return waited
+
+    def record_success(self):
+        with self.cond:
+            self.consecutive_blocks = 0
+            self.successes += 1
+            NAVIGATIONS.inc(1, 'ok')
+            if self.successes < self.recover_after:
+                return
+            # Additive increase: naik perlahan kembali ke batas yang dikonfigurasi
+            self.successes = 0
+            if self.rate is not None and self.rate < self.max_rate:
+                self.rate = min(self.max_rate, self.rate + max(self.min_rate, self.max_rate * 0.1))
+            if self.limit < self.max_concurrency:
+                self.limit += 1
+                self.cond.notify_all()
+
+    def record_block(self, reason):
+        """Multiplicative decrease: laju dan batas bersamaan dipotong setengah, backoff eksponensial"""
+        with self.cond:
+            self.consecutive_blocks += 1
+            self.successes = 0
+            NAVIGATIONS.inc(1, reason)
+            if self.rate is not None:
+                self.rate = max(self.min_rate, self.rate / 2)
+            self.limit = max(self.min_concurrency, self.limit // 2)
+            self.tokens = 0.0
+            backoff = min(self.max_backoff, self.base_backoff * 2 ** (self.consecutive_blocks - 1))
+            backoff *= random.uniform(0.8, 1.2)
+            self.blocked_until = max(self.blocked_until, time.monotonic() + backoff)
+            self.cond.notify_all()
+        print(f"[INFO] Navigasi diblokir ({reason}): backoff {backoff:.1f} detik, "
+              f"laju {self.rate if self.rate is not None else '-'} /detik, maksimal {self.limit} pencarian bersamaan")
+        return backoff
+
+    def navigate(self, driver, url):
+        """
+        driver.get(url) lewat scheduler: tunggu giliran, buka URL, periksa halaman blokir
+
+        Halaman blokir dicoba ulang setelah backoff (maksimal `retries` kali).
+
+        Returns:
+            Detik yang dihabiskan menunggu giliran/backoff
+
+        Raises:
+            BlockedError jika masih diblokir setelah semua percobaan
+        """
+        waited = 0.0
+        for _ in range(self.retries + 1):
+            waited += self.wait_turn()
+            driver.get(url)
+            reason = detect_block_page(driver)
+            if not reason:
+                self.record_success()
+                return waited
+            self.record_block(reason)
+        raise BlockedError(reason, url)
+
+    def acquire_slot(self):
+        """Ambil slot pencarian bersamaan; batasnya turun saat diblokir"""
+        with self.cond:
+            while self.active >= self.limit:
+                self.cond.wait()
+            self.active += 1
+
+    def release_slot(self):
+        with self.cond:
+            self.active = max(0, self.active - 1)
+            self.cond.notify_all()
+
+    def stats(self):
+        with self.cond:
+            return {
+                'rate': self.rate,
+                'max_rate': self.max_rate,
+                'concurrency_limit': self.limit,
+                'active': self.active,
+                'backoff_remaining': round(max(0.0, self.blocked_until - time.monotonic()), 1),
+                'consecutive_blocks': self.consecutive_blocks
+            }
@@ -0,0 +1,238 @@
+import math
+import threading
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+
+from places import PlaceIndex
+
+# Panjang 1 derajat lintang dalam meter (cukup akurat untuk ukuran tile kota)
+METERS_PER_DEGREE = 111320.0
+
+
+def bbox_from_center(lat, lng, radius_m):
+    """Bounding box (south, west, north, east) yang melingkupi lingkaran center+radius"""
+    dlat = radius_m / METERS_PER_DEGREE
+    dlng = radius_m / (METERS_PER_DEGREE * max(math.cos(math.radians(lat)), 0.01))
+    return (lat - dlat, lng - dlng, lat + dlat, lng + dlng)
+
+
+def split_bbox(bbox, rows, cols):
+    """Bagi bbox menjadi grid rows x cols tile"""
+    south, west, north, east = bbox
+    lat_step = (north - south) / rows
+    lng_step = (east - west) / cols
+    return [
+        (south + r * lat_step, west + c * lng_step, south + (r + 1) * lat_step, west + (c + 1) * lng_step)
+        for r in range(rows)
+        for c in range(cols)
+    ]
+
+
+def tile_viewport(bbox):
+    """Center dan lebar viewport (meter) untuk URL /@lat,lng,{meter}m dari sebuah tile"""
+    south, west, north, east = bbox
+    lat = (south + north) / 2
+    lng = (west + east) / 2
+    height_m = (north - south) * METERS_PER_DEGREE
+    width_m = (east - west) * METERS_PER_DEGREE * math.cos(math.radians(lat))
+    return lat, lng, max(200, int(max(height_m, width_m)))
+
+
+def tile_radius(bbox):
+    """Setengah diagonal tile (meter): lingkaran terkecil yang melingkupi tile, untuk index coverage"""
+    south, west, north, east = bbox
+    lat = (south + north) / 2
+    height_m = (north - south) * METERS_PER_DEGREE
+    width_m = (east - west) * METERS_PER_DEGREE * math.cos(math.radians(lat))
+    return math.hypot(height_m, width_m) / 2
+
+
+def tile_key(bbox):
+    """Key tile yang stabil antar proses (checkpoint): koordinat dibulatkan 6 desimal"""
+    return tuple(round(float(v), 6) for v in bbox)
+
+
+def in_bbox(place, bbox):
+    """True jika koordinat tempat di dalam bbox (tempat tanpa koordinat dianggap di dalam)"""
+    if place.get('lat') is None or place.get('lng') is None:
+        return True
+    south, west, north, east = bbox
+    return south <= place['lat'] <= north and west <= place['lng'] <= east
+
+
+class TileCrawler:
+    def __init__(self, scraper_factory, workers=2, grid=3, max_depth=2, dense_threshold=100):
+        """
+        Crawler area luas: bagi bbox menjadi tile viewport dan scraping tiap tile secara paralel
+
+        Args:
+            scraper_factory: Callable tanpa argumen yang mengembalikan GoogleMapsScraper
+                             (sebaiknya memakai DriverPool bersama supaya jumlah browser terbatas)
+            workers: Jumlah tile yang di-scrape bersamaan
+            grid: Tile awal grid x grid
+            max_depth: Berapa kali tile padat boleh dibagi lagi menjadi 2x2
+            dense_threshold: Tile dengan kartu ter-load sebanyak ini dianggap padat (feed Maps berhenti ~120)
+        """
+        self.scraper_factory = scraper_factory
+        self.workers = max(1, workers)
+        self.grid = max(1, grid)
+        self.max_depth = max_depth
+        self.dense_threshold = dense_threshold
+
+    def crawl(self, query, bbox=None, lat=None, lng=None, radius_m=None, min_rating=0, max_results=0,
+              progress_callback=None, grid=None, checkpoint=None, **search_kwargs):
+        """
+        Crawl seluruh area dan gabungkan hasil berdasarkan place_id
+
+        Args:
+            query: Kata kunci pencarian
+            bbox: (south, west, north, east); atau gunakan lat, lng, radius_m
+            min_rating: Rating minimum
+            max_results: Berhenti menjadwalkan tile baru setelah sebanyak ini (0 = semua)
+            progress_callback: Sama dengan search_places ('loaded' = jumlah tile selesai, 'place',
+                               'metrics' per tile)
+            grid: Override ukuran grid awal
+            checkpoint: Checkpoint opsional (lihat checkpoint.py): tile yang selesai dan hasil
+                        disimpan berkala; tile yang sudah selesai di checkpoint tidak di-scrape ulang
+            search_kwargs: Diteruskan ke search_places (mis. use_cache, refresh_cache)
+
+        Returns:
+            List of dict tempat unik di dalam area
+        """
+        if bbox is None:
+            if lat is None or lng is None:
+                raise ValueError("Tiling membutuhkan bbox atau koordinat (lat, lng)")
+            bbox = bbox_from_center(lat, lng, radius_m or 5000)
+        bbox = tuple(float(v) for v in bbox)
+        search_kwargs.pop('location', None)
+        grid = grid or self.grid
+
+        # Resume: hasil dan tile yang selesai (bbox dibulatkan -> jumlah kartu ter-load) dari checkpoint
+        results = list(checkpoint.get('results', [])) if checkpoint is not None else []
+        seen = PlaceIndex(results)
+        finished_tiles = {
+            tile_key(tile[:4]): tile[4]
+            for tile in (checkpoint.get('tiles', []) if checkpoint is not None else [])
+        }
+        completed = []
+        failed_tiles = [0]
+        lock = threading.Lock()
+        tiles_done = [0]
+
+        def emit(event, data):
+            if progress_callback:
+                try:
+                    progress_callback(event, data)
+                except Exception as e:
+                    print(f"[DEBUG] Error di progress_callback: {e}")
+
+        def target_reached():
+            return max_results > 0 and len(results) >= max_results
+
+        def scrape_tile(tile, depth):
+            tile_lat, tile_lng, span_m = tile_viewport(tile)
+            print(f"[INFO] Tile depth {depth} @{tile_lat:.5f},{tile_lng:.5f} ({span_m}m)")
+            scraper = self.scraper_factory()
+            # Kepadatan diukur dari kartu yang ter-load di feed (sebelum filter min_rating),
+            # bukan dari hasil yang lolos filter: feed yang terpotong ~120 kartu tetap terdeteksi.
+            # Cache hit melaporkan jumlah kartu mentah saat entry di-scrape; index hit hanya terjadi
+            # untuk area yang feed-nya terbaca sampai habis, jadi tidak perlu dibagi karena terpotong
+            loaded = [0]
+
+            def on_progress(event, data):
+                if event == 'loaded':
+                    loaded[0] = max(loaded[0], data)
+                elif event == 'metrics':
+                    loaded[0] = max(loaded[0], data.get('elements_seen', 0))
+                    emit(event, data)
+
+            places = scraper.search_places(
+                query=query,
+                location='',
+                min_rating=min_rating,
+                max_results=0,
+                lat=tile_lat,
+                lng=tile_lng,
+                radius_m=span_m,
+                coverage_radius_m=tile_radius(tile),
+                fallbacks=False,
+                progress_callback=on_progress,
+                **search_kwargs
+            )
+            new_places = 0
+            with lock:
+                for place in places:
+                    if target_reached():
+                        break
+                    if in_bbox(place, bbox) and seen.add(place):
+                        results.append(place)
+                        new_places += 1
+                        emit('place', place)
+                tiles_done[0] += 1
+                emit('loaded', tiles_done[0])
+            print(f"[INFO] Tile selesai: {loaded[0]} kartu, {len(places)} hasil, {new_places} baru (total {len(results)})")
+            return max(loaded[0], len(places))
+
+        for place in results:
+            emit('place', place)
+
+        def save_checkpoint(force=False):
+            if checkpoint is not None:
+                with lock:
+                    state = {'results': list(results), 'tiles': list(completed)}
+                checkpoint.save(force=force, **state)
+
+        print(f"[INFO] Tiling {bbox} menjadi {grid}x{grid} tile dengan {self.workers} worker")
+        with ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix='tile') as executor:
+            pending = {}
+
+            def schedule(tile, depth):
+                count = finished_tiles.get(tile_key(tile))
+                if count is None:
+                    pending[executor.submit(scrape_tile, tile, depth)] = (tile, depth)
+                    return
+                # Tile sudah selesai di checkpoint: hasilnya sudah ada, tapi anak tile padat tetap dicek
+                with lock:
+                    completed.append(list(tile) + [count])
+                    tiles_done[0] += 1
+                split_dense(tile, depth, count)
+
+            def split_dense(tile, depth, count):
+                # Tile padat kemungkinan terpotong batas feed: bagi lagi menjadi 2x2
+                if count >= self.dense_threshold and depth < self.max_depth and not target_reached():
+                    print(f"[INFO] Tile padat ({count} kartu), dibagi menjadi 4 tile")
+                    for child in split_bbox(tile, 2, 2):
+                        schedule(child, depth + 1)
+
+            for tile in split_bbox(bbox, grid, grid):
+                schedule(tile, 0)
+            if finished_tiles:
+                print(f"[INFO] {tiles_done[0]} tile sudah selesai di checkpoint, {len(pending)} tile dijadwalkan")
+            try:
+                while pending:
+                    done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        tile, depth = pending.pop(future)
+                        if future.cancelled():
+                            continue
+                        try:
+                            count = future.result()
+                        except Exception as e:
+                            print(f"[GAGAL] Tile {tile} gagal: {e}")
+                            failed_tiles[0] += 1
+                            continue
+                        with lock:
+                            completed.append(list(tile) + [count])
+                        save_checkpoint()
+                        split_dense(tile, depth, count)
+                    if target_reached():
+                        for future in pending:
+                            future.cancel()
+            finally:
+                # Juga saat crawl terputus (mis. KeyboardInterrupt), supaya bisa dilanjutkan
+                save_checkpoint(force=True)
+
+        if checkpoint is not None and not failed_tiles[0]:
+            # Semua tile selesai; jika ada yang gagal, checkpoint disimpan supaya resume hanya mengulang tile itu
+            checkpoint.clear()
+        print(f"[INFO] Tiling selesai: {len(results)} tempat unik dari {tiles_done[0]} tile")
+        return results[:max_results] if max_results > 0 else results